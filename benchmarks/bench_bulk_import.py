@@ -0,0 +1,132 @@
+"""Benchmark de l'import d'un backlog de tâches.
+
+Compare le temps d'import de N tâches par N appels à ``POST /api/v1/tasks/``,
+par un seul appel à ``POST /api/v1/tasks/bulk`` et par un flux NDJSON envoyé
+en morceaux à ``POST /api/v1/tasks/import``, à travers toute la pile ASGI
+(authentification, validation, stockage, sérialisation).
+
+Usage :
+    python -m benchmarks.bench_bulk_import
+    python -m benchmarks.bench_bulk_import --tasks 10000 --repeat 5
+    python -m benchmarks.bench_bulk_import --tasks 100000 --scenarios import
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import AsyncIterator, Dict, List
+
+import httpx
+
+from src.main import app
+from src.models.stores import task_store, user_store
+
+BASE_URL = "http://benchmark"
+CREDENTIALS = {"username": "bulk", "password": "bulk-password"}
+# Taille des morceaux du corps NDJSON (ordre de grandeur d'un serveur ASGI)
+CHUNK_SIZE = 64 * 1024
+
+
+def backlog(tasks: int) -> List[Dict[str, str]]:
+    """Construire un backlog de tâches à importer."""
+    return [
+        {
+            "title": f"Task {i}",
+            "description": "Imported from the previous tracker",
+            "priority": "High" if i % 3 else "Low",
+            "due_date": f"2030-01-{i % 28 + 1:02d}T12:00:00",
+        }
+        for i in range(tasks)
+    ]
+
+
+async def login(client: httpx.AsyncClient) -> Dict[str, str]:
+    """Créer l'utilisateur du benchmark et retourner ses en-têtes."""
+    await client.post(
+        "/api/v1/auth/register", json={**CREDENTIALS, "email": "bulk@example.com"}
+    )
+    response = await client.post("/api/v1/auth/login", data=CREDENTIALS)
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def import_one_by_one(
+    client: httpx.AsyncClient, headers: Dict[str, str], items: List[Dict[str, str]]
+) -> float:
+    """Importer les tâches une par une ; retourner la durée en secondes."""
+    start = time.perf_counter()
+    for item in items:
+        response = await client.post("/api/v1/tasks/", json=item, headers=headers)
+        response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def import_bulk(
+    client: httpx.AsyncClient, headers: Dict[str, str], items: List[Dict[str, str]]
+) -> float:
+    """Importer les tâches en un seul appel ; retourner la durée en secondes."""
+    start = time.perf_counter()
+    response = await client.post("/api/v1/tasks/bulk", json=items, headers=headers)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def import_ndjson(
+    client: httpx.AsyncClient, headers: Dict[str, str], items: List[Dict[str, str]]
+) -> float:
+    """Importer les tâches en flux NDJSON ; retourner la durée en secondes."""
+    body = "".join(json.dumps(item) + "\n" for item in items).encode()
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for start in range(0, len(body), CHUNK_SIZE):
+            yield body[start : start + CHUNK_SIZE]
+
+    start = time.perf_counter()
+    response = await client.post(
+        "/api/v1/tasks/import", content=chunks(), headers=headers
+    )
+    response.raise_for_status()
+    elapsed = time.perf_counter() - start
+    summary = json.loads(response.text.splitlines()[-1])
+    assert summary["imported"] == len(items), summary
+    return elapsed
+
+
+SCENARIOS = {
+    "one-by-one": ("un par un", import_one_by_one),
+    "bulk": ("bulk", import_bulk),
+    "import": ("ndjson", import_ndjson),
+}
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Exécuter les scénarios d'import choisis."""
+    items = backlog(args.tasks)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=BASE_URL) as client:
+        headers = await login(client)
+        print(f"{'import':>12} | {'médiane (s)':>12} | {'tâches/s':>10}")
+        for name, scenario in (SCENARIOS[key] for key in args.scenarios):
+            timings = []
+            for _ in range(args.repeat):
+                task_store.clear()
+                timings.append(await scenario(client, headers, items))
+            median = statistics.median(timings)
+            print(f"{name:>12} | {median:>12.3f} | {args.tasks / median:>10.0f}")
+    user_store.clear()
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
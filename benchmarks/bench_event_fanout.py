@@ -0,0 +1,110 @@
+"""Benchmark de la diffusion d'événements à des connexions SSE inactives.
+
+N connexions d'un même utilisateur attendent ses événements, chacune dans
+sa tâche asyncio, avec le flux de ``GET /api/v1/tasks/events``
+(``event_stream``). Mesure :
+
+- la mémoire occupée par connexion inactive ;
+- la durée de ``publish`` (sérialisation unique et mise en file) ;
+- la latence de diffusion, de la publication à la réception de l'événement
+  par toutes les connexions ;
+- avec ``--slow``, des abonnés qui ne lisent jamais leur file : ils sont
+  déconnectés une fois leur file pleine, sans ralentir les autres.
+
+Usage :
+    python -m benchmarks.bench_event_fanout
+    python -m benchmarks.bench_event_fanout --connections 10000 --events 200 --slow 100
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from typing import List
+
+from src.api.events import TaskEventBroker, event_stream
+from src.schemas.task import Task, TaskChanges, TaskEventType
+
+USER_ID = 1
+
+
+def sample_changes(version: int) -> TaskChanges:
+    """Modification d'une tâche, de taille réaliste."""
+    task = Task(
+        id=version,
+        user_id=USER_ID,
+        title=f"Task {version}",
+        description="Updated from the dashboard",
+        created_at=datetime(2030, 1, 1, 12),
+    )
+    return TaskChanges(version=version, tasks=[task])
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Ouvrir les connexions puis publier les événements un par un."""
+    broker = TaskEventBroker(args.queue_size, heartbeat=15)
+    received = 0
+    all_received = asyncio.Event()
+
+    async def connection() -> None:
+        nonlocal received
+        subscription = broker.subscribe(USER_ID)
+        stream = event_stream(broker, subscription, TaskChanges(version=0))
+        async for _ in stream:
+            received += 1
+            if received == args.connections:
+                all_received.set()
+
+    tracemalloc.start()
+    tasks = [asyncio.create_task(connection()) for _ in range(args.connections)]
+    await asyncio.sleep(0)
+    # Événement initial de chaque flux
+    await all_received.wait()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    slow = [broker.subscribe(USER_ID) for _ in range(args.slow)]
+
+    publish_us: List[float] = []
+    latency_ms: List[float] = []
+    for version in range(1, args.events + 1):
+        changes = sample_changes(version)
+        received = 0
+        all_received.clear()
+        start = time.perf_counter()
+        broker.publish(USER_ID, TaskEventType.UPDATED, changes)
+        published = time.perf_counter()
+        await all_received.wait()
+        end = time.perf_counter()
+        publish_us.append((published - start) * 1e6)
+        latency_ms.append((end - start) * 1000)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    latency_ms.sort()
+    print(f"connexions inactives    : {args.connections}")
+    print(f"mémoire par connexion   : {memory / args.connections / 1024:.1f} Ko")
+    print(f"publish (médiane)       : {statistics.median(publish_us):.0f} µs")
+    print(f"diffusion (médiane)     : {statistics.median(latency_ms):.1f} ms")
+    print(f"diffusion (p99)         : {latency_ms[int(len(latency_ms) * 0.99)]:.1f} ms")
+    print(
+        f"abonnés lents déconnectés : {sum(s.dropped for s in slow)}/{args.slow}"
+        f" ({broker.stats()['dropped']} au total)"
+    )
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--slow", type=int, default=100)
+    parser.add_argument("--queue-size", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Benchmark du journal d'écriture du stockage en mémoire.
+
+Mesure :
+
+- le débit d'écriture (créations/s) avec et sans journal, pour des écritures
+  concurrentes passant par les dépôts asynchrones (group commit) ;
+- la durée de reprise d'un journal de N tâches, depuis les segments seuls
+  puis depuis un instantané après compaction (projeté en mémoire : les tâches
+  sont décodées au premier accès à leur utilisateur, mesuré à part).
+
+Usage :
+    python -m benchmarks.bench_journal
+    python -m benchmarks.bench_journal --tasks 1000000 --writes 20000 --concurrency 64
+"""
+import argparse
+import asyncio
+import gc
+import os
+import tempfile
+import time
+from typing import Tuple
+
+from src.models.durable_store import JournaledTaskStore, JournaledUserStore
+from src.models.journal import Journal
+from src.models.memory_store import TaskStore
+from src.models.repositories import (
+    InMemoryTaskRepository,
+    JournaledTaskRepository,
+    TaskRepository,
+)
+from src.schemas.task import Priority, TaskCreate
+
+BATCH_SIZE = 10_000
+
+
+def open_journal(
+    directory: str, segment_size: int = 64 * 1024 * 1024
+) -> Tuple[Journal, JournaledTaskStore, float]:
+    """Ouvrir le journal ; retourner aussi la durée de reprise (secondes)."""
+    start = time.perf_counter()
+    journal = Journal(directory, segment_size)
+    state = journal.recover()
+    task_store = JournaledTaskStore(journal, state)
+    JournaledUserStore(journal, state)
+    elapsed = time.perf_counter() - start
+    journal.start()
+    return journal, task_store, elapsed
+
+
+async def write_throughput(
+    repository: TaskRepository, writes: int, concurrency: int
+) -> float:
+    """Créer ``writes`` tâches avec une concurrence donnée ; retourner le débit."""
+    semaphore = asyncio.Semaphore(concurrency)
+    task_data = TaskCreate(title="Benchmark task", priority=Priority.HIGH)
+
+    async def create(i: int) -> None:
+        async with semaphore:
+            await repository.create_task(task_data, 1 + i % 100)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(create(i) for i in range(writes)))
+    return writes / (time.perf_counter() - start)
+
+
+def directory_size(directory: str) -> float:
+    """Taille des fichiers du répertoire, en Mo."""
+    return sum(
+        os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+    ) / (1024 * 1024)
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--writes", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"Écritures concurrentes ({args.writes}, concurrence {args.concurrency}) :")
+    rate = asyncio.run(
+        write_throughput(
+            InMemoryTaskRepository(TaskStore()), args.writes, args.concurrency
+        )
+    )
+    print(f"  sans journal : {rate:>10.0f} créations/s")
+    with tempfile.TemporaryDirectory() as directory:
+        journal, task_store, _ = open_journal(directory)
+        rate = asyncio.run(
+            write_throughput(
+                JournaledTaskRepository(task_store), args.writes, args.concurrency
+            )
+        )
+        print(
+            f"  avec journal : {rate:>10.0f} créations/s "
+            f"({args.writes / journal.fsyncs:.1f} écritures par fsync)"
+        )
+        journal.close()
+
+    print(f"Reprise d'un journal de {args.tasks} tâches :")
+    with tempfile.TemporaryDirectory() as directory:
+        # Un seul segment, jamais fusionné : la première reprise rejoue tout
+        journal, task_store, _ = open_journal(directory, segment_size=2**62)
+        for offset in range(0, args.tasks, BATCH_SIZE):
+            count = min(BATCH_SIZE, args.tasks - offset)
+            task_store.create_tasks(
+                [
+                    TaskCreate(title=f"Task {offset + i}", description="Lorem ipsum")
+                    for i in range(count)
+                ],
+                1 + offset // BATCH_SIZE % 100,
+            )
+        journal.wait_durable()
+        journal.close()
+        del task_store
+        gc.collect()
+
+        size = directory_size(directory)
+        journal, task_store, elapsed = open_journal(directory)
+        print(f"  segments seuls : {elapsed:>7.2f} s ({size:.0f} Mo)")
+        count = sum(task_store.count_tasks(user_id) for user_id in range(1, 101))
+        assert count == args.tasks, count
+        journal.close()
+        journal.compact()
+        del task_store
+        gc.collect()
+
+        size = directory_size(directory)
+        journal, task_store, elapsed = open_journal(directory)
+        print(f"  instantané     : {elapsed * 1000:>7.2f} ms ({size:.0f} Mo)")
+        start = time.perf_counter()
+        count = task_store.count_tasks(1)
+        elapsed = time.perf_counter() - start
+        print(f"  premier accès  : {elapsed * 1000:>7.2f} ms ({count} tâches)")
+        count = sum(task_store.count_tasks(user_id) for user_id in range(1, 101))
+        assert count == args.tasks, count
+        journal.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Micro-benchmark de la sérialisation des listes de tâches.
+
+Compare, pour N tâches renvoyées par ``GET /api/v1/tasks/`` :
+
+- le chemin par défaut de FastAPI : revalidation selon le ``response_model``
+  (``serialize_response``) puis ``JSONResponse`` ;
+- ``TrustedJSONResponse`` : sérialisation directe des tâches déjà valides.
+
+Le temps de lecture des tâches dans le stockage en mémoire est donné à titre
+de comparaison. Les deux réponses sont vérifiées identiques.
+
+Usage :
+    python -m benchmarks.bench_list_response
+    python -m benchmarks.bench_list_response --sizes 1000 10000 100000 --repeat 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Callable, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from pydantic import TypeAdapter
+
+from src.api.responses import TrustedJSONResponse
+from src.main import app
+from src.models.memory_store import TaskStore
+from src.schemas.task import Priority, Task, TaskCreate
+
+
+def list_route() -> APIRoute:
+    """Route de la liste des tâches."""
+    for route in app.routes:
+        if (
+            isinstance(route, APIRoute)
+            and route.path == "/api/v1/tasks/"
+            and "GET" in route.methods
+        ):
+            return route
+    raise LookupError("Route GET /api/v1/tasks/ introuvable")
+
+
+def build_store(tasks: int) -> TaskStore:
+    """Stockage contenant ``tasks`` tâches pour l'utilisateur 1."""
+    store = TaskStore()
+    store.create_tasks(
+        [
+            TaskCreate(
+                title=f"Task {i}",
+                description="Lorem ipsum dolor sit amet",
+                priority=Priority.HIGH if i % 2 else Priority.LOW,
+                due_date=datetime(2030, 1, i % 28 + 1) if i % 3 else None,
+            )
+            for i in range(tasks)
+        ],
+        1,
+    )
+    return store
+
+
+def median_ms(func: Callable[[], Any], repeat: int) -> float:
+    """Durée médiane d'un appel, en millisecondes."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    field = list_route().response_field
+    adapter = TypeAdapter(List[Task])
+
+    def validated(tasks: List[Task]) -> bytes:
+        content = asyncio.run(
+            serialize_response(field=field, response_content=tasks)
+        )
+        return bytes(JSONResponse(content).body)
+
+    def trusted(tasks: List[Task]) -> bytes:
+        return bytes(TrustedJSONResponse(tasks, adapter).body)
+
+    print(
+        f"{'tâches':>8} | {'stockage (ms)':>13} | {'validée (ms)':>12} | "
+        f"{'directe (ms)':>12} | {'gain':>5}"
+    )
+    for size in args.sizes:
+        store = build_store(size)
+        tasks = store.get_all_tasks(1)
+        assert validated(tasks) == trusted(tasks)
+        read_ms = median_ms(lambda: store.get_all_tasks(1), args.repeat)
+        validated_ms = median_ms(lambda: validated(tasks), args.repeat)
+        trusted_ms = median_ms(lambda: trusted(tasks), args.repeat)
+        print(
+            f"{size:>8} | {read_ms:>13.1f} | {validated_ms:>12.1f} | "
+            f"{trusted_ms:>12.1f} | {validated_ms / trusted_ms:>4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""Benchmark de charge : débit et latence par route sous une charge mixte.
+
+L'application (``src.main:app``) est servie dans le processus par un client
+ASGI (httpx), sans réseau ni serveur. Chaque utilisateur virtuel :
+
+- s'inscrit et se connecte ;
+- crée ses ``--tasks`` tâches initiales par lots (``POST /tasks/bulk``) ;
+- enchaîne ensuite, jusqu'à l'échéance, des requêtes tirées selon
+  ``--mix`` : liste paginée, lecture, création, mise à jour, suppression.
+
+``--concurrency`` utilisateurs virtuels s'exécutent en même temps. Pour
+chaque route (méthode et chemin de la route, sans les IDs), le benchmark
+donne le débit et les latences p50, p95 et p99 ; les requêtes de la période
+de chauffe (``--warmup``) ne sont pas comptées. Les résultats sont écrits
+en JSON (``--output``) avec le commit et les paramètres de la mesure ;
+``--baseline`` compare la mesure à un fichier d'un autre commit. Le
+stockage est celui de la configuration (``STORAGE_BACKEND``...).
+
+Usage :
+    python -m benchmarks.bench_load
+    python -m benchmarks.bench_load --concurrency 32 --tasks 5000 --duration 20
+    python -m benchmarks.bench_load --output after.json --baseline before.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import httpx
+
+from src import config
+from src.main import app
+from src.schemas.task import Priority
+
+BASE_URL = "http://benchmark"
+PASSWORD = "load-password"
+DEFAULT_MIX = "list=40,get=25,create=15,update=15,delete=5"
+OPERATIONS = ("list", "get", "create", "update", "delete")
+PRIORITIES = [priority.value for priority in Priority]
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Poids des opérations, au format ``list=40,get=25,...``."""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in OPERATIONS or not weight.isdigit():
+            raise argparse.ArgumentTypeError(f"Opération invalide : {item!r}")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("Au moins un poids doit être positif")
+    return mix
+
+
+def percentile(timings: List[float], fraction: float) -> float:
+    """Percentile (rang le plus proche) d'une liste de durées triée."""
+    index = min(int(len(timings) * fraction), len(timings) - 1)
+    return timings[index]
+
+
+class Recorder:
+    """Latences (en millisecondes) et erreurs des requêtes, par route.
+
+    Les requêtes commencées avant ``since`` (chauffe) ne sont pas comptées.
+    """
+
+    def __init__(self, since: float = 0.0) -> None:
+        self.since = since
+        self.timings: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    async def request(
+        self,
+        client: httpx.AsyncClient,
+        route: str,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Exécuter une requête et la compter sous ``route``."""
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        if start >= self.since:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings.setdefault(route, []).append(elapsed)
+            if response.status_code >= 400:
+                self.errors[route] = self.errors.get(route, 0) + 1
+        return response
+
+    def report(self, duration: float) -> Dict[str, Any]:
+        """Débit et latences de chaque route, et le total."""
+        routes = {}
+        for route, timings in sorted(self.timings.items()):
+            timings.sort()
+            routes[route] = {
+                "requests": len(timings),
+                "rps": len(timings) / duration,
+                "errors": self.errors.get(route, 0),
+                "p50_ms": percentile(timings, 0.50),
+                "p95_ms": percentile(timings, 0.95),
+                "p99_ms": percentile(timings, 0.99),
+                "max_ms": timings[-1],
+            }
+        requests = sum(route["requests"] for route in routes.values())
+        return {
+            "duration": duration,
+            "requests": requests,
+            "rps": requests / duration,
+            "errors": sum(self.errors.values()),
+            "routes": routes,
+        }
+
+
+class VirtualUser:
+    """Utilisateur de l'API, avec son jeu de tâches."""
+
+    def __init__(
+        self, client: httpx.AsyncClient, number: int, args: argparse.Namespace
+    ):
+        self.client = client
+        self.username = f"load-{args.run_id}-{number}"
+        self.rng = random.Random(args.seed + number)
+        self.headers: Dict[str, str] = {}
+        self.task_ids: List[int] = []
+
+    async def prepare(self, recorder: Recorder, tasks: int) -> None:
+        """S'inscrire, se connecter et créer les tâches initiales par lots."""
+        await recorder.request(
+            self.client,
+            "POST /api/v1/auth/register",
+            "POST",
+            "/api/v1/auth/register",
+            json={
+                "username": self.username,
+                "email": f"{self.username}@example.com",
+                "password": PASSWORD,
+            },
+        )
+        response = await recorder.request(
+            self.client,
+            "POST /api/v1/auth/login",
+            "POST",
+            "/api/v1/auth/login",
+            data={"username": self.username, "password": PASSWORD},
+        )
+        response.raise_for_status()
+        token = response.json()["access_token"]
+        self.headers = {"Authorization": f"Bearer {token}"}
+        for offset in range(0, tasks, config.BULK_MAX_TASKS):
+            count = min(config.BULK_MAX_TASKS, tasks - offset)
+            response = await recorder.request(
+                self.client,
+                "POST /api/v1/tasks/bulk",
+                "POST",
+                "/api/v1/tasks/bulk",
+                json=[
+                    {
+                        "title": f"Task {offset + i}",
+                        "priority": self.rng.choice(PRIORITIES),
+                    }
+                    for i in range(count)
+                ],
+                headers=self.headers,
+            )
+            response.raise_for_status()
+            self.task_ids.extend(task["id"] for task in response.json()["created"])
+
+    async def load(
+        self, recorder: Recorder, mix: Dict[str, int], deadline: float
+    ) -> None:
+        """Enchaîner des requêtes tirées selon ``mix`` jusqu'à l'échéance."""
+        actions = {
+            "list": self.list_tasks,
+            "get": self.get_task,
+            "create": self.create_task,
+            "update": self.update_task,
+            "delete": self.delete_task,
+        }
+        names = list(mix)
+        weights = list(mix.values())
+        while time.perf_counter() < deadline:
+            operation = self.rng.choices(names, weights)[0]
+            if operation in ("get", "update", "delete") and not self.task_ids:
+                operation = "create"
+            await actions[operation](recorder)
+
+    async def list_tasks(self, recorder: Recorder) -> None:
+        """Première page de la liste des tâches."""
+        await recorder.request(
+            self.client,
+            "GET /api/v1/tasks/",
+            "GET",
+            "/api/v1/tasks/",
+            params={"limit": 50},
+            headers=self.headers,
+        )
+
+    async def get_task(self, recorder: Recorder) -> None:
+        """Lecture d'une tâche au hasard."""
+        await recorder.request(
+            self.client,
+            "GET /api/v1/tasks/{task_id}",
+            "GET",
+            f"/api/v1/tasks/{self.rng.choice(self.task_ids)}",
+            headers=self.headers,
+        )
+
+    async def create_task(self, recorder: Recorder) -> None:
+        """Création d'une tâche."""
+        response = await recorder.request(
+            self.client,
+            "POST /api/v1/tasks/",
+            "POST",
+            "/api/v1/tasks/",
+            json={"title": "New task", "priority": self.rng.choice(PRIORITIES)},
+            headers=self.headers,
+        )
+        if response.status_code == 201:
+            self.task_ids.append(response.json()["id"])
+
+    async def update_task(self, recorder: Recorder) -> None:
+        """Mise à jour d'une tâche au hasard."""
+        await recorder.request(
+            self.client,
+            "PUT /api/v1/tasks/{task_id}",
+            "PUT",
+            f"/api/v1/tasks/{self.rng.choice(self.task_ids)}",
+            json={"completed": self.rng.random() < 0.5},
+            headers=self.headers,
+        )
+
+    async def delete_task(self, recorder: Recorder) -> None:
+        """Suppression d'une tâche au hasard."""
+        task_id = self.task_ids.pop(self.rng.randrange(len(self.task_ids)))
+        await recorder.request(
+            self.client,
+            "DELETE /api/v1/tasks/{task_id}",
+            "DELETE",
+            f"/api/v1/tasks/{task_id}",
+            headers=self.headers,
+        )
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Préparer les utilisateurs, puis exécuter la charge mixte mesurée."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url=BASE_URL, timeout=None
+    ) as client:
+        users = [VirtualUser(client, n, args) for n in range(args.concurrency)]
+        setup = Recorder()
+        start = time.perf_counter()
+        await asyncio.gather(*(user.prepare(setup, args.tasks) for user in users))
+        setup_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        recorder = Recorder(since=start + args.warmup)
+        deadline = recorder.since + args.duration
+        await asyncio.gather(
+            *(user.load(recorder, args.mix, deadline) for user in users)
+        )
+        duration = time.perf_counter() - recorder.since
+    return {"setup": setup.report(setup_duration), "load": recorder.report(duration)}
+
+
+def git_commit() -> str | None:
+    """Commit courant, s'il est connu."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_phase(
+    title: str, phase: Dict[str, Any], baseline: Dict[str, Any] | None
+) -> None:
+    """Afficher le tableau des routes d'une phase, avec l'écart à la référence."""
+
+    def delta(route: str, key: str, value: float) -> str:
+        reference = (baseline or {}).get("routes", {}).get(route, {}).get(key)
+        if not reference:
+            return ""
+        return f" ({(value / reference - 1) * 100:+.0f}%)"
+
+    print(
+        f"{title} : {phase['requests']} requêtes en {phase['duration']:.1f} s, "
+        f"{phase['rps']:.0f} req/s, {phase['errors']} erreurs"
+    )
+    print(
+        f"  {'route':<30} | {'requêtes':>8} | {'req/s':>13} | {'p50 (ms)':>14} | "
+        f"{'p95 (ms)':>14} | {'p99 (ms)':>14}"
+    )
+    for route, stats in phase["routes"].items():
+        columns = [f"{stats['rps']:.0f}{delta(route, 'rps', stats['rps'])}".rjust(13)]
+        columns.extend(
+            f"{stats[key]:.2f}{delta(route, key, stats[key])}".rjust(14)
+            for key in ("p50_ms", "p95_ms", "p99_ms")
+        )
+        print(f"  {route:<30} | {stats['requests']:>8} | " + " | ".join(columns))
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--concurrency", type=int, default=16, help="utilisateurs virtuels"
+    )
+    parser.add_argument(
+        "--tasks", type=int, default=1000, help="tâches initiales par utilisateur"
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="secondes")
+    parser.add_argument(
+        "--warmup", type=float, default=1.0, help="secondes non comptées"
+    )
+    parser.add_argument(
+        "--mix", type=parse_mix, default=DEFAULT_MIX, help=f"défaut : {DEFAULT_MIX}"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_load.json", help="fichier JSON")
+    parser.add_argument("--baseline", help="résultats JSON d'une mesure précédente")
+    args = parser.parse_args()
+    args.run_id = uuid.uuid4().hex[:8]
+
+    measured = asyncio.run(run(args))
+    results: Dict[str, Any] = {
+        "commit": git_commit(),
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "storage_backend": config.STORAGE_BACKEND,
+        "parameters": {
+            "concurrency": args.concurrency,
+            "tasks": args.tasks,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "mix": args.mix,
+            "seed": args.seed,
+        },
+        **measured,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"référence : commit {baseline.get('commit')}", file=sys.stderr)
+    for phase, title in (("setup", "préparation"), ("load", "charge mixte")):
+        print_phase(title, results[phase], (baseline or {}).get(phase))
+    print(f"résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
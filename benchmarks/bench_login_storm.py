@@ -0,0 +1,125 @@
+"""Benchmark de la latence des endpoints de tâches pendant une rafale de connexions.
+
+Lance des connexions concurrentes en continu et mesure, pendant ce temps, la
+latence de ``GET /api/v1/tasks/``. Compare le hashage bcrypt exécuté dans la
+boucle d'événements (avant) et dans le pool de hashage (après).
+
+Usage :
+    python -m benchmarks.bench_login_storm
+    python -m benchmarks.bench_login_storm --logins 32 --duration 5 --workers 8
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+from src.api import auth
+from src.auth.hashing import PasswordHashingPool
+from src.main import app
+from src.models import repositories
+from src.models.memory_store import task_store
+from src.models.user_store import user_store
+from src.schemas.task import TaskCreate
+
+BASE_URL = "http://benchmark"
+CREDENTIALS = {"username": "storm", "password": "storm-password"}
+
+
+async def setup(client: httpx.AsyncClient, tasks: int) -> dict:
+    """Créer l'utilisateur de test et ses tâches, et retourner ses en-têtes."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={**CREDENTIALS, "email": "storm@example.com"},
+    )
+    response = await client.post("/api/v1/auth/login", data=CREDENTIALS)
+    token = response.json()["access_token"]
+    user = user_store.get_user_by_username(CREDENTIALS["username"])
+    assert user is not None
+    for i in range(tasks):
+        task_store.create_task(TaskCreate(title=f"Task {i}"), user.id)
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def login_loop(client: httpx.AsyncClient, deadline: float) -> int:
+    """Se connecter en boucle jusqu'à l'échéance."""
+    count = 0
+    while time.perf_counter() < deadline:
+        await client.post("/api/v1/auth/login", data=CREDENTIALS)
+        count += 1
+    return count
+
+
+async def probe_loop(
+    client: httpx.AsyncClient, headers: dict, deadline: float, interval: float
+) -> List[float]:
+    """Mesurer la latence (en millisecondes) de la liste des tâches.
+
+    Les requêtes sont planifiées à intervalle fixe et la latence est comptée
+    depuis l'instant prévu : le temps passé à attendre une boucle d'événements
+    bloquée est ainsi inclus dans la mesure.
+    """
+    timings = []
+    scheduled = time.perf_counter()
+    while scheduled < deadline:
+        await asyncio.sleep(max(scheduled - time.perf_counter(), 0))
+        await client.get("/api/v1/tasks/", headers=headers)
+        timings.append((time.perf_counter() - scheduled) * 1000)
+        scheduled += interval
+    return timings
+
+
+async def run(mode: str, workers: int, args: argparse.Namespace) -> None:
+    """Exécuter un scénario avec le mode de hashage donné."""
+    task_store.clear()
+    user_store.clear()
+    hasher = PasswordHashingPool(workers, max_pending=10_000)
+    # L'inscription hashe dans le router, la connexion dans le dépôt.
+    auth.password_hasher = repositories.password_hasher = hasher
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=BASE_URL) as client:
+        headers = await setup(client, args.tasks)
+        deadline = time.perf_counter() + args.duration
+        probe = asyncio.create_task(
+            probe_loop(client, headers, deadline, args.interval / 1000)
+        )
+        logins = sum(
+            await asyncio.gather(
+                *(login_loop(client, deadline) for _ in range(args.logins))
+            )
+        )
+        timings = await probe
+    hasher.shutdown()
+
+    quantiles = statistics.quantiles(timings, n=100)
+    print(
+        f"{mode:>8} | {logins / args.duration:>10.1f} | "
+        f"{quantiles[49]:>9.1f} | {quantiles[98]:>9.1f} | {max(timings):>9.1f}"
+    )
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=16, help="connexions concurrentes")
+    parser.add_argument("--duration", type=float, default=5.0, help="secondes")
+    parser.add_argument("--workers", type=int, default=4, help="threads du pool")
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument(
+        "--interval", type=float, default=10.0, help="ms entre deux requêtes sondes"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'hashage':>8} | {'logins/s':>10} | {'p50 (ms)':>9} | "
+        f"{'p99 (ms)':>9} | {'max (ms)':>9}"
+    )
+    asyncio.run(run("boucle", 0, args))
+    asyncio.run(run("pool", args.workers, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark de la mémoire occupée par les tâches du stockage en mémoire.
+
+Mesure (avec ``tracemalloc``) les octets par tâche :
+
+- d'un dictionnaire de modèles ``Task``, l'ancienne représentation de
+  ``TaskStore._tasks`` ;
+- d'un dictionnaire de ``TaskRecord``, sa représentation actuelle ;
+- d'un ``TaskStore`` complet (enregistrements et index secondaires).
+
+Les chaînes et les dates des tâches sont comptées : elles sont créées avec
+les données d'entrée, qui sont ensuite libérées.
+
+Usage :
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory --tasks 1000000 --users 100
+"""
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, List
+
+from src.models.memory_store import TaskStore
+from src.models.task_record import TaskRecord
+from src.schemas.task import Task, TaskCreate
+
+BATCH_SIZE = 10_000
+
+
+def task_inputs(tasks: int) -> List[TaskCreate]:
+    """Tâches à stocker, validées comme celles reçues par l'API."""
+    return [
+        TaskCreate.model_validate(
+            {
+                "title": f"Task number {i}",
+                "description": f"Imported from the previous tracker ({i})",
+                "completed": i % 3 == 0,
+                "priority": "High" if i % 2 else "Low",
+                "due_date": f"2030-01-{i % 28 + 1:02d}T12:00:00" if i % 2 else None,
+            }
+        )
+        for i in range(tasks)
+    ]
+
+
+def task_models(inputs: List[TaskCreate], users: int) -> Any:
+    """Dictionnaire de modèles ``Task`` (ancienne représentation)."""
+    now = datetime.now()
+    return {
+        task_id: Task(
+            id=task_id,
+            user_id=1 + task_id % users,
+            created_at=now,
+            completed_at=now if task_data.completed else None,
+            **task_data.model_dump(),
+        )
+        for task_id, task_data in enumerate(inputs, start=1)
+    }
+
+
+def task_records(inputs: List[TaskCreate], users: int) -> Any:
+    """Dictionnaire de ``TaskRecord``."""
+    now = datetime.now()
+    return {
+        task_id: TaskRecord.create(task_data, task_id, 1 + task_id % users, now)
+        for task_id, task_data in enumerate(inputs, start=1)
+    }
+
+
+def task_store(inputs: List[TaskCreate], users: int) -> Any:
+    """``TaskStore`` complet, alimenté par lots."""
+    store = TaskStore()
+    for start in range(0, len(inputs), BATCH_SIZE):
+        store.create_tasks(
+            inputs[start : start + BATCH_SIZE], 1 + start // BATCH_SIZE % users
+        )
+    return store
+
+
+def bytes_per_task(
+    build: Callable[[List[TaskCreate], int], Any], tasks: int, users: int
+) -> float:
+    """Octets alloués par tâche pour la structure construite par ``build``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        inputs = task_inputs(tasks)
+        structure = build(inputs, users)
+        del inputs
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del structure
+    return size / tasks
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"Octets par tâche ({args.tasks} tâches, {args.users} utilisateurs) :")
+    models = bytes_per_task(task_models, args.tasks, args.users)
+    print(f"  modèles Task          : {models:>7.0f}")
+    records = bytes_per_task(task_records, args.tasks, args.users)
+    print(f"  TaskRecord            : {records:>7.0f} ({models / records:.1f}x)")
+    store = bytes_per_task(task_store, args.tasks, args.users)
+    print(f"  TaskStore (avec index): {store:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
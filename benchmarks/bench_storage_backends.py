@@ -0,0 +1,158 @@
+"""Benchmark du débit des endpoints CRUD selon le backend de stockage.
+
+Chaque backend est mesuré dans un sous-processus, le backend étant choisi par
+la variable d'environnement STORAGE_BACKEND à l'import de l'application.
+
+Usage :
+    python -m benchmarks.bench_storage_backends
+    python -m benchmarks.bench_storage_backends --operations 2000 --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from functools import partial
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+BASE_URL = "http://benchmark"
+CREDENTIALS = {"username": "bench", "password": "bench-password"}
+BACKENDS = ("memory", "sqlite")
+
+
+async def timed(
+    operations: List[Callable[[], Awaitable[httpx.Response]]], concurrency: int
+) -> float:
+    """Exécuter les opérations avec une concurrence bornée et retourner le débit."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(operation: Callable[[], Awaitable[httpx.Response]]) -> None:
+        async with semaphore:
+            response = await operation()
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(operation) for operation in operations))
+    return len(operations) / (time.perf_counter() - start)
+
+
+async def measure(operations: int, concurrency: int) -> Dict[str, float]:
+    """Mesurer le débit (requêtes/s) de chaque endpoint CRUD."""
+    from src.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=BASE_URL) as client:
+        await client.post(
+            "/api/v1/auth/register",
+            json={**CREDENTIALS, "email": "bench@example.com"},
+        )
+        response = await client.post("/api/v1/auth/login", data=CREDENTIALS)
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        created: List[int] = []
+
+        async def create(i: int) -> httpx.Response:
+            response = await client.post(
+                "/api/v1/tasks/",
+                json={"title": f"Task {i}", "priority": "High"},
+                headers=headers,
+            )
+            created.append(response.json()["id"])
+            return response
+
+        results = {}
+        results["create"] = await timed(
+            [partial(create, i) for i in range(operations)], concurrency
+        )
+        results["get"] = await timed(
+            [
+                partial(client.get, f"/api/v1/tasks/{task_id}", headers=headers)
+                for task_id in created
+            ],
+            concurrency,
+        )
+        results["list (limit=50)"] = await timed(
+            [
+                partial(client.get, "/api/v1/tasks/?limit=50", headers=headers)
+                for _ in range(operations)
+            ],
+            concurrency,
+        )
+        results["update"] = await timed(
+            [
+                partial(
+                    client.put,
+                    f"/api/v1/tasks/{task_id}",
+                    json={"completed": True},
+                    headers=headers,
+                )
+                for task_id in created
+            ],
+            concurrency,
+        )
+        results["delete"] = await timed(
+            [
+                partial(client.delete, f"/api/v1/tasks/{task_id}", headers=headers)
+                for task_id in created
+            ],
+            concurrency,
+        )
+    return results
+
+
+def run_backend(backend: str, args: argparse.Namespace) -> Dict[str, float]:
+    """Mesurer un backend dans un sous-processus dédié."""
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "STORAGE_BACKEND": backend,
+            "SQLITE_PATH": os.path.join(directory, "bench.db"),
+        }
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_storage_backends",
+                "--child",
+                "--operations",
+                str(args.operations),
+                "--concurrency",
+                str(args.concurrency),
+            ],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    results: Dict[str, float] = json.loads(output.splitlines()[-1])
+    return results
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(measure(args.operations, args.concurrency))))
+        return
+
+    results = {backend: run_backend(backend, args) for backend in BACKENDS}
+    print(f"{'endpoint':>16} | " + " | ".join(f"{b + ' (req/s)':>16}" for b in BACKENDS))
+    for endpoint in results[BACKENDS[0]]:
+        print(
+            f"{endpoint:>16} | "
+            + " | ".join(f"{results[b][endpoint]:>16.0f}" for b in BACKENDS)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark de la liste des tâches d'un utilisateur.
+
+Mesure la latence de ``TaskStore.get_all_tasks`` pour un utilisateur ayant un
+nombre fixe de tâches, pendant que le nombre de tâches des autres utilisateurs
+augmente. Grâce à l'index par utilisateur, la latence doit rester stable.
+Mesure aussi ``TaskStore.list_tasks`` : une page profonde doit coûter autant
+que la première.
+
+Usage :
+    python -m benchmarks.bench_task_listing
+    python -m benchmarks.bench_task_listing --own-tasks 200 --others 0 50000 200000
+"""
+import argparse
+import statistics
+import time
+from typing import List
+
+from src.models.memory_store import TaskStore
+from src.schemas.task import TaskCreate
+
+TARGET_USER_ID = 1
+
+
+def build_store(own_tasks: int, other_tasks: int, other_users: int) -> TaskStore:
+    """Construire un stockage avec les tâches de l'utilisateur cible et des autres."""
+    store = TaskStore()
+    task_data = TaskCreate(title="Benchmark task", description="Lorem ipsum")
+    # Entrelacer les tâches pour ne pas favoriser la localité de l'utilisateur
+    total = own_tasks + other_tasks
+    own_every = max(total // max(own_tasks, 1), 1)
+    created_own = 0
+    for i in range(total):
+        if created_own < own_tasks and i % own_every == 0:
+            store.create_task(task_data, TARGET_USER_ID)
+            created_own += 1
+        else:
+            store.create_task(task_data, TARGET_USER_ID + 1 + i % other_users)
+    return store
+
+
+def measure(store: TaskStore, repeat: int) -> List[float]:
+    """Mesurer la latence (en microsecondes) de la liste des tâches."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        store.get_all_tasks(TARGET_USER_ID)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def measure_page(
+    store: TaskStore, cursor: str | None, page_size: int, repeat: int
+) -> List[float]:
+    """Mesurer la latence (en microsecondes) d'une page de la liste."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        store.list_tasks(TARGET_USER_ID, limit=page_size, cursor=cursor)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def deep_cursor(store: TaskStore, page_size: int) -> str | None:
+    """Obtenir le curseur de l'avant-dernière page de l'utilisateur cible."""
+    tasks = store.get_all_tasks(TARGET_USER_ID)
+    if len(tasks) <= 2 * page_size:
+        return None
+    page = store.list_tasks(TARGET_USER_ID, limit=len(tasks) - 2 * page_size)
+    return page.next_cursor
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--own-tasks", type=int, default=100)
+    parser.add_argument(
+        "--others", type=int, nargs="+", default=[0, 10_000, 100_000, 300_000]
+    )
+    parser.add_argument("--other-users", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--page-owner-tasks", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'autres tâches':>14} | {'médiane (µs)':>12} | {'p99 (µs)':>10}")
+    for other_tasks in args.others:
+        store = build_store(args.own_tasks, other_tasks, args.other_users)
+        assert store.count_tasks(TARGET_USER_ID) == args.own_tasks
+        timings = measure(store, args.repeat)
+        p99 = statistics.quantiles(timings, n=100)[98]
+        print(
+            f"{other_tasks:>14} | {statistics.median(timings):>12.1f} | {p99:>10.1f}"
+        )
+
+    print()
+    print(f"{'page':>14} | {'médiane (µs)':>12} | {'p99 (µs)':>10}")
+    store = build_store(args.page_owner_tasks, 0, 1)
+    pages = [("première", None), ("profonde", deep_cursor(store, args.page_size))]
+    for label, cursor in pages:
+        timings = measure_page(store, cursor, args.page_size, args.repeat)
+        p99 = statistics.quantiles(timings, n=100)[98]
+        print(f"{label:>14} | {statistics.median(timings):>12.1f} | {p99:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
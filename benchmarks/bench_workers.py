@@ -0,0 +1,244 @@
+"""Benchmark de montée en charge : débit selon le nombre de workers uvicorn.
+
+Pour chaque nombre de workers (``--workers``), un serveur uvicorn est lancé
+sur le stockage "shared" (base neuve dans ``--directory``, de la mémoire
+partagée par défaut) ; ``--clients`` processus lui envoient en HTTP la
+charge mixte de ``bench_load``, avec ``--concurrency`` utilisateurs
+virtuels chacun. Les utilisateurs sont répartis sur tous les workers : la
+charge n'est servie correctement que si tous voient les mêmes données.
+
+Donne, par nombre de workers, le débit, les latences p50 et p99, les
+erreurs et l'efficacité de la montée en charge (débit rapporté à celui d'un
+worker multiplié par le nombre de workers). Les générateurs de charge
+occupent eux aussi des cœurs : l'efficacité n'a de sens que si la machine
+en a plus que de workers et de clients réunis (affiché en tête). Les
+résultats sont écrits en JSON (``--output``).
+
+Usage :
+    python -m benchmarks.bench_workers
+    python -m benchmarks.bench_workers --workers 1,2,4,8 --clients 8 --duration 20
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from multiprocessing.synchronize import Barrier
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.bench_load import (
+    DEFAULT_MIX,
+    Recorder,
+    VirtualUser,
+    git_commit,
+    parse_mix,
+    percentile,
+)
+
+
+def free_port() -> int:
+    """Port TCP libre sur l'interface locale."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def start_server(workers: int, port: int, database: str) -> subprocess.Popen:
+    """Lancer uvicorn avec ``workers`` workers et attendre qu'il réponde."""
+    env = dict(os.environ, STORAGE_BACKEND="shared", SHARED_PATH=database)
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn s'est arrêté (code {server.returncode})")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                # Laisser les derniers workers finir de démarrer
+                time.sleep(1)
+                return server
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("uvicorn ne répond pas")
+
+
+async def drive(
+    port: int, client: int, args: argparse.Namespace, barrier: Barrier
+) -> Dict[str, Any]:
+    """Charge d'un processus client : préparation, puis mesure synchronisée."""
+    args.seed += client * args.concurrency
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}",
+        timeout=60,
+        limits=httpx.Limits(max_connections=args.concurrency),
+    ) as http:
+        users = [
+            VirtualUser(http, client * args.concurrency + n, args)
+            for n in range(args.concurrency)
+        ]
+        await asyncio.gather(*(user.prepare(Recorder(), args.tasks) for user in users))
+        # Tous les clients commencent la charge ensemble
+        barrier.wait()
+        recorder = Recorder(since=time.perf_counter() + args.warmup)
+        deadline = recorder.since + args.duration
+        await asyncio.gather(
+            *(user.load(recorder, args.mix, deadline) for user in users)
+        )
+    return {"timings": recorder.timings, "errors": recorder.errors}
+
+
+def client_process(
+    port: int,
+    client: int,
+    args: argparse.Namespace,
+    barrier: Barrier,
+    results: "multiprocessing.Queue[Dict[str, Any]]",
+) -> None:
+    """Point d'entrée d'un processus client."""
+    results.put(asyncio.run(drive(port, client, args, barrier)))
+
+
+def measure(workers: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """Servir la charge avec ``workers`` workers ; débit et latences totaux."""
+    database = os.path.join(args.directory, f"bench-workers-{uuid.uuid4().hex}.db")
+    port = free_port()
+    server = start_server(workers, port, database)
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(args.clients)
+    results: "multiprocessing.Queue[Dict[str, Any]]" = context.Queue()
+    try:
+        clients = [
+            context.Process(
+                target=client_process, args=(port, n, args, barrier, results)
+            )
+            for n in range(args.clients)
+        ]
+        for process in clients:
+            process.start()
+        recorder = Recorder()
+        for _ in clients:
+            result = results.get()
+            for route, timings in result["timings"].items():
+                recorder.timings.setdefault(route, []).extend(timings)
+            for route, errors in result["errors"].items():
+                recorder.errors[route] = recorder.errors.get(route, 0) + errors
+        for process in clients:
+            process.join()
+    finally:
+        server.terminate()
+        server.wait(30)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(database + suffix):
+                os.remove(database + suffix)
+    report = recorder.report(args.duration)
+    timings = sorted(t for route in recorder.timings.values() for t in route)
+    report["p50_ms"] = percentile(timings, 0.50) if timings else 0.0
+    report["p99_ms"] = percentile(timings, 0.99) if timings else 0.0
+    return report
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        type=lambda value: [int(n) for n in value.split(",")],
+        default=[1, 2, 4, 8],
+        help="nombres de workers mesurés, ex. 1,2,4,8",
+    )
+    parser.add_argument("--clients", type=int, default=4, help="processus clients")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="utilisateurs virtuels par client"
+    )
+    parser.add_argument(
+        "--tasks", type=int, default=200, help="tâches initiales par utilisateur"
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="secondes")
+    parser.add_argument(
+        "--warmup", type=float, default=2.0, help="secondes non comptées"
+    )
+    parser.add_argument(
+        "--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=DEFAULT_MIX
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--directory", default="/dev/shm", help="répertoire des bases mesurées"
+    )
+    parser.add_argument(
+        "--output", default="bench_workers.json", help="fichier JSON"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{os.cpu_count()} cœurs, {args.clients} clients × {args.concurrency} "
+        f"utilisateurs virtuels, {args.duration:.0f} s par mesure"
+    )
+    print(
+        f"  {'workers':>7} | {'req/s':>8} | {'p50 (ms)':>8} | {'p99 (ms)':>8} | "
+        f"{'erreurs':>7} | {'efficacité':>10}"
+    )
+    results: List[Dict[str, Any]] = []
+    for workers in args.workers:
+        # Utilisateurs distincts d'une mesure à l'autre
+        args.run_id = uuid.uuid4().hex[:8]
+        report = measure(workers, args)
+        report["workers"] = workers
+        base = results[0] if results else report
+        report["efficiency"] = (
+            report["rps"] / (base["rps"] / base["workers"] * workers)
+            if base["rps"]
+            else 0.0
+        )
+        results.append(report)
+        print(
+            f"  {workers:>7} | {report['rps']:>8.0f} | {report['p50_ms']:>8.2f} | "
+            f"{report['p99_ms']:>8.2f} | {report['errors']:>7} | "
+            f"{report['efficiency'] * 100:>9.0f}%"
+        )
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "commit": git_commit(),
+                "cpu_count": os.cpu_count(),
+                "parameters": {
+                    key: value
+                    for key, value in vars(args).items()
+                    if key not in ("output", "run_id")
+                },
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+    print(f"Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
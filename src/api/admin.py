@@ -0,0 +1,103 @@
+"""Endpoints d'administration : profilage à la demande, mémoire des stockages."""
+import asyncio
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from src.api.auth import get_current_admin_user
+from src.api.dependencies import get_task_repository, get_user_repository
+from src.api.profiling import (
+    ProfilerBusyError,
+    collapsed_stacks,
+    sample_stacks,
+    trace_allocations,
+)
+from src.auth.token_cache import token_cache
+from src.config import PROFILE_MAX_SECONDS
+from src.models.repositories import TaskRepository, UserRepository
+from src.schemas.admin import AllocationProfile, MemoryUsage
+from src.schemas.user import User
+
+router = APIRouter(prefix="/admin", tags=["administration"])
+
+Seconds = Annotated[
+    float,
+    Query(gt=0, le=PROFILE_MAX_SECONDS, description="Durée du profilage, en secondes"),
+]
+
+
+def _conflict(error: ProfilerBusyError) -> HTTPException:
+    """Erreur renvoyée quand un profilage est déjà en cours."""
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(error))
+
+
+@router.get("/profile/cpu", response_class=PlainTextResponse)
+async def profile_cpu(
+    current_user: Annotated[User, Depends(get_current_admin_user)],
+    seconds: Seconds = 10,
+    interval_ms: Annotated[
+        float, Query(ge=1, le=1000, description="Intervalle entre deux échantillons")
+    ] = 10,
+    lineno: Annotated[
+        bool, Query(description="Distinguer les lignes d'une même fonction")
+    ] = False,
+    idle: Annotated[bool, Query(description="Garder les threads inactifs")] = False,
+) -> PlainTextResponse:
+    """Échantillonner les piles de tous les threads pendant ``seconds``.
+
+    Piles repliées au format flamegraph (``flamegraph.pl``, speedscope),
+    une par ligne avec son nombre d'échantillons. L'échantillonnage tourne
+    dans un thread : la boucle d'événements continue de servir les requêtes,
+    qui figurent dans le profil.
+    """
+    try:
+        stacks = await asyncio.to_thread(
+            sample_stacks, seconds, interval_ms / 1000, lineno, idle
+        )
+    except ProfilerBusyError as e:
+        raise _conflict(e)
+    return PlainTextResponse(collapsed_stacks(stacks))
+
+
+@router.get("/profile/memory", response_model=AllocationProfile)
+async def profile_memory(
+    current_user: Annotated[User, Depends(get_current_admin_user)],
+    seconds: Seconds = 10,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 50,
+) -> AllocationProfile:
+    """Lignes de code ayant le plus alloué pendant ``seconds`` (tracemalloc).
+
+    Seules les allocations encore en mémoire à la fin comptent : c'est la
+    croissance de la mémoire pendant le profilage, par ligne.
+    """
+    try:
+        return await asyncio.to_thread(trace_allocations, seconds, limit)
+    except ProfilerBusyError as e:
+        raise _conflict(e)
+
+
+@router.get("/memory", response_model=MemoryUsage)
+async def memory_usage(
+    current_user: Annotated[User, Depends(get_current_admin_user)],
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
+    users: Annotated[UserRepository, Depends(get_user_repository)],
+    limit: Annotated[
+        int, Query(ge=1, le=1000, description="Utilisateurs les plus lourds détaillés")
+    ] = 10,
+) -> MemoryUsage:
+    """Mémoire estimée des stockages en mémoire et du cache des jetons.
+
+    Les estimations sont tenues à jour à chaque écriture ou déduites du
+    nombre d'entrées des index : leur calcul ne parcourt ni les tâches ni
+    les utilisateurs.
+    """
+    task_store = await tasks.memory_usage(limit)
+    user_store = await users.memory_usage()
+    token_cache_bytes = token_cache.memory_bytes()
+    return MemoryUsage(
+        task_store=task_store,
+        user_store=user_store,
+        token_cache_bytes=token_cache_bytes,
+        total_bytes=task_store.total_bytes + user_store.total_bytes + token_cache_bytes,
+    )
@@ -4,12 +4,16 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
+from src.api.dependencies import get_user_repository, user_repository
+from src.auth.hashing import HashingPoolSaturatedError, password_hasher
 from src.auth.security import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     create_access_token,
-    verify_token,
+    decode_access_token,
 )
-from src.models.user_store import user_store
+from src.auth.token_cache import token_cache
+from src.config import ADMIN_USERNAMES
+from src.models.repositories import UserRepository
 from src.schemas.user import Token, User, UserCreate
 
 router = APIRouter(prefix="/auth", tags=["authentification"])
@@ -17,25 +21,40 @@ router = APIRouter(prefix="/auth", tags=["authentification"])
 # OAuth2 scheme pour récupérer le token depuis l'en-tête Authorization
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Les tokens en cache d'un utilisateur désactivé ne doivent plus être acceptés
+user_repository.add_invalidation_listener(token_cache.invalidate_user)
+
+
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    users: Annotated[UserRepository, Depends(get_user_repository)],
+) -> User:
+    """Récupérer l'utilisateur actuel à partir du token JWT.
+
+    Les tokens déjà vérifiés sont servis depuis ``token_cache``.
+    """
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> User:
-    """Récupérer l'utilisateur actuel à partir du token JWT."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    username = verify_token(token)
-    if username is None:
+    payload = decode_access_token(token)
+    if payload is None:
         raise credentials_exception
 
-    user = user_store.get_user_by_username(username)
+    # Une désactivation pendant la recherche empêche la mise en cache
+    generation = token_cache.generation
+    user = await users.get_user_by_username(payload["sub"])
     if user is None:
         raise credentials_exception
 
     # Convertir UserInDB vers User
-    return User(
+    current_user = User(
         id=user.id,
         username=user.username,
         email=user.email,
@@ -43,6 +62,8 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Use
         is_active=user.is_active,
         created_at=user.created_at,
     )
+    token_cache.put(token, current_user, payload["exp"], generation)
+    return current_user
 
 
 async def get_current_active_user(
@@ -54,20 +75,54 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_current_admin_user(
+    current_user: Annotated[User, Depends(get_current_active_user)]
+) -> User:
+    """Récupérer l'utilisateur actuel, s'il est administrateur (ADMIN_USERNAMES)."""
+    if current_user.username not in ADMIN_USERNAMES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Administrator only"
+        )
+    return current_user
+
+
+def _service_unavailable(error: HashingPoolSaturatedError) -> HTTPException:
+    """Erreur renvoyée quand le pool de hashage est saturé."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(error),
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate) -> User:
+async def register(
+    user_data: UserCreate,
+    users: Annotated[UserRepository, Depends(get_user_repository)],
+) -> User:
     """Enregistrer un nouvel utilisateur."""
     try:
-        user = user_store.create_user(user_data)
+        hashed_password = await password_hasher.hash(user_data.password)
+    except HashingPoolSaturatedError as e:
+        raise _service_unavailable(e)
+
+    try:
+        user = await users.create_user(user_data, hashed_password=hashed_password)
         return user
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post("/login", response_model=Token)
-async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]) -> Token:
+async def login(
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    users: Annotated[UserRepository, Depends(get_user_repository)],
+) -> Token:
     """Connecter un utilisateur et retourner un token JWT."""
-    user = user_store.authenticate_user(form_data.username, form_data.password)
+    try:
+        user = await users.authenticate_user(form_data.username, form_data.password)
+    except HashingPoolSaturatedError as e:
+        raise _service_unavailable(e)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,61 @@
+"""Requêtes conditionnelles : ETag, If-None-Match et If-Match."""
+from typing import Dict, List
+
+from fastapi import Response, status
+
+# Version attendue qu'aucune tâche n'a : la condition échoue toujours
+NO_VERSION = -1
+
+
+def entity_tag(user_id: int, version: int) -> str:
+    """ETag d'une représentation des tâches d'un utilisateur, à une version.
+
+    Tiré des versions tenues par le stockage plutôt que d'un condensat du
+    corps : il se calcule sans lire ni sérialiser les tâches. L'utilisateur y
+    figure, ses versions n'étant uniques que pour lui.
+    """
+    return f'"{user_id}-{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Vrai si l'en-tête ``If-None-Match`` désigne ``etag``.
+
+    Comparaison faible (RFC 9110) : le préfixe ``W/`` est ignoré.
+    """
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def if_match_versions(if_match: str, user_id: int) -> List[int] | None:
+    """Versions désignées par l'en-tête ``If-Match`` ; None pour ``*``.
+
+    Comparaison forte (RFC 9110) : un ETag faible, ou qui n'est pas un ETag
+    de l'utilisateur, ne désigne aucune version.
+    """
+    if if_match.strip() == "*":
+        return None
+    prefix = f'"{user_id}-'
+    versions = []
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        value = tag[len(prefix) : -1]
+        if tag.startswith(prefix) and tag.endswith('"') and value.isdecimal():
+            versions.append(int(value))
+    return versions
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    """En-têtes d'une réponse à revalider à chaque utilisation."""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    """Réponse 304, sans corps : le client réutilise sa copie."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag)
+    )
@@ -0,0 +1,18 @@
+"""Dépendances FastAPI donnant accès au stockage.
+
+Les handlers reçoivent les ports asynchrones ``TaskRepository`` et
+``UserRepository`` ; le backend peut être changé (ou remplacé dans les tests
+via ``app.dependency_overrides``) sans toucher aux handlers.
+"""
+from src.models.repositories import TaskRepository, UserRepository
+from src.models.stores import task_repository, user_repository
+
+
+def get_task_repository() -> TaskRepository:
+    """Port d'accès aux tâches."""
+    return task_repository
+
+
+def get_user_repository() -> UserRepository:
+    """Port d'accès aux utilisateurs."""
+    return user_repository
@@ -0,0 +1,237 @@
+"""Diffusion en direct des modifications de tâches (Server-Sent Events)."""
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Set
+
+from pydantic import TypeAdapter
+
+from src.api.dependencies import task_repository
+from src.config import EVENTS_HEARTBEAT_SECONDS, EVENTS_QUEUE_SIZE, STORAGE_BACKEND
+from src.schemas.task import TaskChanges, TaskEventType
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+# Commentaire SSE envoyé sur une connexion inactive
+HEARTBEAT = b": ping\n\n"
+
+_changes_adapter = TypeAdapter(TaskChanges)
+
+
+def sse_frame(event: str, changes: TaskChanges) -> bytes:
+    """Événement SSE portant ``changes``, identifié par sa version.
+
+    Un ``EventSource`` qui se reconnecte renvoie cette version dans
+    l'en-tête ``Last-Event-ID``.
+    """
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (
+        changes.version,
+        event.encode(),
+        _changes_adapter.dump_json(changes),
+    )
+
+
+class Subscription:
+    """Abonnement d'une connexion aux événements d'un utilisateur.
+
+    Les événements attendent leur envoi dans une file bornée ; la connexion
+    attend sur un unique futur, sans minuterie.
+    """
+
+    __slots__ = (
+        "user_id",
+        "max_pending",
+        "frames",
+        "dropped",
+        "active",
+        "version",
+        "_waiter",
+    )
+
+    def __init__(self, user_id: int, max_pending: int):
+        self.user_id = user_id
+        self.max_pending = max_pending
+        self.frames: Deque[bytes] = deque()
+        # Abonné trop lent, désabonné : son flux doit se terminer
+        self.dropped = False
+        # Événement reçu depuis le dernier battement de cœur
+        self.active = False
+        # Version du premier événement du flux (None avant son envoi)
+        self.version: int | None = None
+        self._waiter: asyncio.Future[None] | None = None
+
+    def push(self, frame: bytes) -> bool:
+        """Mettre un événement en file ; False si la file est pleine."""
+        if len(self.frames) >= self.max_pending:
+            return False
+        self.frames.append(frame)
+        self._wake()
+        return True
+
+    def drop(self) -> None:
+        """Terminer le flux, en abandonnant les événements en file."""
+        self.dropped = True
+        self.frames.clear()
+        self._wake()
+
+    def _wake(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def next_frames(self) -> bytes:
+        """Attendre et retirer les événements en file ; b"" si abandonné."""
+        while not self.frames and not self.dropped:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        frames = b"".join(self.frames)
+        self.frames.clear()
+        return frames
+
+
+class TaskEventBroker:
+    """Pub/sub en mémoire des modifications de tâches, par utilisateur.
+
+    Les stockages appellent ``publish`` après chaque modification, dans la
+    boucle ou dans un thread du pool (SQLite) : l'événement est sérialisé une
+    fois pour tous ses abonnés dans le thread appelant, puis distribué dans
+    la boucle. Chaque abonné a une file bornée ; un abonné dont la file est
+    pleine (client trop lent) est désabonné et son flux se termine. Le client
+    se reconnecte avec la dernière version reçue et rattrape les
+    modifications manquées depuis le journal des modifications.
+
+    Une seule minuterie envoie, toutes les ``heartbeat`` secondes, un
+    commentaire aux abonnés sans événement depuis la précédente : une
+    connexion inactive reste ouverte et une déconnexion est détectée.
+    """
+
+    def __init__(self, max_pending: int, heartbeat: float):
+        self.max_pending = max_pending
+        self.heartbeat = heartbeat
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._heartbeat_timer: asyncio.TimerHandle | None = None
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Abonner une connexion (dans la boucle) aux événements d'un utilisateur."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._heartbeat_timer = None
+        subscription = Subscription(user_id, self.max_pending)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        if self._heartbeat_timer is None and self.heartbeat > 0:
+            self._heartbeat_timer = loop.call_later(self.heartbeat, self._beat)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Désabonner une connexion (sans effet si elle ne l'est plus)."""
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id: int, event: TaskEventType, changes: TaskChanges) -> None:
+        """Diffuser une modification aux abonnés de l'utilisateur (tout thread)."""
+        self._publish(user_id, event.value, changes)
+
+    def publish_changes(self, user_id: int, changes: TaskChanges) -> None:
+        """Diffuser un événement ``changes`` : modifications depuis une version,
+        éventuellement de plusieurs natures (voir ``WorkerSync``)."""
+        self._publish(user_id, "changes", changes)
+
+    def _publish(self, user_id: int, event: str, changes: TaskChanges) -> None:
+        loop = self._loop
+        if user_id not in self._subscriptions or loop is None:
+            return
+        frame = sse_frame(event, changes)
+        try:
+            in_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            self._deliver(user_id, frame)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(self._deliver, user_id, frame)
+
+    def _deliver(self, user_id: int, frame: bytes) -> None:
+        self.published += 1
+        for subscription in list(self._subscriptions.get(user_id, ())):
+            if subscription.push(frame):
+                subscription.active = True
+            else:
+                self.unsubscribe(subscription)
+                subscription.drop()
+                self.dropped += 1
+
+    def _beat(self) -> None:
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                if not subscription.active:
+                    subscription.push(HEARTBEAT)
+                subscription.active = False
+        if self._subscriptions and self._loop is not None:
+            self._heartbeat_timer = self._loop.call_later(self.heartbeat, self._beat)
+        else:
+            self._heartbeat_timer = None
+
+    def initial_versions(self) -> Dict[int, int]:
+        """Par utilisateur abonné, plus petite version initiale de ses flux.
+
+        Les flux dont le premier événement n'est pas encore parti sont
+        ignorés.
+        """
+        versions: Dict[int, int] = {}
+        for user_id, subscriptions in self._subscriptions.items():
+            started = [s.version for s in subscriptions if s.version is not None]
+            if started:
+                versions[user_id] = min(started)
+        return versions
+
+    def subscribers(self) -> int:
+        """Nombre de connexions abonnées."""
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def stats(self) -> Dict[str, int]:
+        """Statistiques de diffusion."""
+        return {
+            "subscribers": self.subscribers(),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+async def event_stream(
+    broker: TaskEventBroker, subscription: Subscription, initial: TaskChanges
+) -> AsyncIterator[bytes]:
+    """Flux SSE d'un abonnement, jusqu'à la déconnexion du client.
+
+    Le premier événement (``changes``) donne la version courante et les
+    modifications manquées depuis la reconnexion (ou ``resync``). Les
+    événements publiés entre l'abonnement et sa lecture peuvent y figurer
+    aussi : un client ignore ceux dont l'``id`` ne dépasse pas sa version.
+    Les événements en attente sont envoyés ensemble.
+    """
+    try:
+        subscription.version = initial.version
+        yield sse_frame("changes", initial)
+        while True:
+            frames = await subscription.next_frames()
+            if not frames:
+                return
+            yield frames
+    finally:
+        broker.unsubscribe(subscription)
+
+
+# Instance globale pour cette phase
+task_events = TaskEventBroker(EVENTS_QUEUE_SIZE, EVENTS_HEARTBEAT_SECONDS)
+if STORAGE_BACKEND != "shared":
+    # Stockage "shared" : les écritures de tous les workers sont diffusées
+    # par WorkerSync
+    task_repository.add_change_listener(task_events.publish)
@@ -0,0 +1,186 @@
+"""Métriques HTTP et exposition au format texte de Prometheus."""
+from time import perf_counter_ns
+from typing import Dict, List, Mapping, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Étiquette des requêtes ne correspondant à aucune route (404)
+UNMATCHED_ROUTE = "unmatched"
+
+# Histogrammes log-linéaires, à la manière de HdrHistogram : chaque puissance
+# de 2 est découpée en 2**SUB_BUCKET_BITS intervalles égaux, soit une
+# précision relative constante (25 %). Les durées sont comptées en unités de
+# 2**UNIT_SHIFT ns (16 µs) ; au-delà de 2**MAX_VALUE_BITS unités (34 s),
+# seul le compteur +Inf est incrémenté.
+UNIT_SHIFT = 14
+SUB_BUCKET_BITS = 2
+MAX_VALUE_BITS = 21
+
+
+def bucket_index(duration_ns: int) -> int:
+    """Intervalle d'une durée, en temps constant (longueur binaire)."""
+    value = duration_ns >> UNIT_SHIFT
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return value
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def bucket_upper_bound(index: int) -> int:
+    """Borne supérieure (exclue), en unités, de l'intervalle ``index``."""
+    if index < 2 << SUB_BUCKET_BITS:
+        return index + 1
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    sub_bucket = (index & ((1 << SUB_BUCKET_BITS) - 1)) + (1 << SUB_BUCKET_BITS)
+    return (sub_bucket + 1) << shift
+
+
+BUCKET_COUNT = bucket_index(((1 << MAX_VALUE_BITS) - 1) << UNIT_SHIFT) + 1
+# Bornes ``le`` des intervalles, en secondes
+BUCKET_BOUNDS = [
+    repr(bucket_upper_bound(index) * (1 << UNIT_SHIFT) / 1e9)
+    for index in range(BUCKET_COUNT)
+]
+
+
+class LatencyHistogram:
+    """Histogramme des durées des requêtes d'une route."""
+
+    __slots__ = ("buckets", "count", "sum_ns")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.sum_ns = 0
+
+    def record(self, duration_ns: int) -> None:
+        """Compter une durée."""
+        self.count += 1
+        self.sum_ns += duration_ns
+        index = bucket_index(duration_ns)
+        if index < BUCKET_COUNT:
+            self.buckets[index] += 1
+
+
+def _escape(value: object) -> str:
+    """Valeur d'étiquette, barres obliques, guillemets et sauts de ligne échappés."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: object) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+class HttpMetrics:
+    """Requêtes en cours, et durées des requêtes par route et statut.
+
+    Tout est mis à jour dans la boucle d'événements : pas de verrou.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self._histograms: Dict[Tuple[str, str, int], LatencyHistogram] = {}
+
+    def record(self, method: str, route: str, status: int, duration_ns: int) -> None:
+        """Compter une requête terminée."""
+        key = (method, route, status)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = LatencyHistogram()
+        histogram.record(duration_ns)
+
+    def clear(self) -> None:
+        """Oublier les requêtes comptées."""
+        self._histograms = {}
+
+    def render(self) -> List[str]:
+        """Lignes de l'exposition Prometheus des métriques HTTP."""
+        series = [
+            (_labels(method=method, route=route, status=status), histogram)
+            for (method, route, status), histogram in sorted(self._histograms.items())
+        ]
+        lines = [
+            "# HELP http_requests_in_flight Requêtes HTTP en cours de traitement.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_requests_total Requêtes HTTP traitées.",
+            "# TYPE http_requests_total counter",
+        ]
+        lines.extend(
+            f"http_requests_total{{{labels}}} {histogram.count}"
+            for labels, histogram in series
+        )
+        lines.append("# HELP http_request_duration_seconds Durée des requêtes HTTP.")
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        for labels, histogram in series:
+            cumulative = 0
+            for bound, count in zip(BUCKET_BOUNDS, histogram.buckets):
+                cumulative += count
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(
+                f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} '
+                f"{histogram.count}"
+            )
+            lines.append(
+                f"http_request_duration_seconds_sum{{{labels}}} "
+                f"{histogram.sum_ns / 1e9}"
+            )
+            lines.append(
+                f"http_request_duration_seconds_count{{{labels}}} {histogram.count}"
+            )
+        return lines
+
+
+def render_gauges(prefix: str, values: Mapping[str, float]) -> List[str]:
+    """Lignes de l'exposition Prometheus de jauges ``<prefix>_<nom>``."""
+    lines = []
+    for name, value in values.items():
+        lines.append(f"# TYPE {prefix}_{name} gauge")
+        lines.append(f"{prefix}_{name} {value}")
+    return lines
+
+
+class MetricsMiddleware:
+    """Middleware ASGI comptant les requêtes HTTP dans ``HttpMetrics``.
+
+    Middleware ASGI pur (pas ``BaseHTTPMiddleware``) : par requête, deux
+    lectures d'horloge et une mise à jour d'histogramme. La route (son
+    gabarit, sans les paramètres de chemin) est celle que le routeur a
+    retenue, lue dans le scope une fois la requête traitée ; le statut est
+    celui de la réponse envoyée, 500 si aucune ne l'a été.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: HttpMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        metrics = self.metrics
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        start = perf_counter_ns()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = perf_counter_ns() - start
+            metrics.in_flight -= 1
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            metrics.record(scope["method"], route, status, duration)
+
+
+# Instance globale pour cette phase
+http_metrics = HttpMetrics()
@@ -0,0 +1,34 @@
+"""Lecture et écriture de JSON délimité par des sauts de ligne (NDJSON)."""
+from typing import AsyncIterable, AsyncIterator
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int
+) -> AsyncIterator[bytes | None]:
+    """Découper un flux d'octets en lignes, sans leur saut de ligne.
+
+    Seule la ligne en cours est conservée entre deux morceaux : la mémoire
+    utilisée ne dépend pas de la taille du flux. Une ligne de plus de
+    ``max_line_bytes`` octets est remplacée par ``None`` (une fois), sans
+    être conservée.
+    """
+    pending = b""
+    oversized = False
+    async for chunk in chunks:
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if oversized or len(line) > max_line_bytes:
+                oversized = False
+                yield None
+            else:
+                yield line.rstrip(b"\r")
+        if len(pending) > max_line_bytes:
+            pending = b""
+            oversized = True
+    if oversized or len(pending) > max_line_bytes:
+        yield None
+    elif pending:
+        yield pending.rstrip(b"\r")
@@ -0,0 +1,149 @@
+"""Profilage à la demande : échantillonnage des piles et allocations mémoire."""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Dict, List, Tuple
+
+from src.schemas.admin import AllocationProfile, AllocationStat
+
+# Fonctions en attente de travail (fichier, fonction) : une pile qui s'y
+# termine est celle d'un thread inactif
+IDLE_FRAMES = frozenset(
+    {
+        ("selectors.py", "select"),
+        ("threading.py", "wait"),
+        ("queue.py", "get"),
+        ("thread.py", "_worker"),
+    }
+)
+
+
+class ProfilerBusyError(RuntimeError):
+    """Un profilage est déjà en cours."""
+
+
+# Un seul profilage à la fois : deux échantillonneurs se mesureraient
+# l'un l'autre, et tracemalloc est global au processus
+_profile_lock = threading.Lock()
+
+
+def _frame_label(code: CodeType, frame: FrameType, lineno: bool) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    label = f"{module}:{code.co_qualname}"
+    if lineno:
+        label += f":{frame.f_lineno}"
+    return label
+
+
+def _is_idle(frame: FrameType) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+
+def sample_stacks(
+    seconds: float, interval: float, lineno: bool = False, idle: bool = False
+) -> Counter[str]:
+    """Échantillonner les piles de tous les threads pendant ``seconds``.
+
+    Toutes les ``interval`` secondes, la pile de chaque thread (sauf
+    l'appelant) est lue avec ``sys._current_frames`` : aucun traçage des
+    appels, le coût ne dépend que de la fréquence d'échantillonnage. Les
+    piles sont comptées au format « replié » de flamegraph : nom du thread
+    puis cadres, de la racine à la feuille, séparés par ``;``. Les threads
+    inactifs (boucle d'événements sans requête, threads de pool en attente)
+    sont ignorés, sauf avec ``idle``.
+
+    Lève ``ProfilerBusyError`` si un profilage est déjà en cours.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+    try:
+        own_thread = threading.get_ident()
+        labels: Dict[Tuple[CodeType, int], str] = {}
+        stacks: Counter[str] = Counter()
+        deadline = time.monotonic() + seconds
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, leaf in sys._current_frames().items():
+                if thread_id == own_thread or (not idle and _is_idle(leaf)):
+                    continue
+                stack = []
+                frame: FrameType | None = leaf
+                while frame is not None:
+                    code = frame.f_code
+                    key = (code, frame.f_lineno if lineno else 0)
+                    label = labels.get(key)
+                    if label is None:
+                        label = labels[key] = _frame_label(code, frame, lineno)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                stacks[";".join(reversed(stack))] += 1
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return stacks
+            time.sleep(min(interval, remaining))
+    finally:
+        _profile_lock.release()
+
+
+def collapsed_stacks(stacks: Counter[str]) -> str:
+    """Piles repliées, une par ligne (``cadre;cadre;... nombre``), les plus
+    fréquentes d'abord ; à passer à ``flamegraph.pl`` ou speedscope."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def trace_allocations(seconds: float, limit: int) -> AllocationProfile:
+    """Allocations faites pendant ``seconds`` et encore en mémoire à la fin.
+
+    tracemalloc est démarré pour la durée du profilage (sauf s'il l'était
+    déjà, par ``PYTHONTRACEMALLOC`` par exemple) : il ralentit chaque
+    allocation tant qu'il trace. Les allocations sont groupées par ligne
+    de code, les ``limit`` plus grosses d'abord.
+
+    Lève ``ProfilerBusyError`` si un profilage est déjà en cours.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+    started = not tracemalloc.is_tracing()
+    try:
+        if started:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        time.sleep(seconds)
+        after = tracemalloc.take_snapshot()
+        traced_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        if started:
+            tracemalloc.stop()
+        _profile_lock.release()
+    ignored = (tracemalloc.Filter(False, tracemalloc.__file__),)
+    differences = after.filter_traces(ignored).compare_to(
+        before.filter_traces(ignored), "lineno"
+    )
+    allocations: List[AllocationStat] = []
+    for difference in differences:
+        if difference.size_diff <= 0:
+            continue
+        origin = difference.traceback[0]
+        allocations.append(
+            AllocationStat(
+                file=origin.filename,
+                line=origin.lineno,
+                size_bytes=difference.size_diff,
+                count=difference.count_diff,
+            )
+        )
+        if len(allocations) == limit:
+            break
+    return AllocationProfile(
+        seconds=seconds,
+        traced_bytes=traced_bytes,
+        peak_bytes=peak_bytes,
+        allocations=allocations,
+    )
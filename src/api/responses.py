@@ -0,0 +1,53 @@
+"""Réponses HTTP spécifiques de l'application."""
+from typing import Any, Mapping
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+
+
+class TrustedJSONResponse(Response):
+    """Réponse JSON d'un objet déjà valide, sérialisé sans revalidation.
+
+    Quand un handler renvoie un objet, FastAPI le convertit en dictionnaire,
+    le revalide selon le ``response_model``, puis le sérialise. Les tâches
+    renvoyées par les stockages sont valides par construction : elles ne
+    sont écrites qu'à partir de données validées à l'entrée (``TaskCreate``,
+    ``TaskUpdate``). Renvoyer cette réponse les sérialise directement en une
+    passe (pydantic-core), selon ``adapter``. Le ``response_model`` de la
+    route reste déclaré pour la documentation OpenAPI.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        adapter: TypeAdapter[Any],
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+    ):
+        super().__init__(
+            adapter.dump_json(content), status_code=status_code, headers=headers
+        )
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """Réponse en flux produite au fil de la lecture du corps de la requête.
+
+    Pour détecter une déconnexion du client, ``StreamingResponse`` lit les
+    messages de la requête pendant l'envoi (ASGI < 2.4) : un corps lu en même
+    temps par ``request.stream()`` serait partagé entre les deux lecteurs.
+    La lecture du corps signale elle-même la déconnexion (``ClientDisconnect``),
+    qui interrompt simplement la réponse.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except ClientDisconnect:
+            return
+        if self.background is not None:
+            await self.background()
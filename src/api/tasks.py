@@ -1,42 +1,534 @@
-from typing import Annotated, List
+from datetime import datetime
+from typing import Annotated, Any, AsyncIterator, Dict, List, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 
 from src.api.auth import get_current_active_user
-from src.models.memory_store import task_store
-from src.schemas.task import Task, TaskCreate, TaskUpdate
+from src.api.conditional import (
+    NO_VERSION,
+    cache_headers,
+    entity_tag,
+    etag_matches,
+    if_match_versions,
+    not_modified,
+)
+from src.api.dependencies import get_task_repository
+from src.api.events import EVENT_STREAM_MEDIA_TYPE, event_stream, task_events
+from src.api.ndjson import NDJSON_MEDIA_TYPE, iter_lines
+from src.api.responses import RequestStreamingResponse, TrustedJSONResponse
+from src.config import (
+    BULK_MAX_TASKS,
+    EXPORT_PAGE_SIZE,
+    IMPORT_BATCH_SIZE,
+    IMPORT_MAX_ERRORS,
+    IMPORT_MAX_LINE_BYTES,
+)
+from src.models.pagination import encode_cursor
+from src.models.repositories import TaskRepository
+from src.models.task_updates import VersionConflictError
+from src.schemas.task import (
+    BulkCreateResult,
+    BulkDeleteResult,
+    BulkItemError,
+    BulkMode,
+    BulkSelection,
+    BulkUpdateRequest,
+    BulkUpdateResult,
+    ImportLineError,
+    ImportProgress,
+    Priority,
+    Task,
+    TaskChanges,
+    TaskCreate,
+    TaskFilter,
+    TaskUpdate,
+)
 from src.schemas.user import User
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+# En-tête portant le curseur de la page suivante
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# En-tête portant le repère à repasser dans ``since`` à l'export suivant
+EXPORT_WATERMARK_HEADER = "X-Export-Watermark"
+
+# Validation d'un lot complet de tâches en un seul appel
+_task_list_adapter = TypeAdapter(List[TaskCreate])
+_task_create_adapter = TypeAdapter(TaskCreate)
+
+# Sérialisation des réponses (voir TrustedJSONResponse)
+_task_adapter = TypeAdapter(Task)
+_tasks_adapter = TypeAdapter(List[Task])
+_bulk_create_adapter = TypeAdapter(BulkCreateResult)
+_bulk_update_adapter = TypeAdapter(BulkUpdateResult)
+_changes_adapter = TypeAdapter(TaskChanges)
+
+
+def _validate_bulk_items(
+    items: List[Any],
+) -> Tuple[List[TaskCreate], List[BulkItemError]]:
+    """Valider un lot de tâches ; retourner les tâches valides et les erreurs.
+
+    Le lot est validé en une passe ; ce n'est qu'en cas d'erreur que les
+    éléments valides sont revalidés un à un pour être séparés des autres.
+    """
+    try:
+        return _task_list_adapter.validate_python(items), []
+    except ValidationError as e:
+        errors_by_index: Dict[int, List[Any]] = {}
+        for error in e.errors(include_url=False, include_context=False):
+            index, *loc = error["loc"]
+            errors_by_index.setdefault(int(index), []).append(
+                {**error, "loc": loc}
+            )
+
+    valid = [
+        TaskCreate.model_validate(item)
+        for index, item in enumerate(items)
+        if index not in errors_by_index
+    ]
+    errors = [
+        BulkItemError(index=index, errors=errors)
+        for index, errors in sorted(errors_by_index.items())
+    ]
+    return valid, errors
+
 
 @router.post("/", response_model=Task, status_code=status.HTTP_201_CREATED)
 async def create_task(
-    task: TaskCreate, current_user: Annotated[User, Depends(get_current_active_user)]
-) -> Task:
+    task: TaskCreate,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
+) -> Response:
     """Créer une nouvelle tâche."""
-    return task_store.create_task(task, current_user.id)
+    return TrustedJSONResponse(
+        await tasks.create_task(task, current_user.id),
+        _task_adapter,
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResult,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_207_MULTI_STATUS: {
+            "model": BulkCreateResult,
+            "description": "Création partielle (mode partial)",
+        }
+    },
+)
+async def create_tasks(
+    items: Annotated[
+        List[Any],
+        Body(
+            max_length=BULK_MAX_TASKS,
+            description="Tâches à créer, au format de TaskCreate",
+        ),
+    ],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
+    mode: BulkMode = BulkMode.ATOMIC,
+) -> Response:
+    """Créer un lot de tâches en une seule opération.
+
+    En mode ``atomic``, un seul élément invalide fait refuser tout le lot
+    (422, erreurs par index). En mode ``partial``, les éléments valides sont
+    créés et les autres signalés dans ``errors`` (207).
+    """
+    valid, errors = _validate_bulk_items(items)
+    if errors and mode == BulkMode.ATOMIC:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors],
+        )
+    created = await tasks.create_tasks(valid, current_user.id)
+    return TrustedJSONResponse(
+        BulkCreateResult.model_construct(created=created, errors=errors),
+        _bulk_create_adapter,
+        status_code=(
+            status.HTTP_207_MULTI_STATUS if errors else status.HTTP_201_CREATED
+        ),
+    )
+
+
+@router.patch("/bulk", response_model=BulkUpdateResult)
+async def update_tasks(
+    request: BulkUpdateRequest,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
+    return_tasks: bool = False,
+) -> Response:
+    """Appliquer une même mise à jour aux tâches sélectionnées.
+
+    Les tâches sont sélectionnées par ``ids`` et/ou ``filter`` ; les IDs
+    inconnus ou appartenant à un autre utilisateur sont ignorés. Seul le
+    nombre de tâches modifiées est renvoyé, sauf avec ``return_tasks``.
+    """
+    updated = await tasks.update_tasks(request, request.update, current_user.id)
+    return TrustedJSONResponse(
+        BulkUpdateResult.model_construct(
+            updated=len(updated), tasks=updated if return_tasks else None
+        ),
+        _bulk_update_adapter,
+    )
+
+
+@router.post("/bulk/delete", response_model=BulkDeleteResult)
+async def delete_tasks(
+    selection: BulkSelection,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
+) -> BulkDeleteResult:
+    """Supprimer les tâches sélectionnées par ``ids`` et/ou ``filter``."""
+    deleted = await tasks.delete_tasks(selection, current_user.id)
+    return BulkDeleteResult(deleted=deleted)
+
+
+def _validate_import_lines(
+    batch: List[Tuple[int, bytes | None]],
+) -> Tuple[List[TaskCreate], List[ImportLineError]]:
+    """Valider des lignes NDJSON numérotées ; retourner les tâches et les erreurs.
+
+    Chaque ligne est validée seule : une ligne invalide (JSON compris) ne
+    peut pas déborder sur ses voisines.
+    """
+    valid: List[TaskCreate] = []
+    errors: List[ImportLineError] = []
+    for number, line in batch:
+        if line is None:
+            error = {
+                "type": "line_too_long",
+                "loc": [],
+                "msg": f"Ligne de plus de {IMPORT_MAX_LINE_BYTES} octets",
+            }
+            errors.append(ImportLineError(line=number, errors=[error]))
+            continue
+        try:
+            valid.append(_task_create_adapter.validate_json(line))
+        except ValidationError as e:
+            errors.append(
+                ImportLineError(
+                    line=number,
+                    errors=[
+                        dict(error)
+                        for error in e.errors(include_url=False, include_context=False)
+                    ],
+                )
+            )
+    return valid, errors
+
+
+async def _import_records(
+    tasks: TaskRepository, user_id: int, chunks: AsyncIterator[bytes]
+) -> AsyncIterator[bytes]:
+    """Enregistrer les tâches du flux NDJSON par lots ; produire l'avancement.
+
+    Après chaque lot enregistré sont envoyées ses lignes rejetées (au plus
+    ``IMPORT_MAX_ERRORS`` au total) puis l'avancement de l'import.
+    """
+    progress = ImportProgress(lines=0, imported=0, failed=0)
+    batch: List[Tuple[int, bytes | None]] = []
+
+    async def store_batch() -> bytes:
+        valid, errors = _validate_import_lines(batch)
+        batch.clear()
+        if valid:
+            await tasks.create_tasks(valid, user_id)
+        reported = max(0, min(len(errors), IMPORT_MAX_ERRORS - progress.failed))
+        progress.imported += len(valid)
+        progress.failed += len(errors)
+        records = [error.model_dump_json().encode() for error in errors[:reported]]
+        records.append(progress.model_dump_json().encode())
+        return b"\n".join(records) + b"\n"
+
+    async for line in iter_lines(chunks, IMPORT_MAX_LINE_BYTES):
+        progress.lines += 1
+        if line is not None and not line.strip():
+            continue
+        batch.append((progress.lines, line))
+        if len(batch) == IMPORT_BATCH_SIZE:
+            yield await store_batch()
+    if batch:
+        yield await store_batch()
+    progress.done = True
+    yield progress.model_dump_json().encode() + b"\n"
+
+
+@router.post(
+    "/import",
+    response_class=RequestStreamingResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                NDJSON_MEDIA_TYPE: {
+                    "schema": {
+                        "type": "string",
+                        "description": "Une tâche JSON (TaskCreate) par ligne",
+                    }
+                }
+            },
+        }
+    },
+    responses={
+        200: {
+            "content": {NDJSON_MEDIA_TYPE: {}},
+            "description": "Lignes rejetées (ImportLineError) et avancement "
+            "(ImportProgress) après chaque lot, puis bilan final (done)",
+        }
+    },
+)
+async def import_tasks(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
+) -> RequestStreamingResponse:
+    """Importer des tâches envoyées en JSON délimité par des sauts de ligne.
+
+    Le corps est lu au fil de l'eau et les tâches enregistrées par lots de
+    ``IMPORT_BATCH_SIZE`` : ni le corps ni la liste des tâches ne sont
+    conservés en entier, quel que soit leur nombre. Les lignes invalides
+    sont signalées (numéro et erreurs) sans interrompre l'import ; les lignes
+    vides sont ignorées. La réponse est un flux NDJSON d'avancement, dont le
+    dernier enregistrement (``done``) donne le bilan de l'import.
+    """
+    return RequestStreamingResponse(
+        _import_records(tasks, current_user.id, request.stream()),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+async def _export_lines(
+    tasks: TaskRepository, user_id: int, since: int | None, watermark: int
+) -> AsyncIterator[bytes]:
+    """Produire les tâches d'ID compris dans ]since, watermark], page par page.
+
+    Seule une page du stockage est en mémoire à la fois ; chacune est envoyée
+    dès qu'elle est lue, une tâche JSON par ligne.
+    """
+    cursor = encode_cursor([since]) if since is not None else None
+    while True:
+        page = await tasks.list_tasks(user_id, limit=EXPORT_PAGE_SIZE, cursor=cursor)
+        lines = [
+            _task_adapter.dump_json(task) + b"\n"
+            for task in page.items
+            if task.id <= watermark
+        ]
+        if lines:
+            yield b"".join(lines)
+        if page.next_cursor is None or page.items[-1].id >= watermark:
+            return
+        cursor = page.next_cursor
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {NDJSON_MEDIA_TYPE: {}},
+            "description": "Une tâche JSON par ligne, dans l'ordre de création",
+        }
+    },
+)
+async def export_tasks(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
+    since: Annotated[
+        int | None,
+        Query(
+            ge=0,
+            description="N'exporter que les tâches créées après ce repère "
+            "(en-tête X-Export-Watermark d'un export précédent)",
+        ),
+    ] = None,
+) -> StreamingResponse:
+    """Exporter les tâches en JSON délimité par des sauts de ligne (NDJSON).
+
+    Les tâches sont lues et envoyées page par page : la mémoire utilisée ne
+    dépend pas du nombre de tâches. L'en-tête ``X-Export-Watermark`` donne
+    l'ID de la dernière tâche existant au début de l'export ; les tâches
+    créées pendant l'export n'y figurent pas. Repassé dans ``since``, il
+    limite l'export suivant aux tâches créées depuis (les modifications et
+    suppressions de tâches déjà exportées ne sont pas reprises).
+    """
+    last_id = await tasks.last_task_id(current_user.id)
+    watermark = max(since or 0, last_id or 0)
+    return StreamingResponse(
+        _export_lines(tasks, current_user.id, since, watermark),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={EXPORT_WATERMARK_HEADER: str(watermark)},
+    )
+
+
+@router.get("/changes", response_model=TaskChanges)
+async def get_task_changes(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
+    since: Annotated[
+        int | None,
+        Query(
+            ge=0, description="Version renvoyée par la synchronisation précédente"
+        ),
+    ] = None,
+) -> Response:
+    """Récupérer les tâches créées, modifiées et supprimées depuis ``since``.
+
+    Chaque modification des tâches de l'utilisateur incrémente sa version.
+    La réponse donne l'état actuel des tâches créées ou modifiées depuis
+    ``since`` et les IDs des tâches supprimées, avec la version à repasser
+    à la synchronisation suivante. Sans ``since``, ou si les modifications
+    ne sont plus connues depuis cette version (journal borné, redémarrage),
+    ``resync`` est vrai : les tâches sont à recharger en entier depuis
+    ``GET /tasks/``, puis synchronisées à partir de la version renvoyée.
+    """
+    changes = await tasks.get_changes(current_user.id, since)
+    return TrustedJSONResponse(changes, _changes_adapter)
+
+
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {EVENT_STREAM_MEDIA_TYPE: {}},
+            "description": "Événements created, updated et deleted (données au "
+            "format de TaskChanges, id : version), précédés d'un événement changes",
+        }
+    },
+)
+async def stream_task_events(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
+    last_event_id: Annotated[
+        int | None,
+        Header(ge=0, description="Dernière version reçue, à la reconnexion"),
+    ] = None,
+) -> StreamingResponse:
+    """Recevoir en direct les modifications des tâches (Server-Sent Events).
+
+    Chaque création, modification ou suppression de tâches de l'utilisateur
+    est envoyée comme un événement ``created``, ``updated`` ou ``deleted``
+    dont l'``id`` est la nouvelle version. Le premier événement, ``changes``,
+    a le contenu de ``GET /tasks/changes?since=<Last-Event-ID>`` : il
+    rattrape les modifications manquées pendant une déconnexion. Un client
+    trop lent à lire ses événements est déconnecté et n'a qu'à se
+    reconnecter.
+    """
+    # Abonnement avant la lecture des modifications : rien n'est perdu entre
+    # les deux
+    subscription = task_events.subscribe(current_user.id)
+    try:
+        initial = await tasks.get_changes(current_user.id, last_event_id)
+    except BaseException:
+        task_events.unsubscribe(subscription)
+        raise
+    return StreamingResponse(
+        event_stream(task_events, subscription, initial),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/", response_model=List[Task])
 async def get_tasks(
-    current_user: Annotated[User, Depends(get_current_active_user)]
-) -> List[Task]:
-    """Récupérer toutes les tâches."""
-    return task_store.get_all_tasks(current_user.id)
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
+    completed: bool | None = None,
+    priority: Annotated[List[Priority] | None, Query()] = None,
+    due_after: Annotated[
+        datetime | None, Query(description="Échéance postérieure ou égale")
+    ] = None,
+    due_before: Annotated[
+        datetime | None, Query(description="Échéance strictement antérieure")
+    ] = None,
+    sort: Annotated[
+        str | None,
+        Query(
+            description="Champs de tri séparés par des virgules, préfixés par "
+            "« - » pour un ordre décroissant (ex. -priority,due_date)"
+        ),
+    ] = None,
+    limit: Annotated[int | None, Query(ge=1, le=1000)] = None,
+    cursor: str | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Récupérer les tâches, éventuellement filtrées, triées et page par page.
+
+    Quand une page suivante existe, son curseur est renvoyé dans l'en-tête
+    ``X-Next-Cursor`` et se passe tel quel dans le paramètre ``cursor``, avec
+    les mêmes filtres et le même tri.
+
+    L'``ETag`` de la réponse change à chaque modification des tâches de
+    l'utilisateur : renvoyé dans ``If-None-Match``, il donne une réponse 304
+    tant qu'aucune tâche n'a changé, sans que les tâches soient lues.
+    """
+    # Version lue avant les tâches : si une modification s'intercale, l'ETag
+    # renvoyé est antérieur au contenu et la requête suivante est servie en
+    # entier.
+    etag = entity_tag(
+        current_user.id, await tasks.get_collection_version(current_user.id)
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    filters = TaskFilter(
+        completed=completed,
+        priority=priority,
+        due_before=due_before,
+        due_after=due_after,
+    )
+    try:
+        page = await tasks.list_tasks(
+            current_user.id, filters=filters, sort=sort, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    headers = cache_headers(etag)
+    if page.next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return TrustedJSONResponse(page.items, _tasks_adapter, headers=headers)
 
 
 @router.get("/{task_id}", response_model=Task)
 async def get_task(
-    task_id: int, current_user: Annotated[User, Depends(get_current_active_user)]
-) -> Task:
-    """Récupérer une tâche par son ID."""
-    task = task_store.get_task(task_id, current_user.id)
+    task_id: int,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Récupérer une tâche par son ID.
+
+    Même usage de l'``ETag`` que pour la liste des tâches : il change à
+    chaque modification de la tâche.
+    """
+    version = await tasks.get_task_version(task_id, current_user.id)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Tâche non trouvée"
+        )
+    etag = entity_tag(current_user.id, version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    task = await tasks.get_task(task_id, current_user.id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Tâche non trouvée"
         )
-    return task
+    return TrustedJSONResponse(task, _task_adapter, headers=cache_headers(etag))
 
 
 @router.put("/{task_id}", response_model=Task)
@@ -44,22 +536,53 @@ async def update_task(
     task_id: int,
     task_update: TaskUpdate,
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> Task:
-    """Mettre à jour une tâche."""
-    task = task_store.update_task(task_id, task_update, current_user.id)
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
+    if_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Mettre à jour une tâche.
+
+    Avec ``If-Match`` (l'``ETag`` d'une lecture précédente), la mise à jour
+    n'est appliquée que si la tâche n'a pas été modifiée depuis : sinon, la
+    réponse est 412 et porte l'``ETag`` actuel. Une écriture conditionnelle
+    remplace ainsi une relecture suivie d'une écriture.
+    """
+    expected_version = None
+    if if_match is not None:
+        versions = if_match_versions(if_match, current_user.id)
+        if versions is not None and len(versions) == 1:
+            expected_version = versions[0]
+        elif versions is not None:
+            # Seul l'ETag de la version actuelle peut correspondre ; la
+            # version est revérifiée à l'écriture
+            current = await tasks.get_task_version(task_id, current_user.id)
+            expected_version = current if current in versions else NO_VERSION
+    try:
+        task = await tasks.update_task(
+            task_id, task_update, current_user.id, expected_version
+        )
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=str(e),
+            headers={"ETag": entity_tag(current_user.id, e.version)},
+        )
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Tâche non trouvée"
         )
-    return task
+    return TrustedJSONResponse(
+        task, _task_adapter, headers={"ETag": entity_tag(current_user.id, task.version)}
+    )
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
-    task_id: int, current_user: Annotated[User, Depends(get_current_active_user)]
+    task_id: int,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
 ):
     """Supprimer une tâche."""
-    if not task_store.delete_task(task_id, current_user.id):
+    if not await tasks.delete_task(task_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Tâche non trouvée"
         )
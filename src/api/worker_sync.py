@@ -0,0 +1,98 @@
+"""Cohérence entre les workers uvicorn partageant un stockage ("shared").
+
+Chaque worker est un processus : ses abonnés aux événements en direct et son
+cache des jetons ne voient pas les écritures des autres workers. Ceux-ci ne
+partagent que la base ; ``WorkerSync`` y relève périodiquement ce qui a
+changé.
+"""
+import asyncio
+import logging
+from typing import Dict
+
+from src.api.dependencies import task_repository, user_repository
+from src.api.events import TaskEventBroker, task_events
+from src.auth.token_cache import TokenCache, token_cache
+from src.config import SHARED_POLL_SECONDS, STORAGE_BACKEND
+from src.models.repositories import TaskRepository, UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerSync:
+    """Relève, toutes les ``interval`` secondes, les écritures de tous les
+    workers.
+
+    - Événements : pour chaque utilisateur ayant des abonnés dans ce worker,
+      une requête lit la version de ses tâches ; si elle a changé, les
+      modifications depuis la dernière version diffusée sont envoyées en un
+      événement ``changes``. Les écritures de ce worker passent par le même
+      chemin : un seul ordre de diffusion, celui des versions.
+    - Cache des jetons : vidé quand le nombre d'invalidations d'utilisateurs
+      (désactivation, vidage) a changé, par quelque worker que ce soit.
+
+    Un événement arrive donc en ``interval`` secondes au plus, et un jeton
+    d'utilisateur désactivé peut être accepté pendant ce délai par un autre
+    worker que celui de la désactivation.
+    """
+
+    def __init__(
+        self,
+        tasks: TaskRepository,
+        users: UserRepository,
+        broker: TaskEventBroker,
+        cache: TokenCache,
+        interval: float,
+    ):
+        self.tasks = tasks
+        self.users = users
+        self.broker = broker
+        self.cache = cache
+        self.interval = interval
+        # Dernière version diffusée, par utilisateur abonné
+        self._versions: Dict[int, int] = {}
+        self._invalidations: int | None = None
+
+    async def poll(self) -> None:
+        """Relever et propager les écritures depuis le relevé précédent."""
+        invalidations = await self.users.invalidation_generation()
+        if self._invalidations is not None and invalidations != self._invalidations:
+            self.cache.invalidate_user(None)
+        self._invalidations = invalidations
+
+        initial_versions = self.broker.initial_versions()
+        # Un utilisateur qui se réabonne repart de la version de ses flux
+        self._versions = {
+            user_id: self._versions.get(user_id, version)
+            for user_id, version in initial_versions.items()
+        }
+        if not self._versions:
+            return
+        versions = await self.tasks.get_collection_versions(list(self._versions))
+        for user_id, version in versions.items():
+            since = self._versions[user_id]
+            if version == since:
+                continue
+            changes = await self.tasks.get_changes(user_id, since)
+            self.broker.publish_changes(user_id, changes)
+            self._versions[user_id] = changes.version
+
+    async def run(self) -> None:
+        """Relever les écritures jusqu'à l'annulation de la tâche."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll()
+            except Exception:
+                # Base momentanément indisponible : le relevé suivant
+                # rattrapera les écritures de celui-ci
+                logger.exception("Relevé des écritures des autres workers échoué")
+
+
+# Instance globale pour cette phase (stockage "shared" seulement)
+worker_sync = (
+    WorkerSync(
+        task_repository, user_repository, task_events, token_cache, SHARED_POLL_SECONDS
+    )
+    if STORAGE_BACKEND == "shared"
+    else None
+)
@@ -0,0 +1,68 @@
+"""Pool borné pour le hashage des mots de passe hors de la boucle d'événements."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from src.auth.security import get_password_hash, verify_password
+from src.config import PASSWORD_HASH_MAX_PENDING, PASSWORD_HASH_WORKERS
+
+T = TypeVar("T")
+
+
+class HashingPoolSaturatedError(RuntimeError):
+    """Trop d'opérations de hashage sont déjà en cours ou en attente."""
+
+
+class PasswordHashingPool:
+    """Exécute bcrypt dans un pool de threads de taille fixe.
+
+    bcrypt relâche le GIL pendant le calcul : les threads du pool hashent en
+    parallèle pendant que la boucle d'événements continue de servir les autres
+    requêtes. Le nombre d'opérations en cours ou en file est borné pour qu'une
+    rafale de connexions ne fasse pas grossir la file indéfiniment.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_pending = max_pending
+        self._executor = (
+            ThreadPoolExecutor(max_workers, thread_name_prefix="password-hash")
+            if max_workers > 0
+            else None
+        )
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Nombre d'opérations en cours ou en attente."""
+        return self._pending
+
+    async def run(self, func: Callable[..., T], *args: object) -> T:
+        """Exécuter une fonction coûteuse (hashage, vérification) dans le pool."""
+        if self._pending >= self.max_pending:
+            raise HashingPoolSaturatedError("Service d'authentification saturé")
+
+        self._pending += 1
+        try:
+            if self._executor is None:
+                return func(*args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """Hasher un mot de passe."""
+        return await self.run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Vérifier un mot de passe contre son hash."""
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Arrêter les threads du pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+# Instance globale pour cette phase
+password_hasher = PasswordHashingPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
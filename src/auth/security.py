@@ -38,13 +38,21 @@ def create_access_token(
     return encoded_jwt
 
 
-def verify_token(token: str) -> str | None:
-    """Vérifier et décoder un token JWT."""
+def decode_access_token(token: str) -> Dict[str, Any] | None:
+    """Vérifier un token JWT et retourner ses claims (dont ``sub`` et ``exp``)."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        return username
+        payload: Dict[str, Any] = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
+    if payload.get("sub") is None:
+        return None
+    return payload
+
+
+def verify_token(token: str) -> str | None:
+    """Vérifier et décoder un token JWT."""
+    payload = decode_access_token(token)
+    if payload is None:
+        return None
+    username: str = payload["sub"]
+    return username
@@ -0,0 +1,158 @@
+"""Cache des tokens JWT déjà vérifiés."""
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Set, Tuple
+
+from src.config import TOKEN_CACHE_SIZE
+from src.models.memory_usage import (
+    FLOAT_BYTES,
+    PAIR_BYTES,
+    SET_ENTRY_BYTES,
+    model_bytes,
+)
+from src.schemas.user import User
+
+
+class TokenCache:
+    """Cache LRU borné : empreinte du token -> utilisateur résolu.
+
+    Une entrée évite de redécoder le JWT, de rechercher l'utilisateur et de
+    reconstruire le modèle ``User`` à chaque requête. Elle reste valide
+    jusqu'à l'expiration du token, ou jusqu'à son invalidation (utilisateur
+    désactivé). Les tokens sont indexés par leur empreinte SHA-256 pour ne pas
+    conserver les secrets en mémoire.
+
+    Les invalidations arrivent du thread qui a modifié l'utilisateur (pool
+    de threads, stockage SQLite) : un verrou protège les entrées.
+    ``generation`` compte les invalidations ; une résolution commencée
+    avant l'une d'elles ne doit pas être mise en cache (voir ``put``).
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, Tuple[User, float]] = OrderedDict()
+        self._digests_by_user: Dict[int, Set[bytes]] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> User | None:
+        """Retourner l'utilisateur associé au token s'il est en cache et valide."""
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            user, expires_at = entry
+            if time.time() >= expires_at:
+                self._discard(digest, user.id)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return user
+
+    def put(
+        self,
+        token: str,
+        user: User,
+        expires_at: float,
+        generation: int | None = None,
+    ) -> None:
+        """Mettre en cache l'utilisateur résolu jusqu'à l'expiration du token.
+
+        ``generation`` est celle lue avant de résoudre l'utilisateur : si une
+        invalidation a eu lieu depuis, il a pu être désactivé entre-temps et
+        n'est pas mis en cache.
+        """
+        if self.max_size <= 0:
+            return
+        digest = self._digest(token)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[digest] = (user, expires_at)
+            self._entries.move_to_end(digest)
+            self._digests_by_user.setdefault(user.id, set()).add(digest)
+            while len(self._entries) > self.max_size:
+                oldest, (oldest_user, _) = next(iter(self._entries.items()))
+                self._discard(oldest, oldest_user.id)
+
+    def invalidate_user(self, user_id: int | None) -> None:
+        """Retirer les entrées d'un utilisateur (de tous si ``None``)."""
+        with self._lock:
+            self.generation += 1
+            if user_id is None:
+                self._clear()
+                return
+            for digest in self._digests_by_user.pop(user_id, set()):
+                self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        """Vider le cache (les statistiques sont conservées)."""
+        with self._lock:
+            self._clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Statistiques d'utilisation du cache."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def memory_bytes(self) -> int:
+        """Estimation de la mémoire du cache.
+
+        Toutes les entrées sont comptées au coût de la plus ancienne :
+        empreinte, couple (utilisateur, expiration) et modèle ``User`` (ses
+        valeurs sont partagées avec le stockage), plus leur place dans
+        l'index par utilisateur.
+        """
+        with self._lock:
+            size = sys.getsizeof(self._entries) + sys.getsizeof(
+                self._digests_by_user
+            )
+            if self._entries:
+                digest, (user, _) = next(iter(self._entries.items()))
+                size += len(self._entries) * (
+                    sys.getsizeof(digest)
+                    + PAIR_BYTES
+                    + FLOAT_BYTES
+                    + model_bytes(user)
+                    + SET_ENTRY_BYTES
+                )
+            return size
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self._digests_by_user.clear()
+
+    def _discard(self, digest: bytes, user_id: int) -> None:
+        del self._entries[digest]
+        digests = self._digests_by_user.get(user_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._digests_by_user[user_id]
+
+
+# Instance globale pour cette phase
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
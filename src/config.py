@@ -0,0 +1,55 @@
+"""Configuration de l'application, lue depuis les variables d'environnement."""
+import os
+
+# Threads dédiés au hashage des mots de passe (0 : hashage dans la boucle
+# d'événements, comme avant l'ajout du pool)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+# Opérations de hashage en cours ou en attente au-delà desquelles les
+# requêtes d'authentification sont refusées (503)
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+# Utilisateurs autorisés sur les endpoints d'administration (/admin),
+# séparés par des virgules (vide : aucun)
+ADMIN_USERNAMES = frozenset(
+    name.strip() for name in os.getenv("ADMIN_USERNAMES", "").split(",") if name.strip()
+)
+# Durée maximale, en secondes, d'un profilage à la demande (/admin/profile)
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+# Nombre maximal de tokens vérifiés gardés en cache (0 : cache désactivé)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+# Stockage des tâches et des utilisateurs : "memory", "sqlite" ou "shared"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "memory")
+# Fichier de la base SQLite et taille de son pool de connexions
+SQLITE_PATH = os.getenv("SQLITE_PATH", "todos.db")
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "4"))
+# Stockage "shared", partagé par plusieurs workers uvicorn : base SQLite dans
+# un segment de mémoire partagée (tmpfs), projetée en mémoire jusqu'à
+# SHARED_MMAP_MB Mo, et intervalle, en secondes, auquel chaque worker relève
+# les modifications faites par les autres (événements en direct, cache des
+# jetons)
+SHARED_PATH = os.getenv("SHARED_PATH", "/dev/shm/todos.db")
+SHARED_MMAP_MB = int(os.getenv("SHARED_MMAP_MB", "256"))
+SHARED_POLL_SECONDS = float(os.getenv("SHARED_POLL_SECONDS", "0.05"))
+# Nombre maximal de tâches par opération groupée (/tasks/bulk)
+BULK_MAX_TASKS = int(os.getenv("BULK_MAX_TASKS", "10000"))
+# Tâches lues par page du stockage pendant un export (/tasks/export)
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "1000"))
+# Import NDJSON (/tasks/import) : tâches enregistrées par lot, erreurs
+# détaillées au plus (les suivantes sont seulement comptées) et taille
+# maximale d'une ligne
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+IMPORT_MAX_LINE_BYTES = int(os.getenv("IMPORT_MAX_LINE_BYTES", "65536"))
+# Tâches modifiées retenues par utilisateur pour /tasks/changes : au-delà,
+# un client moins récent doit tout recharger
+CHANGE_LOG_SIZE = int(os.getenv("CHANGE_LOG_SIZE", "10000"))
+# Événements en direct (/tasks/events) : événements en attente par abonné
+# (au-delà, l'abonné trop lent est déconnecté) et intervalle, en secondes,
+# des commentaires qui maintiennent une connexion inactive ouverte
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+# Répertoire du journal d'écriture du stockage "memory" (vide : pas de
+# journal, les données sont perdues au redémarrage)
+JOURNAL_DIR = os.getenv("JOURNAL_DIR", "")
+# Taille d'un segment du journal, en Mo, au-delà de laquelle un instantané
+# est produit
+JOURNAL_SEGMENT_MB = int(os.getenv("JOURNAL_SEGMENT_MB", "64"))
@@ -1,16 +1,54 @@
 """Point d'entrée principal de l'application FastAPI."""
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import Annotated, Any, AsyncIterator, Dict
 
+from fastapi import Depends, FastAPI, Response
+
+from src.api.admin import router as admin_router
 from src.api.auth import router as auth_router
+from src.api.dependencies import get_task_repository, get_user_repository
+from src.api.events import task_events
+from src.api.metrics import (
+    PROMETHEUS_MEDIA_TYPE,
+    MetricsMiddleware,
+    http_metrics,
+    render_gauges,
+)
 from src.api.tasks import router as tasks_router
+from src.api.worker_sync import worker_sync
+from src.auth.token_cache import token_cache
+from src.models.repositories import TaskRepository, UserRepository
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Relever les écritures des autres workers (stockage "shared")."""
+    if worker_sync is None:
+        yield
+        return
+    sync = asyncio.create_task(worker_sync.run())
+    try:
+        yield
+    finally:
+        sync.cancel()
+        with suppress(asyncio.CancelledError):
+            await sync
+
 
 app = FastAPI(
-    title="Todos FastAPI", description="Une API de gestion de tâches", version="0.1.0"
+    title="Todos FastAPI",
+    description="Une API de gestion de tâches",
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Inclure les routes des tâches
 app.include_router(tasks_router, prefix="/api/v1")
 app.include_router(auth_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
+
+app.add_middleware(MetricsMiddleware, metrics=http_metrics)
 
 
 @app.get("/")
@@ -23,3 +61,28 @@ async def root():
 async def health_check():
     """Vérification de santé de l'API."""
     return {"status": "healthy"}
+
+
+@app.get("/stats")
+async def stats() -> Dict[str, Any]:
+    """Statistiques internes de l'API."""
+    return {"token_cache": token_cache.stats(), "task_events": task_events.stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(
+    tasks: Annotated[TaskRepository, Depends(get_task_repository)],
+    users: Annotated[UserRepository, Depends(get_user_repository)],
+) -> Response:
+    """Métriques au format texte de Prometheus.
+
+    Requêtes HTTP par route et statut (en cours, nombre, histogramme des
+    durées), tailles des stockages, cache des jetons et diffusion des
+    événements.
+    """
+    lines = http_metrics.render()
+    lines += render_gauges("todos_task_store", await tasks.stats())
+    lines += render_gauges("todos_user_store", await users.stats())
+    lines += render_gauges("todos_token_cache", token_cache.stats())
+    lines += render_gauges("todos_task_events", task_events.stats())
+    return Response("\n".join(lines) + "\n", media_type=PROMETHEUS_MEDIA_TYPE)
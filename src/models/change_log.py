@@ -0,0 +1,88 @@
+"""Journal borné des modifications de tâches d'un utilisateur."""
+import sys
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, List
+
+from src.models.memory_usage import ORDERED_DICT_ENTRY_BYTES
+from src.schemas.task import Task, TaskChanges, TaskEventType
+
+# Fonction appelée après chaque modification des tâches d'un utilisateur
+ChangeListener = Callable[[int, TaskEventType, TaskChanges], None]
+
+
+def initial_version() -> int:
+    """Version de départ d'un journal de modifications.
+
+    Dérivée de l'horloge (en microsecondes) : les versions d'un utilisateur
+    continuent de croître d'un démarrage ou d'un vidage du stockage à
+    l'autre, et une version antérieure est reconnue comme compactée.
+    """
+    return time.time_ns() // 1000
+
+
+def task_changes_event(
+    version: int,
+    event: TaskEventType,
+    task_ids: List[int],
+    tasks: List[Task] | None = None,
+) -> TaskChanges:
+    """Contenu d'une modification signalée aux ``ChangeListener`` (sans validation)."""
+    return TaskChanges.model_construct(
+        version=version,
+        tasks=tasks or [],
+        deleted=task_ids if event == TaskEventType.DELETED else [],
+    )
+
+
+class ChangeLog:
+    """Version de la dernière modification des tâches récemment modifiées.
+
+    Chaque mutation incrémente ``version`` et place les tâches qu'elle touche
+    (créées, modifiées ou supprimées) en fin de journal, avec cette version :
+    une tâche n'y figure qu'une fois. Au-delà de ``max_entries`` tâches, les
+    plus anciennes sont oubliées ; ``floor`` retient la dernière version
+    oubliée, en dessous de laquelle le journal ne permet plus de savoir ce qui
+    a changé.
+    """
+
+    __slots__ = ("version", "floor", "max_entries", "_entries")
+
+    def __init__(self, max_entries: int):
+        self.version = self.floor = initial_version()
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def log_bytes(self) -> int:
+        """Estimation de la mémoire du journal, d'après son nombre d'entrées."""
+        return sys.getsizeof(self) + len(self._entries) * ORDERED_DICT_ENTRY_BYTES
+
+    def record(self, task_ids: Iterable[int]) -> int:
+        """Enregistrer une mutation des tâches ``task_ids`` ; retourner sa version."""
+        self.version += 1
+        entries = self._entries
+        for task_id in task_ids:
+            entries[task_id] = self.version
+            entries.move_to_end(task_id)
+        while len(entries) > self.max_entries:
+            _, self.floor = entries.popitem(last=False)
+        return self.version
+
+    def changed_since(self, since: int) -> List[int] | None:
+        """IDs des tâches modifiées après la version ``since``, dans l'ordre.
+
+        Retourne None si ``since`` est antérieure au journal (compactée) ou
+        postérieure à la version courante (version d'un autre journal).
+        """
+        if since < self.floor or since > self.version:
+            return None
+        changed = []
+        for task_id in reversed(self._entries):
+            if self._entries[task_id] <= since:
+                break
+            changed.append(task_id)
+        changed.reverse()
+        return changed
@@ -0,0 +1,84 @@
+"""Stockages en mémoire rendus durables par un journal d'écriture.
+
+Les lectures restent celles de ``TaskStore`` et ``UserStore`` ; chaque
+écriture est en plus ajoutée au journal (voir ``src.models.journal``). Au
+démarrage, l'état est reconstruit depuis le journal : les tâches d'un
+utilisateur ne sont chargées qu'au premier accès à celles-ci.
+"""
+from typing import List, Set
+
+from src.models.journal import (
+    Journal,
+    RecoveredState,
+    encode_task,
+    encode_task_delete,
+    encode_tasks_clear,
+    encode_user,
+    encode_users_clear,
+)
+from src.models.memory_store import TaskStore
+from src.models.task_index import UserTaskIndex
+from src.models.task_record import TaskRecord
+from src.models.user_store import UserStore
+from src.schemas.user import UserInDB
+
+
+class JournaledTaskStore(TaskStore):
+    """Stockage en mémoire des tâches, journalisé."""
+
+    def __init__(self, journal: Journal, state: RecoveredState):
+        super().__init__()
+        self.journal = journal
+        self._state: RecoveredState | None = state
+        self._loaded_users: Set[int] = set()
+        self._next_id = state.next_task_id
+
+    def clear(self) -> None:
+        """Vider le stockage (tâches et index)."""
+        super().clear()
+        if self._state is not None:
+            self._state.close()
+            self._state = None
+        self.journal.append([encode_tasks_clear()])
+
+    def _load_user(self, user_id: int) -> None:
+        if self._state is None or user_id in self._loaded_users:
+            return
+        self._loaded_users.add(user_id)
+        tasks = self._state.load_tasks(user_id)
+        # Version non journalisée : celle du journal des modifications, créé
+        # à ce démarrage, est postérieure à toute version d'un démarrage
+        # précédent
+        version = self._change_log(user_id).version
+        for task in tasks:
+            task.version = version
+        if tasks:
+            self._tasks.update((task.id, task) for task in tasks)
+            index = UserTaskIndex()
+            index.add_many(tasks)
+            self._indexes[user_id] = index
+
+    def _tasks_written(self, tasks: List[TaskRecord]) -> None:
+        self.journal.append([encode_task(task) for task in tasks])
+
+    def _tasks_deleted(self, task_ids: List[int]) -> None:
+        self.journal.append([encode_task_delete(task_id) for task_id in task_ids])
+
+
+class JournaledUserStore(UserStore):
+    """Stockage en mémoire des utilisateurs, journalisé."""
+
+    def __init__(self, journal: Journal, state: RecoveredState):
+        super().__init__()
+        self.journal = journal
+        self._next_id = state.next_user_id
+        for user_id in sorted(state.users):
+            self._add_user(state.users[user_id])
+
+    def clear(self) -> None:
+        """Vider le stockage."""
+        super().clear()
+        self.journal.append([encode_users_clear()])
+
+    def _user_written(self, user_in_db: UserInDB) -> None:
+        self.journal.append([encode_user(user_in_db)])
@@ -0,0 +1,691 @@
+"""Journal d'écriture (WAL) du stockage en mémoire.
+
+Chaque écriture des stores en mémoire est ajoutée à un journal binaire :
+
+- le journal est découpé en segments ``log-<n>.bin`` ; chaque enregistrement
+  est préfixé de sa longueur et de son CRC32, ce qui permet d'écarter une
+  écriture interrompue en fin de fichier ;
+- un thread dédié écrit et synchronise (fsync) les enregistrements par lots :
+  toutes les écritures arrivées pendant un fsync partagent le suivant
+  (« group commit ») ;
+- quand un segment est plein, un autre thread fusionne le dernier instantané
+  et les segments fermés en un nouvel instantané ``snapshot-<n>.bin`` (état
+  au début du segment ``n``, voir ``src.models.snapshot``), puis supprime les
+  fichiers fusionnés.
+
+Les enregistrements de création et de mise à jour contiennent l'état complet
+de l'objet : la fusion ne garde que le dernier enregistrement de chaque ID,
+sans avoir à décoder les autres.
+
+À la reprise, l'instantané est projeté en mémoire et seuls les segments qui
+le suivent sont relus : les tâches ne sont décodées qu'au premier accès à
+leur utilisateur (voir ``RecoveredState``). La durée de reprise est bornée
+par la taille d'un segment, quel que soit le nombre de tâches.
+"""
+import asyncio
+import gc
+import os
+import re
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterator, List, Sequence, Set, Tuple
+
+from src.models.snapshot import (
+    TASK_ROW,
+    USER_ROW,
+    Row,
+    Snapshot,
+    SnapshotError,
+    SnapshotWriter,
+)
+from src.models.task_record import TaskRecord, construct
+from src.schemas.task import Priority, Task
+from src.schemas.user import UserInDB
+
+SEGMENT_MAGIC = b"TODOLOG1"
+
+# Types d'enregistrements
+OP_TASK_PUT = 1
+OP_TASK_DELETE = 2
+OP_TASKS_CLEAR = 3
+OP_USER_PUT = 4
+OP_USERS_CLEAR = 5
+
+_FRAME = struct.Struct("<II")  # Longueur et CRC32 du contenu
+# Tâche : type, champs de l'instantané, longueurs du titre et de la
+# description (suivis de leurs octets UTF-8)
+_TASK = struct.Struct("<B" + TASK_ROW + "ii")
+# Utilisateur : type, champs de l'instantané, longueurs des chaînes
+_USER = struct.Struct("<B" + USER_ROW + "iiii")
+_DELETE = struct.Struct("<Bq")
+_ID = struct.Struct("<q")
+
+_NULL_DATETIME = (0, 0, 0, 0, 0, 0, 0, 0)
+# Décalage horaire (en minutes) signalant une date naïve
+_NAIVE_OFFSET = -32768
+_MINUTE = timedelta(minutes=1)
+
+_PRIORITIES = list(Priority)
+_PRIORITY_CODES = {priority: code for code, priority in enumerate(_PRIORITIES)}
+
+_SEGMENT_NAME = re.compile(r"log-(\d+)\.bin")
+_SNAPSHOT_NAME = re.compile(r"snapshot-(\d+)\.bin")
+
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+class JournalError(RuntimeError):
+    """Journal illisible ou impossible à écrire."""
+
+
+def _pack_datetime(value: datetime | None) -> Tuple[int, ...]:
+    if value is None:
+        return _NULL_DATETIME
+    offset = value.utcoffset()
+    return (
+        value.year,
+        value.month,
+        value.day,
+        value.hour,
+        value.minute,
+        value.second,
+        value.microsecond,
+        _NAIVE_OFFSET if offset is None else offset // _MINUTE,
+    )
+
+
+@lru_cache(maxsize=None)
+def _timezone(offset: int) -> timezone:
+    return timezone(timedelta(minutes=offset))
+
+
+def _unpack_datetime(fields: Sequence[int]) -> datetime | None:
+    year, month, day, hour, minute, second, microsecond, offset = fields
+    if year == 0:
+        return None
+    tzinfo = None if offset == _NAIVE_OFFSET else _timezone(offset)
+    return datetime(year, month, day, hour, minute, second, microsecond, tzinfo)
+
+
+def _encode_str(value: str | None) -> Tuple[int, bytes]:
+    if value is None:
+        return -1, b""
+    data = value.encode()
+    return len(data), data
+
+
+def _split_strs(
+    payload: bytes, offset: int, lengths: Sequence[int]
+) -> List[bytes | None]:
+    values: List[bytes | None] = []
+    for length in lengths:
+        if length < 0:
+            values.append(None)
+        else:
+            values.append(payload[offset : offset + length])
+            offset += length
+    return values
+
+
+def encode_task(task: Task | TaskRecord) -> bytes:
+    """Enregistrement de l'état complet d'une tâche (création ou mise à jour)."""
+    title_length, title = _encode_str(task.title)
+    description_length, description = _encode_str(task.description)
+    return (
+        _TASK.pack(
+            OP_TASK_PUT,
+            task.id,
+            task.user_id,
+            int(task.completed),
+            _PRIORITY_CODES[task.priority],
+            *_pack_datetime(task.due_date),
+            *_pack_datetime(task.created_at),
+            *_pack_datetime(task.completed_at),
+            title_length,
+            description_length,
+        )
+        + title
+        + description
+    )
+
+
+def encode_task_delete(task_id: int) -> bytes:
+    """Enregistrement de la suppression d'une tâche."""
+    return _DELETE.pack(OP_TASK_DELETE, task_id)
+
+
+def encode_tasks_clear() -> bytes:
+    """Enregistrement de la remise à zéro des tâches."""
+    return bytes([OP_TASKS_CLEAR])
+
+
+def encode_user(user: UserInDB) -> bytes:
+    """Enregistrement de l'état complet d'un utilisateur."""
+    strings = [
+        _encode_str(value)
+        for value in (user.username, user.email, user.full_name, user.hashed_password)
+    ]
+    return _USER.pack(
+        OP_USER_PUT,
+        user.id,
+        int(user.is_active),
+        *_pack_datetime(user.created_at),
+        *(length for length, _ in strings),
+    ) + b"".join(data for _, data in strings)
+
+
+def encode_users_clear() -> bytes:
+    """Enregistrement de la remise à zéro des utilisateurs."""
+    return bytes([OP_USERS_CLEAR])
+
+
+_USER_FIELDS = set(UserInDB.model_fields)
+
+
+def _task_row(payload: bytes) -> Row:
+    fields = _TASK.unpack_from(payload)
+    return fields[1:29], _split_strs(payload, _TASK.size, fields[29:31])
+
+
+def _user_row(payload: bytes) -> Row:
+    fields = _USER.unpack_from(payload)
+    return fields[1:11], _split_strs(payload, _USER.size, fields[11:15])
+
+
+def _row_id(row: Row) -> int:
+    return row[0][0]
+
+
+def _decode_str(value: bytes | None) -> str | None:
+    return None if value is None else value.decode()
+
+
+def _task_from_row(
+    fields: Sequence[int], strings: Sequence[bytes | None]
+) -> TaskRecord:
+    title, description = strings
+    created_at = _unpack_datetime(fields[12:20])
+    if title is None or created_at is None:
+        raise JournalError(f"Enregistrement de la tâche {fields[0]} invalide")
+    return TaskRecord(
+        fields[0],
+        fields[1],
+        title.decode(),
+        None if description is None else description.decode(),
+        bool(fields[2]),
+        _unpack_datetime(fields[4:12]),
+        _PRIORITIES[fields[3]],
+        created_at,
+        _unpack_datetime(fields[20:28]),
+    )
+
+
+def _user_from_row(
+    fields: Sequence[int], strings: Sequence[bytes | None]
+) -> UserInDB:
+    username, email, full_name, hashed_password = map(_decode_str, strings)
+    return construct(
+        UserInDB,
+        {
+            "username": username,
+            "email": email,
+            "full_name": full_name,
+            "is_active": bool(fields[1]),
+            "id": fields[0],
+            "created_at": _unpack_datetime(fields[2:10]),
+            "hashed_password": hashed_password,
+        },
+        _USER_FIELDS,
+    )
+
+
+def decode_task(payload: bytes) -> Task:
+    """Reconstruire une tâche depuis son enregistrement (sans revalidation)."""
+    return _task_from_row(*_task_row(payload)).to_task()
+
+
+def decode_user(payload: bytes) -> UserInDB:
+    """Reconstruire un utilisateur depuis son enregistrement."""
+    return _user_from_row(*_user_row(payload))
+
+
+def _frame(payload: bytes) -> bytes:
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Suspendre le ramasse-miettes cyclique pendant un décodage massif.
+
+    Déclenché par les millions d'objets créés, il reparcourrait sans fin des
+    objets qui restent vivants.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class _LogState:
+    """Dernier instantané, et dernier enregistrement de chaque tâche et de
+    chaque utilisateur écrit depuis."""
+
+    def __init__(self, snapshot: Snapshot | None = None):
+        self.snapshot = snapshot
+        # Faux après une remise à zéro : l'instantané ne compte plus
+        self.snapshot_tasks = self.snapshot_users = snapshot is not None
+        self.tasks: Dict[int, bytes] = {}
+        # Tâches de l'instantané supprimées depuis
+        self.deleted_tasks: Set[int] = set()
+        self.users: Dict[int, bytes] = {}
+        self.next_task_id = snapshot.next_task_id if snapshot else 1
+        self.next_user_id = snapshot.next_user_id if snapshot else 1
+
+    def apply(self, payload: bytes) -> None:
+        op = payload[0]
+        if op == OP_TASK_PUT:
+            (task_id,) = _ID.unpack_from(payload, 1)
+            self.tasks[task_id] = payload
+            self.next_task_id = max(self.next_task_id, task_id + 1)
+        elif op == OP_TASK_DELETE:
+            (task_id,) = _ID.unpack_from(payload, 1)
+            self.tasks.pop(task_id, None)
+            if self.snapshot_tasks:
+                self.deleted_tasks.add(task_id)
+        elif op == OP_TASKS_CLEAR:
+            self.tasks = {}
+            self.deleted_tasks = set()
+            self.snapshot_tasks = False
+            self.next_task_id = 1
+        elif op == OP_USER_PUT:
+            (user_id,) = _ID.unpack_from(payload, 1)
+            self.users[user_id] = payload
+            self.next_user_id = max(self.next_user_id, user_id + 1)
+        elif op == OP_USERS_CLEAR:
+            self.users = {}
+            self.snapshot_users = False
+            self.next_user_id = 1
+        else:
+            raise JournalError(f"Type d'enregistrement inconnu : {op}")
+
+    def replay(self, data: bytes, start: int) -> int:
+        """Appliquer les enregistrements valides ; retourner la fin du dernier."""
+        offset = start
+        while offset + _FRAME.size <= len(data):
+            length, crc = _FRAME.unpack_from(data, offset)
+            end = offset + _FRAME.size + length
+            payload = data[offset + _FRAME.size : end]
+            if end > len(data) or zlib.crc32(payload) != crc:
+                break
+            self.apply(payload)
+            offset = end
+        return offset
+
+    def tasks_by_user(self) -> Dict[int, List[bytes]]:
+        """Enregistrements postérieurs à l'instantané, par utilisateur."""
+        by_user: Dict[int, List[bytes]] = {}
+        for payload in self.tasks.values():
+            (user_id,) = _ID.unpack_from(payload, 1 + _ID.size)
+            by_user.setdefault(user_id, []).append(payload)
+        return by_user
+
+    def task_rows(self, user_id: int, payloads: List[bytes]) -> List[Row]:
+        """Tâches d'un utilisateur par ID croissant, ``payloads`` compris."""
+        rows: List[Row] = []
+        if self.snapshot is not None and self.snapshot_tasks:
+            replaced = self.tasks
+            deleted = self.deleted_tasks
+            rows = [
+                row
+                for row in self.snapshot.task_rows(user_id)
+                if row[0][0] not in replaced and row[0][0] not in deleted
+            ]
+        if payloads:
+            rows.extend(map(_task_row, payloads))
+            rows.sort(key=_row_id)
+        return rows
+
+    def user_rows(self) -> List[Row]:
+        """Utilisateurs par ID croissant."""
+        rows: List[Row] = []
+        if self.snapshot is not None and self.snapshot_users:
+            rows = [
+                row for row in self.snapshot.user_rows() if row[0][0] not in self.users
+            ]
+        rows.extend(map(_user_row, self.users.values()))
+        rows.sort(key=_row_id)
+        return rows
+
+    def write_snapshot(self, path: str) -> None:
+        writer = SnapshotWriter(path, self.next_task_id, self.next_user_id)
+        by_user = self.tasks_by_user()
+        user_ids = set(by_user)
+        if self.snapshot is not None and self.snapshot_tasks:
+            user_ids.update(self.snapshot.task_user_ids())
+        for user_id in sorted(user_ids):
+            for fields, (title, description) in self.task_rows(
+                user_id, by_user.get(user_id, [])
+            ):
+                writer.add_task(fields, title, description)
+        for fields, strings in self.user_rows():
+            writer.add_user(fields, strings)
+        writer.close()
+
+
+class RecoveredState:
+    """État reconstruit depuis le journal au démarrage.
+
+    Les utilisateurs sont décodés dès la reprise. Les tâches le sont à la
+    demande, une seule fois par utilisateur (``load_tasks``) : l'instantané
+    projeté en mémoire n'est lu qu'à ce moment, et pour la seule plage de
+    l'utilisateur.
+    """
+
+    def __init__(self, log: _LogState):
+        self._log = log
+        self._pending = log.tasks_by_user()
+        self.next_task_id = log.next_task_id
+        self.next_user_id = log.next_user_id
+        self.users: Dict[int, UserInDB] = {
+            _row_id(row): _user_from_row(*row) for row in log.user_rows()
+        }
+
+    def load_tasks(self, user_id: int) -> List[TaskRecord]:
+        """Décoder les tâches d'un utilisateur, par ID croissant."""
+        rows = self._log.task_rows(user_id, self._pending.pop(user_id, []))
+        with _gc_paused():
+            return [_task_from_row(fields, strings) for fields, strings in rows]
+
+    def close(self) -> None:
+        """Libérer l'instantané ; les tâches non chargées sont perdues."""
+        if self._log.snapshot is not None:
+            self._log.snapshot.close()
+            self._log.snapshot = None
+        self._pending = {}
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _sync_directory(directory: str) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _resolve(future: "asyncio.Future[None]", error: BaseException | None) -> None:
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(JournalError(str(error)))
+
+
+class Journal:
+    """Journal d'écriture avec group commit, instantanés et compaction.
+
+    Utilisation : ``recover()`` pour reconstruire l'état, ``start()`` pour
+    accepter les écritures, puis ``append()`` à chaque écriture et
+    ``wait_durable()`` (ou ``wait_durable_async()``) avant d'en confirmer le
+    succès. Les positions (« LSN ») comptent les enregistrements ajoutés.
+    """
+
+    def __init__(self, directory: str, segment_size: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.appended = 0
+        self.durable = 0
+        self.fsyncs = 0
+        self.compactions = 0
+        self.compaction_error: BaseException | None = None
+        self._lock = threading.Lock()
+        self._work = threading.Condition(self._lock)
+        self._flushed = threading.Condition(self._lock)
+        self._pending: List[bytes] = []
+        self._waiters: List[Tuple[int, asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._error: BaseException | None = None
+        self._closing = False
+        self._segment = 0
+        self._segment_fd = -1
+        self._segment_size = 0
+        self._compact_requested = threading.Event()
+        self._threads: List[threading.Thread] = []
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, kind: str, seq: int) -> str:
+        return os.path.join(self.directory, f"{kind}-{seq:08d}.bin")
+
+    def _list(self, pattern: "re.Pattern[str]") -> List[int]:
+        return sorted(
+            int(match.group(1))
+            for match in map(pattern.fullmatch, os.listdir(self.directory))
+            if match
+        )
+
+    def _open_snapshot(self, seq: int) -> Snapshot:
+        try:
+            return Snapshot(self._path("snapshot", seq))
+        except SnapshotError as e:
+            raise JournalError(str(e)) from e
+
+    def recover(self) -> RecoveredState:
+        """Reconstruire l'état depuis le dernier instantané et les segments.
+
+        Une écriture interrompue en fin du dernier segment est tronquée ; un
+        enregistrement invalide ailleurs lève ``JournalError``.
+        """
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                os.remove(os.path.join(self.directory, name))
+
+        snapshots = self._list(_SNAPSHOT_NAME)
+        base = snapshots[-1] if snapshots else 0
+        state = _LogState(self._open_snapshot(base) if snapshots else None)
+
+        segments = [seq for seq in self._list(_SEGMENT_NAME) if seq >= base]
+        for position, seq in enumerate(segments):
+            path = self._path("log", seq)
+            with open(path, "rb") as file:
+                data = file.read()
+            if not data.startswith(SEGMENT_MAGIC):
+                if position == len(segments) - 1:
+                    # Segment créé mais jamais écrit
+                    os.remove(path)
+                    continue
+                raise JournalError(f"Segment invalide : {path}")
+            end = state.replay(data, len(SEGMENT_MAGIC))
+            if end < len(data):
+                if position < len(segments) - 1:
+                    raise JournalError(f"Segment corrompu : {path} (octet {end})")
+                os.truncate(path, end)
+
+        self._remove_before(base, snapshots)
+        self._segment = max([base] + [seq + 1 for seq in segments])
+        with _gc_paused():
+            return RecoveredState(state)
+
+    def _remove_before(self, base: int, snapshots: List[int]) -> None:
+        """Supprimer les fichiers couverts par l'instantané ``base``."""
+        for seq in snapshots:
+            if seq < base:
+                os.remove(self._path("snapshot", seq))
+        for seq in self._list(_SEGMENT_NAME):
+            if seq < base:
+                os.remove(self._path("log", seq))
+
+    def start(self) -> None:
+        """Ouvrir un nouveau segment et démarrer les threads d'écriture."""
+        self._open_segment()
+        for target in (self._flush_loop, self._compact_loop):
+            thread = threading.Thread(target=target, name="journal", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        for seq in self._list(_SEGMENT_NAME):
+            if seq >= self._segment:
+                continue
+            path = self._path("log", seq)
+            if os.path.getsize(path) > len(SEGMENT_MAGIC):
+                self._compact_requested.set()
+            else:
+                # Segment sans enregistrement : rien à fusionner
+                os.remove(path)
+
+    def _open_segment(self) -> None:
+        path = self._path("log", self._segment)
+        self._segment_fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        _write_all(self._segment_fd, SEGMENT_MAGIC)
+        os.fsync(self._segment_fd)
+        _sync_directory(self.directory)
+        self._segment_size = len(SEGMENT_MAGIC)
+
+    def append(self, payloads: Sequence[bytes]) -> int:
+        """Ajouter des enregistrements ; retourner la position du dernier."""
+        data = b"".join(_frame(payload) for payload in payloads)
+        with self._lock:
+            if self._error is not None:
+                raise JournalError(str(self._error))
+            self._pending.append(data)
+            self.appended += len(payloads)
+            self._work.notify()
+            return self.appended
+
+    def wait_durable(self, lsn: int | None = None) -> None:
+        """Attendre que les enregistrements jusqu'à ``lsn`` soient sur disque."""
+        with self._lock:
+            if lsn is None:
+                lsn = self.appended
+            while self.durable < lsn and self._error is None:
+                self._flushed.wait()
+            if self.durable < lsn:
+                raise JournalError(str(self._error))
+
+    async def wait_durable_async(self, lsn: int) -> None:
+        """Attendre sans bloquer la boucle que ``lsn`` soit sur disque."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.durable >= lsn:
+                return
+            if self._error is not None:
+                raise JournalError(str(self._error))
+            future = loop.create_future()
+            self._waiters.append((lsn, loop, future))
+        await future
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._closing:
+                    self._work.wait()
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+                lsn = self.appended
+
+            error: BaseException | None = None
+            try:
+                data = b"".join(batch)
+                _write_all(self._segment_fd, data)
+                _fdatasync(self._segment_fd)
+                self.fsyncs += 1
+                self._segment_size += len(data)
+                if self._segment_size >= self.segment_size:
+                    self._rotate()
+            except OSError as e:
+                error = e
+
+            with self._lock:
+                if error is None:
+                    self.durable = lsn
+                else:
+                    self._error = error
+                self._flushed.notify_all()
+                ready = []
+                waiting = []
+                for waiter in self._waiters:
+                    if error is not None or waiter[0] <= lsn:
+                        ready.append(waiter)
+                    else:
+                        waiting.append(waiter)
+                self._waiters = waiting
+            for _, loop, future in ready:
+                try:
+                    loop.call_soon_threadsafe(_resolve, future, error)
+                except RuntimeError:
+                    pass  # Boucle fermée : plus personne n'attend
+            if error is not None:
+                return
+
+    def _rotate(self) -> None:
+        os.close(self._segment_fd)
+        with self._lock:
+            self._segment += 1
+        self._open_segment()
+        self._compact_requested.set()
+
+    def _compact_loop(self) -> None:
+        while True:
+            self._compact_requested.wait()
+            self._compact_requested.clear()
+            if self._closing:
+                return
+            try:
+                self.compact()
+            except (OSError, JournalError) as e:
+                self.compaction_error = e
+
+    def compact(self) -> None:
+        """Fusionner le dernier instantané et les segments fermés."""
+        with self._lock:
+            upto = self._segment
+        snapshots = [seq for seq in self._list(_SNAPSHOT_NAME) if seq <= upto]
+        base = snapshots[-1] if snapshots else 0
+        segments = [
+            seq for seq in self._list(_SEGMENT_NAME) if base <= seq < upto
+        ]
+        if not segments:
+            return
+
+        state = _LogState(self._open_snapshot(base) if snapshots else None)
+        path = self._path("snapshot", upto)
+        try:
+            for seq in segments:
+                segment_path = self._path("log", seq)
+                with open(segment_path, "rb") as file:
+                    data = file.read()
+                if state.replay(data, len(SEGMENT_MAGIC)) != len(data):
+                    raise JournalError(f"Segment corrompu : {segment_path}")
+            state.write_snapshot(path + ".tmp")
+        finally:
+            if state.snapshot is not None:
+                state.snapshot.close()
+        os.replace(path + ".tmp", path)
+        _sync_directory(self.directory)
+        self._remove_before(upto, snapshots)
+        self.compactions += 1
+
+    def close(self) -> None:
+        """Écrire les enregistrements en attente et arrêter les threads."""
+        with self._lock:
+            if self._closing:
+                return
+            self._closing = True
+            self._work.notify_all()
+        self._compact_requested.set()
+        for thread in self._threads:
+            thread.join()
+        if self._segment_fd >= 0:
+            os.close(self._segment_fd)
+            self._segment_fd = -1
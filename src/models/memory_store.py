@@ -1,52 +1,205 @@
 """Stockage en mémoire pour les tâches."""
+import heapq
+from bisect import bisect_right
 from datetime import datetime
-from typing import Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
 
-from src.schemas.task import Task, TaskCreate, TaskUpdate
+from src.config import CHANGE_LOG_SIZE
+from src.models.change_log import ChangeListener, ChangeLog, task_changes_event
+from src.models.pagination import TaskPage, decode_cursor, encode_cursor
+from src.models.sorting import SortSpec, key_task_id
+from src.models.task_index import UserTaskIndex
+from src.models.task_record import TaskRecord
+from src.models.task_updates import apply_task_update, check_version
+from src.schemas.admin import TaskStoreMemory, TenantMemory
+from src.schemas.task import (
+    BulkSelection,
+    Task,
+    TaskChanges,
+    TaskCreate,
+    TaskEventType,
+    TaskFilter,
+    TaskUpdate,
+)
+
+# En dessous d'une tâche candidate sur SELECTIVE_RATIO, une liste filtrée est
+# obtenue en triant les candidats plutôt qu'en parcourant l'ordre complet.
+SELECTIVE_RATIO = 8
 
 
 class TaskStore:
-    """Stockage simple en mémoire pour les tâches."""
+    """Stockage simple en mémoire pour les tâches.
+
+    Les tâches sont conservées sous forme de ``TaskRecord`` et converties en
+    ``Task`` à la sortie de chaque méthode.
+    """
 
-    def __init__(self):
-        self._tasks: Dict[int, Task] = {}
+    def __init__(self, change_log_size: int = CHANGE_LOG_SIZE):
+        self._tasks: Dict[int, TaskRecord] = {}
+        # Index secondaires par utilisateur (voir UserTaskIndex)
+        self._indexes: Dict[int, UserTaskIndex] = {}
+        # Modifications récentes par utilisateur (voir ChangeLog)
+        self._change_logs: Dict[int, ChangeLog] = {}
+        self._change_log_size = change_log_size
+        self._change_listeners: List[ChangeListener] = []
+        self._next_id = 1
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """Enregistrer une fonction à appeler après chaque modification de tâches.
+
+        Elle reçoit l'utilisateur, la nature de la modification et son
+        contenu (nouvelle version, tâches créées ou modifiées, IDs supprimés).
+        """
+        self._change_listeners.append(listener)
+
+    def clear(self) -> None:
+        """Vider le stockage (tâches, index et modifications)."""
+        self._tasks = {}
+        self._indexes = {}
+        self._change_logs = {}
         self._next_id = 1
 
     def create_task(self, task_data: TaskCreate, user_id: int) -> Task:
         """Créer une nouvelle tâche."""
-        now = datetime.now()
-        task = Task(
-            id=self._next_id,
-            user_id=user_id,
-            title=task_data.title,
-            description=task_data.description,
-            completed=task_data.completed,
-            due_date=task_data.due_date,
-            priority=task_data.priority,
-            created_at=now,
-            completed_at=now if task_data.completed else None,
-        )
+        self._load_user(user_id)
+        task = TaskRecord.create(task_data, self._next_id, user_id, datetime.now())
+        self._tasks_written([task])
         self._tasks[self._next_id] = task
+        self._indexes.setdefault(user_id, UserTaskIndex()).add(task)
         self._next_id += 1
-        return task
+        created = self._record_changes(
+            user_id, TaskEventType.CREATED, [task.id], [task]
+        )
+        return created[0]
+
+    def create_tasks(self, tasks_data: List[TaskCreate], user_id: int) -> List[Task]:
+        """Créer un lot de tâches, d'IDs contigus, en une seule opération."""
+        self._load_user(user_id)
+        now = datetime.now()
+        first_id = self._next_id
+        tasks = [
+            TaskRecord.create(task_data, first_id + offset, user_id, now)
+            for offset, task_data in enumerate(tasks_data)
+        ]
+        if not tasks:
+            return []
+        self._tasks_written(tasks)
+        self._tasks.update((task.id, task) for task in tasks)
+        self._indexes.setdefault(user_id, UserTaskIndex()).add_many(tasks)
+        self._next_id += len(tasks)
+        return self._record_changes(
+            user_id, TaskEventType.CREATED, [task.id for task in tasks], tasks
+        )
 
     def get_task(self, task_id: int, user_id: int) -> Task | None:
         """Récupérer une tâche par son ID."""
+        self._load_user(user_id)
         task = self._tasks.get(task_id)
-        if task and task.user_id != user_id:
+        if task is None or task.user_id != user_id:
             return None
-        return task
+        return task.to_task()
 
     def get_all_tasks(self, user_id: int) -> List[Task]:
-        """Récupérer toutes les tâches."""
-        return [
-            task for task in self._tasks.values() if task and task.user_id == user_id
-        ]
+        """Récupérer toutes les tâches d'un utilisateur."""
+        self._load_user(user_id)
+        index = self._indexes.get(user_id)
+        if index is None:
+            return []
+        return [self._tasks[task_id].to_task() for task_id in index.task_ids]
+
+    def list_tasks(
+        self,
+        user_id: int,
+        filters: TaskFilter | None = None,
+        sort: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> TaskPage:
+        """Récupérer une page de tâches d'un utilisateur.
+
+        Les tâches sont triées par ID, ou selon ``sort`` (voir ``SortSpec``).
+        Le curseur contient la clé de tri de la dernière tâche de la page
+        précédente : la page est localisée par recherche dichotomique dans un
+        ordre maintenu par l'index, son coût ne dépend donc pas de sa
+        profondeur. Les filtres sont résolus par intersection des index.
+        """
+        spec = SortSpec.parse(sort)
+        self._load_user(user_id)
+        index = self._indexes.get(user_id) or UserTaskIndex()
+        matching = None
+        if filters is not None and not filters.is_empty():
+            matching = index.matching_ids(filters)
+
+        ordered: Sequence[Any]
+        if matching is not None and len(matching) * SELECTIVE_RATIO < len(index):
+            # Filtre sélectif : trier les seuls candidats coûte moins que
+            # parcourir l'ordre complet en écartant les autres tâches.
+            if spec.is_default:
+                ordered = sorted(matching)
+            else:
+                ordered = sorted(spec.sort_key(self._tasks[i]) for i in matching)
+            matching = None
+        elif spec.is_default:
+            ordered = index.task_ids
+        else:
+            ordered = index.sorted_keys(spec, self._tasks)
+
+        start = 0
+        if cursor is not None:
+            after = spec.key_from_values(decode_cursor(cursor))
+            start = bisect_right(ordered, after[0][1] if spec.is_default else after)
+
+        task_ids: List[int]
+        to_id: Callable[[Any], int] = int if spec.is_default else key_task_id
+        if matching is None:
+            end = len(ordered) if limit is None else min(start + limit, len(ordered))
+            task_ids = [to_id(item) for item in ordered[start:end]]
+            has_more = end < len(ordered)
+        else:
+            task_ids = []
+            has_more = False
+            for position in range(start, len(ordered)):
+                task_id = to_id(ordered[position])
+                if task_id in matching:
+                    if limit is not None and len(task_ids) == limit:
+                        has_more = True
+                        break
+                    task_ids.append(task_id)
+
+        items = [self._tasks[task_id] for task_id in task_ids]
+        next_cursor = None
+        if items and has_more:
+            next_cursor = encode_cursor(spec.cursor_values(items[-1]))
+        return TaskPage(
+            items=[task.to_task() for task in items], next_cursor=next_cursor
+        )
+
+    def count_tasks(self, user_id: int) -> int:
+        """Compter les tâches d'un utilisateur."""
+        self._load_user(user_id)
+        index = self._indexes.get(user_id)
+        return len(index) if index is not None else 0
+
+    def last_task_id(self, user_id: int) -> int | None:
+        """ID de la dernière tâche créée par un utilisateur (None si aucune)."""
+        self._load_user(user_id)
+        index = self._indexes.get(user_id)
+        return index.task_ids[-1] if index else None
 
     def update_task(
-        self, task_id: int, task_update: TaskUpdate, user_id: int
+        self,
+        task_id: int,
+        task_update: TaskUpdate,
+        user_id: int,
+        expected_version: int | None = None,
     ) -> Task | None:
-        """Mettre à jour une tâche."""
+        """Mettre à jour une tâche.
+
+        Avec ``expected_version``, la mise à jour n'est appliquée que si la
+        tâche en est toujours à cette version (``VersionConflictError``
+        sinon) : vérification et écriture sont indivisibles.
+        """
+        self._load_user(user_id)
         if task_id not in self._tasks or not self._tasks[task_id]:
             return None
 
@@ -54,33 +207,268 @@ class TaskStore:
         if task and task.user_id != user_id:
             return None
 
+        check_version(task, expected_version)
         update_data = task_update.model_dump(exclude_unset=True)
+        if not update_data:
+            return task.to_task()
+        # La tâche n'est remplacée qu'une fois sa nouvelle version écrite
+        updated_task = task.copy()
+        apply_task_update(updated_task, update_data)
+        self._tasks_written([updated_task])
+        index = self._indexes[user_id]
+        index.discard_attributes(task)
+        self._tasks[task_id] = updated_task
+        index.add_attributes(updated_task)
+        updated = self._record_changes(
+            user_id, TaskEventType.UPDATED, [task_id], [updated_task]
+        )
+        return updated[0]
 
-        # Gérer le completed_at quand completed change
-        if "completed" in update_data:
-            if update_data["completed"] and not task.completed:
-                # Marquer comme complété
-                task.completed_at = datetime.now()
-            elif not update_data["completed"] and task.completed:
-                # Marquer comme non complété
-                task.completed_at = None
+    def _select_tasks(
+        self, selection: BulkSelection, user_id: int
+    ) -> List[TaskRecord]:
+        """Tâches d'un utilisateur visées par une opération groupée, par ID."""
+        self._load_user(user_id)
+        index = self._indexes.get(user_id)
+        if index is None:
+            return []
 
-        # Appliquer les autres mises à jour
-        for field, value in update_data.items():
-            setattr(task, field, value)
+        matching = None
+        if selection.filter is not None and not selection.filter.is_empty():
+            matching = index.matching_ids(selection.filter)
 
-        return task
+        selected: Iterable[int]
+        if selection.ids is not None:
+            selected = {
+                task_id
+                for task_id in selection.ids
+                if (matching is None or task_id in matching)
+                and task_id in self._tasks
+                and self._tasks[task_id].user_id == user_id
+            }
+        elif matching is not None:
+            selected = matching
+        else:
+            selected = index.task_ids
+        return [self._tasks[task_id] for task_id in sorted(selected)]
+
+    def update_tasks(
+        self, selection: BulkSelection, task_update: TaskUpdate, user_id: int
+    ) -> List[Task]:
+        """Appliquer une même mise à jour à un lot de tâches, en une passe."""
+        tasks = self._select_tasks(selection, user_id)
+        update_data = task_update.model_dump(exclude_unset=True)
+        if not (tasks and update_data):
+            return [task.to_task() for task in tasks]
+        now = datetime.now()
+        updated_tasks = [task.copy() for task in tasks]
+        for task in updated_tasks:
+            apply_task_update(task, update_data, now)
+        self._tasks_written(updated_tasks)
+        index = self._indexes[user_id]
+        index.discard_attributes_many(tasks)
+        self._tasks.update((task.id, task) for task in updated_tasks)
+        index.add_attributes_many(updated_tasks)
+        return self._record_changes(
+            user_id,
+            TaskEventType.UPDATED,
+            [task.id for task in updated_tasks],
+            updated_tasks,
+        )
 
     def delete_task(self, task_id: int, user_id: int) -> bool:
         """Supprimer une tâche."""
-        if (
-            task_id in self._tasks
-            and self._tasks[task_id]
-            and self._tasks[task_id].user_id == user_id
-        ):
+        self._load_user(user_id)
+        task = self._tasks.get(task_id)
+        if task is None or task.user_id != user_id:
+            return False
+
+        del self._tasks[task_id]
+        index = self._indexes[user_id]
+        index.remove(task)
+        if not index:
+            del self._indexes[user_id]
+        self._record_changes(user_id, TaskEventType.DELETED, [task_id])
+        self._tasks_deleted([task_id])
+        return True
+
+    def delete_tasks(self, selection: BulkSelection, user_id: int) -> int:
+        """Supprimer un lot de tâches, en une passe."""
+        tasks = self._select_tasks(selection, user_id)
+        if not tasks:
+            return 0
+        for task in tasks:
+            del self._tasks[task.id]
+        index = self._indexes[user_id]
+        index.remove_many(tasks)
+        if not index:
+            del self._indexes[user_id]
+        deleted = [task.id for task in tasks]
+        self._record_changes(user_id, TaskEventType.DELETED, deleted)
+        self._tasks_deleted(deleted)
+        return len(tasks)
+
+    def delete_all_tasks(self, user_id: int) -> int:
+        """Supprimer toutes les tâches d'un utilisateur."""
+        self._load_user(user_id)
+        index = self._indexes.pop(user_id, None)
+        if index is None:
+            return 0
+        for task_id in index.task_ids:
             del self._tasks[task_id]
-            return True
-        return False
+        self._record_changes(user_id, TaskEventType.DELETED, index.task_ids)
+        self._tasks_deleted(index.task_ids)
+        return len(index)
+
+    def stats(self) -> Dict[str, int]:
+        """Tailles du stockage (tâches chargées, index, journaux)."""
+        return {
+            "tasks": len(self._tasks),
+            "users_with_tasks": len(self._indexes),
+            "index_entries": sum(
+                index.entries() for index in self._indexes.values()
+            ),
+            "change_log_entries": sum(map(len, self._change_logs.values())),
+        }
+
+    def memory_usage(self, limit: int) -> TaskStoreMemory:
+        """Estimation de la mémoire des tâches, de leurs index et des journaux
+        des modifications, détaillée pour les ``limit`` utilisateurs les plus
+        lourds.
+
+        Le coût des tâches d'un utilisateur est tenu à jour par ses index ;
+        celui des index et du journal est déduit de leur nombre d'entrées :
+        aucune tâche n'est parcourue.
+        """
+        usages: List[Tuple[int, int, int, int, int, int]] = []
+        for user_id in self._indexes.keys() | self._change_logs.keys():
+            index = self._indexes.get(user_id)
+            log = self._change_logs.get(user_id)
+            tasks = task_bytes = index_bytes = 0
+            if index is not None:
+                tasks, task_bytes, index_bytes = (
+                    len(index),
+                    index.task_bytes,
+                    index.index_bytes(),
+                )
+            log_bytes = log.log_bytes() if log is not None else 0
+            total = task_bytes + index_bytes + log_bytes
+            usages.append((total, user_id, tasks, task_bytes, index_bytes, log_bytes))
+        tenants = [
+            TenantMemory(
+                user_id=user_id,
+                tasks=tasks,
+                task_bytes=task_bytes,
+                index_bytes=index_bytes,
+                change_log_bytes=log_bytes,
+                total_bytes=total,
+            )
+            for total, user_id, tasks, task_bytes, index_bytes, log_bytes in (
+                heapq.nlargest(limit, usages)
+            )
+        ]
+        return TaskStoreMemory(
+            tasks=len(self._tasks),
+            users=len(usages),
+            task_bytes=sum(usage[3] for usage in usages),
+            index_bytes=sum(usage[4] for usage in usages),
+            change_log_bytes=sum(usage[5] for usage in usages),
+            total_bytes=sum(usage[0] for usage in usages),
+            tenants=tenants,
+        )
+
+    def get_task_version(self, task_id: int, user_id: int) -> int | None:
+        """Version de la dernière modification d'une tâche (None si introuvable)."""
+        self._load_user(user_id)
+        task = self._tasks.get(task_id)
+        if task is None or task.user_id != user_id:
+            return None
+        return task.version
+
+    def get_collection_version(self, user_id: int) -> int:
+        """Version de la dernière modification des tâches d'un utilisateur."""
+        self._load_user(user_id)
+        return self._change_log(user_id).version
+
+    def get_collection_versions(self, user_ids: List[int]) -> Dict[int, int]:
+        """Versions des tâches de plusieurs utilisateurs.
+
+        Les utilisateurs dont les tâches n'ont jamais été lues ni modifiées
+        (sans journal des modifications) sont absents.
+        """
+        return {
+            user_id: self._change_logs[user_id].version
+            for user_id in user_ids
+            if user_id in self._change_logs
+        }
+
+    def get_changes(self, user_id: int, since: int | None) -> TaskChanges:
+        """Récupérer les modifications des tâches d'un utilisateur depuis ``since``.
+
+        Une tâche absente du stockage a été supprimée : ses IDs n'étant jamais
+        réattribués, le journal sert aussi de liste des suppressions.
+        """
+        self._load_user(user_id)
+        log = self._change_log(user_id)
+        changed = log.changed_since(since) if since is not None else None
+        if changed is None:
+            return TaskChanges(version=log.version, resync=True)
+        tasks: List[Task] = []
+        deleted: List[int] = []
+        for task_id in changed:
+            task = self._tasks.get(task_id)
+            if task is None:
+                deleted.append(task_id)
+            else:
+                tasks.append(task.to_task())
+        return TaskChanges(version=log.version, tasks=tasks, deleted=deleted)
+
+    def _change_log(self, user_id: int) -> ChangeLog:
+        log = self._change_logs.get(user_id)
+        if log is None:
+            log = self._change_logs[user_id] = ChangeLog(self._change_log_size)
+        return log
+
+    def _record_changes(
+        self,
+        user_id: int,
+        event: TaskEventType,
+        task_ids: List[int],
+        records: List[TaskRecord] | None = None,
+    ) -> List[Task]:
+        """Enregistrer une modification et la signaler aux fonctions abonnées.
+
+        Les tâches créées ou modifiées (``records``) prennent la version de la
+        modification ; elles sont retournées converties en ``Task``.
+        """
+        version = self._change_log(user_id).record(task_ids)
+        tasks: List[Task] = []
+        if records:
+            for record in records:
+                record.version = version
+            tasks = [record.to_task() for record in records]
+        if self._change_listeners:
+            changes = task_changes_event(version, event, task_ids, tasks)
+            for listener in self._change_listeners:
+                listener(user_id, event, changes)
+        return tasks
+
+    def _load_user(self, user_id: int) -> None:
+        """Appelé avant tout accès aux tâches d'un utilisateur.
+
+        Point d'extension du chargement à la demande (voir
+        ``JournaledTaskStore``).
+        """
+
+    def _tasks_written(self, tasks: List[TaskRecord]) -> None:
+        """Appelé avec les tâches créées ou modifiées, avant qu'elles
+        n'entrent dans le stockage : s'il échoue, le stockage est inchangé.
+
+        Point d'extension du stockage durable (voir ``JournaledTaskStore``).
+        """
+
+    def _tasks_deleted(self, task_ids: List[int]) -> None:
+        """Appelé après la suppression de tâches."""
 
 
 # Instance globale pour cette phase
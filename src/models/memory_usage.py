@@ -0,0 +1,113 @@
+"""Estimation de la mémoire occupée par les stockages en mémoire.
+
+Les tailles sont celles de ``sys.getsizeof`` (objet seul, sans ce qu'il
+référence), additionnées objet par objet. Le coût d'une entrée de
+conteneur est mesuré au chargement du module, sur un conteneur rempli à
+mi-chemin entre deux agrandissements de sa table : c'est un coût moyen,
+l'estimation d'un conteneur particulier peut s'écarter du simple au double.
+Un objet partagé par plusieurs structures (l'ID d'une tâche) n'est compté
+qu'une fois ; ceux que toutes partagent (énumérations, booléens) jamais.
+"""
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Iterable, Sequence
+
+from pydantic import BaseModel
+
+from src.models.task_record import TaskRecord
+from src.schemas.task import Priority
+from src.schemas.user import UserInDB
+
+_getsizeof = sys.getsizeof
+
+
+def _entry_bytes(factory: Callable[[Iterable[int]], Any], size: int = 3 * 1024) -> int:
+    """Coût moyen, mesuré, d'une entrée d'un conteneur."""
+    return round((_getsizeof(factory(range(size))) - _getsizeof(factory(()))) / size)
+
+
+INT_BYTES = _getsizeof(2**20)
+FLOAT_BYTES = _getsizeof(0.5)
+DATETIME_BYTES = _getsizeof(datetime(2000, 1, 1))
+PAIR_BYTES = _getsizeof((1, 2))
+LIST_ENTRY_BYTES = _entry_bytes(list)
+DICT_ENTRY_BYTES = _entry_bytes(dict.fromkeys)
+SET_ENTRY_BYTES = _entry_bytes(set)
+ORDERED_DICT_ENTRY_BYTES = _entry_bytes(OrderedDict.fromkeys)
+# Enregistrement, son ID, sa date de création et sa version, et son entrée
+# dans le dictionnaire des tâches
+TASK_RECORD_BYTES = (
+    _getsizeof(
+        TaskRecord(0, 0, "", None, False, None, Priority.MEDIUM, datetime.now(), None)
+    )
+    + 2 * INT_BYTES
+    + DATETIME_BYTES
+    + DICT_ENTRY_BYTES
+)
+
+
+def record_bytes(task: TaskRecord) -> int:
+    """Octets d'une tâche du stockage en mémoire."""
+    size = TASK_RECORD_BYTES + _getsizeof(task.title)
+    if task.description is not None:
+        size += _getsizeof(task.description)
+    if task.due_date is not None:
+        size += DATETIME_BYTES
+    if task.completed_at is not None:
+        size += DATETIME_BYTES
+    return size
+
+
+def model_bytes(model: BaseModel) -> int:
+    """Octets d'un modèle pydantic, sans ses valeurs : l'instance, son
+    dictionnaire d'attributs et l'ensemble des champs renseignés."""
+    return (
+        _getsizeof(model)
+        + _getsizeof(model.__dict__)
+        + _getsizeof(model.__pydantic_fields_set__)
+    )
+
+
+def user_bytes(user: UserInDB) -> int:
+    """Octets d'un utilisateur du stockage en mémoire (modèle, chaînes et date)."""
+    size = (
+        model_bytes(user)
+        + INT_BYTES
+        + DATETIME_BYTES
+        + _getsizeof(user.username)
+        + _getsizeof(user.email)
+        + _getsizeof(user.hashed_password)
+    )
+    if user.full_name is not None:
+        size += _getsizeof(user.full_name)
+    return size
+
+
+def value_bytes(value: Any) -> int:
+    """Octets d'une valeur construite pour un index (clé de tri), tuples et
+    objets à ``__slots__`` qu'elle contient compris.
+
+    Les entiers n'en sont pas comptés : ce sont des IDs ou des rangs,
+    partagés avec les tâches.
+    """
+    if isinstance(value, (int, Enum)) or value is None:
+        return 0
+    size = _getsizeof(value)
+    if isinstance(value, tuple):
+        size += sum(value_bytes(item) for item in value)
+    else:
+        for name in getattr(type(value), "__slots__", ()):
+            size += value_bytes(getattr(value, name))
+    return size
+
+
+def sampled_bytes(values: Sequence[Any], samples: int = 8) -> int:
+    """Octets d'une liste de valeurs, estimés sur ``samples`` d'entre elles
+    réparties sur toute la liste."""
+    if not values:
+        return 0
+    step = max(1, len(values) // samples)
+    sampled = values[::step][:samples]
+    return len(values) * sum(map(value_bytes, sampled)) // len(sampled)
@@ -0,0 +1,38 @@
+"""Pagination par curseur (keyset) pour les listes de tâches."""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, List
+
+from src.schemas.task import Task
+
+
+class InvalidCursorError(ValueError):
+    """Curseur de pagination illisible ou incompatible avec la requête."""
+
+
+@dataclass
+class TaskPage:
+    """Une page de tâches et le curseur permettant d'obtenir la suivante."""
+
+    items: List[Task]
+    next_cursor: str | None = None
+
+
+def encode_cursor(key: List[Any]) -> str:
+    """Encoder la clé de la dernière tâche d'une page en curseur opaque."""
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Décoder un curseur opaque en clé de tâche."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError("Curseur de pagination invalide") from None
+    if not isinstance(key, list) or not key:
+        raise InvalidCursorError("Curseur de pagination invalide")
+    return key
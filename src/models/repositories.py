@@ -0,0 +1,466 @@
+"""Ports asynchrones d'accès aux tâches et aux utilisateurs.
+
+Les routers ne manipulent que ``TaskRepository`` et ``UserRepository``. Trois
+adaptateurs enveloppent les stockages synchrones :
+
+- ``InMemory*Repository`` appelle directement un stockage en mémoire, dont
+  les opérations sont trop courtes pour justifier un changement de thread ;
+- ``ThreadPool*Repository`` exécute un stockage bloquant (SQLite) dans un
+  pool de threads, pour ne jamais bloquer la boucle d'événements ;
+- ``Journaled*Repository`` appelle directement un stockage en mémoire
+  journalisé, puis attend sans bloquer la boucle que ses écritures soient
+  sur disque.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Protocol, TypeVar
+
+from src.auth.hashing import password_hasher
+from src.models.change_log import ChangeListener
+from src.models.durable_store import JournaledTaskStore, JournaledUserStore
+from src.models.journal import Journal
+from src.models.pagination import TaskPage
+from src.schemas.admin import TaskStoreMemory, UserStoreMemory
+from src.schemas.task import (
+    BulkSelection,
+    Task,
+    TaskChanges,
+    TaskCreate,
+    TaskFilter,
+    TaskUpdate,
+)
+from src.schemas.user import User, UserCreate, UserInDB
+
+T = TypeVar("T")
+
+
+class TaskStoreProtocol(Protocol):
+    """Interface synchrone commune aux stockages de tâches."""
+
+    def add_change_listener(self, listener: ChangeListener) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def create_task(self, task_data: TaskCreate, user_id: int) -> Task: ...
+
+    def create_tasks(
+        self, tasks_data: List[TaskCreate], user_id: int
+    ) -> List[Task]: ...
+
+    def get_task(self, task_id: int, user_id: int) -> Task | None: ...
+
+    def get_all_tasks(self, user_id: int) -> List[Task]: ...
+
+    def list_tasks(
+        self,
+        user_id: int,
+        filters: TaskFilter | None = None,
+        sort: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> TaskPage: ...
+
+    def count_tasks(self, user_id: int) -> int: ...
+
+    def last_task_id(self, user_id: int) -> int | None: ...
+
+    def get_task_version(self, task_id: int, user_id: int) -> int | None: ...
+
+    def get_collection_version(self, user_id: int) -> int: ...
+
+    def get_collection_versions(self, user_ids: List[int]) -> Dict[int, int]: ...
+
+    def get_changes(self, user_id: int, since: int | None) -> TaskChanges: ...
+
+    def update_task(
+        self,
+        task_id: int,
+        task_update: TaskUpdate,
+        user_id: int,
+        expected_version: int | None = None,
+    ) -> Task | None: ...
+
+    def update_tasks(
+        self, selection: BulkSelection, task_update: TaskUpdate, user_id: int
+    ) -> List[Task]: ...
+
+    def delete_task(self, task_id: int, user_id: int) -> bool: ...
+
+    def delete_tasks(self, selection: BulkSelection, user_id: int) -> int: ...
+
+    def delete_all_tasks(self, user_id: int) -> int: ...
+
+    def stats(self) -> Dict[str, int]: ...
+
+    def memory_usage(self, limit: int) -> TaskStoreMemory: ...
+
+
+class UserStoreProtocol(Protocol):
+    """Interface synchrone commune aux stockages d'utilisateurs."""
+
+    def add_invalidation_listener(
+        self, listener: Callable[[int | None], None]
+    ) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def create_user(
+        self, user_data: UserCreate, hashed_password: str | None = None
+    ) -> User: ...
+
+    def get_user_by_username(self, username: str) -> UserInDB | None: ...
+
+    def get_user_by_email(self, email: str) -> UserInDB | None: ...
+
+    def get_user_by_id(self, user_id: int) -> User | None: ...
+
+    def deactivate_user(self, user_id: int) -> bool: ...
+
+    def stats(self) -> Dict[str, int]: ...
+
+    def invalidation_generation(self) -> int: ...
+
+    def memory_usage(self) -> UserStoreMemory: ...
+
+    def authenticate_user(self, username: str, password: str) -> UserInDB | None: ...
+
+
+class TaskRepository(Protocol):
+    """Port asynchrone d'accès aux tâches."""
+
+    def add_change_listener(self, listener: ChangeListener) -> None: ...
+
+    async def create_task(self, task_data: TaskCreate, user_id: int) -> Task: ...
+
+    async def create_tasks(
+        self, tasks_data: List[TaskCreate], user_id: int
+    ) -> List[Task]: ...
+
+    async def get_task(self, task_id: int, user_id: int) -> Task | None: ...
+
+    async def get_all_tasks(self, user_id: int) -> List[Task]: ...
+
+    async def list_tasks(
+        self,
+        user_id: int,
+        filters: TaskFilter | None = None,
+        sort: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> TaskPage: ...
+
+    async def count_tasks(self, user_id: int) -> int: ...
+
+    async def last_task_id(self, user_id: int) -> int | None: ...
+
+    async def get_task_version(self, task_id: int, user_id: int) -> int | None: ...
+
+    async def get_collection_version(self, user_id: int) -> int: ...
+
+    async def get_collection_versions(self, user_ids: List[int]) -> Dict[int, int]: ...
+
+    async def get_changes(self, user_id: int, since: int | None) -> TaskChanges: ...
+
+    async def update_task(
+        self,
+        task_id: int,
+        task_update: TaskUpdate,
+        user_id: int,
+        expected_version: int | None = None,
+    ) -> Task | None: ...
+
+    async def update_tasks(
+        self, selection: BulkSelection, task_update: TaskUpdate, user_id: int
+    ) -> List[Task]: ...
+
+    async def delete_task(self, task_id: int, user_id: int) -> bool: ...
+
+    async def delete_tasks(self, selection: BulkSelection, user_id: int) -> int: ...
+
+    async def delete_all_tasks(self, user_id: int) -> int: ...
+
+    async def stats(self) -> Dict[str, int]: ...
+
+    async def memory_usage(self, limit: int) -> TaskStoreMemory: ...
+
+
+class UserRepository(Protocol):
+    """Port asynchrone d'accès aux utilisateurs."""
+
+    def add_invalidation_listener(
+        self, listener: Callable[[int | None], None]
+    ) -> None: ...
+
+    async def create_user(
+        self, user_data: UserCreate, hashed_password: str | None = None
+    ) -> User: ...
+
+    async def get_user_by_username(self, username: str) -> UserInDB | None: ...
+
+    async def get_user_by_email(self, email: str) -> UserInDB | None: ...
+
+    async def get_user_by_id(self, user_id: int) -> User | None: ...
+
+    async def deactivate_user(self, user_id: int) -> bool: ...
+
+    async def stats(self) -> Dict[str, int]: ...
+
+    async def invalidation_generation(self) -> int: ...
+
+    async def memory_usage(self) -> UserStoreMemory: ...
+
+    async def authenticate_user(
+        self, username: str, password: str
+    ) -> UserInDB | None: ...
+
+
+class _InlineRunner:
+    """Exécute les opérations du stockage directement dans la boucle."""
+
+    async def _run(self, func: Callable[..., T], *args: object) -> T:
+        return func(*args)
+
+
+class _ThreadPoolRunner:
+    """Exécute les opérations du stockage dans un pool de threads."""
+
+    _executor: Executor
+
+    async def _run(self, func: Callable[..., T], *args: object) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+
+class _JournaledRunner:
+    """Exécute les opérations dans la boucle, puis attend leur durabilité.
+
+    Les opérations étant synchrones, les enregistrements ajoutés pendant
+    l'appel sont exactement les siens ; les requêtes qui attendent le même
+    fsync sont confirmées ensemble (group commit).
+    """
+
+    _journal: Journal
+
+    async def _run(self, func: Callable[..., T], *args: object) -> T:
+        appended = self._journal.appended
+        result = func(*args)
+        if self._journal.appended != appended:
+            await self._journal.wait_durable_async(self._journal.appended)
+        return result
+
+
+class _TaskRepositoryAdapter(ABC):
+    """Implémente ``TaskRepository`` au-dessus d'un stockage synchrone."""
+
+    def __init__(self, store: TaskStoreProtocol):
+        self.store = store
+
+    @abstractmethod
+    async def _run(self, func: Callable[..., T], *args: object) -> T:
+        """Exécuter une opération du stockage (fourni par un ``_*Runner``)."""
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """Enregistrer une fonction à appeler après chaque modification de tâches."""
+        self.store.add_change_listener(listener)
+
+    async def create_task(self, task_data: TaskCreate, user_id: int) -> Task:
+        """Créer une nouvelle tâche."""
+        return await self._run(self.store.create_task, task_data, user_id)
+
+    async def create_tasks(
+        self, tasks_data: List[TaskCreate], user_id: int
+    ) -> List[Task]:
+        """Créer un lot de tâches en une seule opération."""
+        return await self._run(self.store.create_tasks, tasks_data, user_id)
+
+    async def get_task(self, task_id: int, user_id: int) -> Task | None:
+        """Récupérer une tâche par son ID."""
+        return await self._run(self.store.get_task, task_id, user_id)
+
+    async def get_all_tasks(self, user_id: int) -> List[Task]:
+        """Récupérer toutes les tâches d'un utilisateur."""
+        return await self._run(self.store.get_all_tasks, user_id)
+
+    async def list_tasks(
+        self,
+        user_id: int,
+        filters: TaskFilter | None = None,
+        sort: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> TaskPage:
+        """Récupérer une page de tâches d'un utilisateur."""
+        return await self._run(
+            self.store.list_tasks, user_id, filters, sort, limit, cursor
+        )
+
+    async def count_tasks(self, user_id: int) -> int:
+        """Compter les tâches d'un utilisateur."""
+        return await self._run(self.store.count_tasks, user_id)
+
+    async def last_task_id(self, user_id: int) -> int | None:
+        """ID de la dernière tâche créée par un utilisateur."""
+        return await self._run(self.store.last_task_id, user_id)
+
+    async def get_task_version(self, task_id: int, user_id: int) -> int | None:
+        """Version de la dernière modification d'une tâche."""
+        return await self._run(self.store.get_task_version, task_id, user_id)
+
+    async def get_collection_version(self, user_id: int) -> int:
+        """Version de la dernière modification des tâches d'un utilisateur."""
+        return await self._run(self.store.get_collection_version, user_id)
+
+    async def get_collection_versions(self, user_ids: List[int]) -> Dict[int, int]:
+        """Versions des tâches de plusieurs utilisateurs."""
+        return await self._run(self.store.get_collection_versions, user_ids)
+
+    async def get_changes(self, user_id: int, since: int | None) -> TaskChanges:
+        """Récupérer les modifications des tâches d'un utilisateur."""
+        return await self._run(self.store.get_changes, user_id, since)
+
+    async def update_task(
+        self,
+        task_id: int,
+        task_update: TaskUpdate,
+        user_id: int,
+        expected_version: int | None = None,
+    ) -> Task | None:
+        """Mettre à jour une tâche (à la version attendue, le cas échéant)."""
+        return await self._run(
+            self.store.update_task, task_id, task_update, user_id, expected_version
+        )
+
+    async def update_tasks(
+        self, selection: BulkSelection, task_update: TaskUpdate, user_id: int
+    ) -> List[Task]:
+        """Appliquer une même mise à jour à un lot de tâches."""
+        return await self._run(
+            self.store.update_tasks, selection, task_update, user_id
+        )
+
+    async def delete_task(self, task_id: int, user_id: int) -> bool:
+        """Supprimer une tâche."""
+        return await self._run(self.store.delete_task, task_id, user_id)
+
+    async def delete_tasks(self, selection: BulkSelection, user_id: int) -> int:
+        """Supprimer un lot de tâches."""
+        return await self._run(self.store.delete_tasks, selection, user_id)
+
+    async def delete_all_tasks(self, user_id: int) -> int:
+        """Supprimer toutes les tâches d'un utilisateur."""
+        return await self._run(self.store.delete_all_tasks, user_id)
+
+    async def stats(self) -> Dict[str, int]:
+        """Tailles du stockage des tâches."""
+        return await self._run(self.store.stats)
+
+    async def memory_usage(self, limit: int) -> TaskStoreMemory:
+        """Mémoire estimée du stockage des tâches, par utilisateur."""
+        return await self._run(self.store.memory_usage, limit)
+
+
+class _UserRepositoryAdapter(ABC):
+    """Implémente ``UserRepository`` au-dessus d'un stockage synchrone."""
+
+    def __init__(self, store: UserStoreProtocol):
+        self.store = store
+
+    @abstractmethod
+    async def _run(self, func: Callable[..., T], *args: object) -> T:
+        """Exécuter une opération du stockage (fourni par un ``_*Runner``)."""
+
+    def add_invalidation_listener(self, listener: Callable[[int | None], None]) -> None:
+        """Enregistrer une fonction à appeler lors de l'invalidation d'un utilisateur."""
+        self.store.add_invalidation_listener(listener)
+
+    async def create_user(
+        self, user_data: UserCreate, hashed_password: str | None = None
+    ) -> User:
+        """Créer un nouvel utilisateur (le hash est calculé dans le pool de hashage)."""
+        if hashed_password is None:
+            hashed_password = await password_hasher.hash(user_data.password)
+        return await self._run(self.store.create_user, user_data, hashed_password)
+
+    async def get_user_by_username(self, username: str) -> UserInDB | None:
+        """Récupérer un utilisateur par son nom d'utilisateur."""
+        return await self._run(self.store.get_user_by_username, username)
+
+    async def get_user_by_email(self, email: str) -> UserInDB | None:
+        """Récupérer un utilisateur par son email."""
+        return await self._run(self.store.get_user_by_email, email)
+
+    async def get_user_by_id(self, user_id: int) -> User | None:
+        """Récupérer un utilisateur par son ID."""
+        return await self._run(self.store.get_user_by_id, user_id)
+
+    async def deactivate_user(self, user_id: int) -> bool:
+        """Désactiver un utilisateur."""
+        return await self._run(self.store.deactivate_user, user_id)
+
+    async def stats(self) -> Dict[str, int]:
+        """Nombre d'utilisateurs, et d'utilisateurs actifs."""
+        return await self._run(self.store.stats)
+
+    async def invalidation_generation(self) -> int:
+        """Nombre d'invalidations d'utilisateurs (désactivation, vidage)."""
+        return await self._run(self.store.invalidation_generation)
+
+    async def memory_usage(self) -> UserStoreMemory:
+        """Mémoire estimée du stockage des utilisateurs."""
+        return await self._run(self.store.memory_usage)
+
+    async def authenticate_user(self, username: str, password: str) -> UserInDB | None:
+        """Authentifier un utilisateur.
+
+        La lecture passe par le stockage, la vérification bcrypt par le pool
+        de hashage (voir ``PasswordHashingPool``).
+        """
+        user = await self.get_user_by_username(username)
+        if not user:
+            return None
+        if not await password_hasher.verify(password, user.hashed_password):
+            return None
+        if not user.is_active:
+            return None
+        return user
+
+
+class InMemoryTaskRepository(_InlineRunner, _TaskRepositoryAdapter):
+    """Accès aux tâches d'un stockage en mémoire."""
+
+
+class InMemoryUserRepository(_InlineRunner, _UserRepositoryAdapter):
+    """Accès aux utilisateurs d'un stockage en mémoire."""
+
+
+class ThreadPoolTaskRepository(_ThreadPoolRunner, _TaskRepositoryAdapter):
+    """Accès aux tâches d'un stockage bloquant, via un pool de threads."""
+
+    def __init__(self, store: TaskStoreProtocol, executor: Executor):
+        super().__init__(store)
+        self._executor = executor
+
+
+class ThreadPoolUserRepository(_ThreadPoolRunner, _UserRepositoryAdapter):
+    """Accès aux utilisateurs d'un stockage bloquant, via un pool de threads."""
+
+    def __init__(self, store: UserStoreProtocol, executor: Executor):
+        super().__init__(store)
+        self._executor = executor
+
+
+class JournaledTaskRepository(_JournaledRunner, _TaskRepositoryAdapter):
+    """Accès aux tâches d'un stockage en mémoire journalisé."""
+
+    def __init__(self, store: JournaledTaskStore):
+        super().__init__(store)
+        self._journal = store.journal
+
+
+class JournaledUserRepository(_JournaledRunner, _UserRepositoryAdapter):
+    """Accès aux utilisateurs d'un stockage en mémoire journalisé."""
+
+    def __init__(self, store: JournaledUserStore):
+        super().__init__(store)
+        self._journal = store.journal
@@ -0,0 +1,263 @@
+"""Instantanés du stockage en mémoire, projetables en mémoire (mmap).
+
+Un instantané est un fichier en lecture seule, en sections contiguës :
+
+- un en-tête : prochains IDs, nombres d'enregistrements, positions des
+  sections ;
+- les tâches, en enregistrements de taille fixe triés par utilisateur puis
+  par ID ; titre et description y sont des positions dans le tas de chaînes ;
+- l'annuaire des utilisateurs ayant des tâches : IDs triés et position de la
+  première tâche de chacun, en tableaux d'entiers de 64 bits ;
+- les utilisateurs, en enregistrements de taille fixe triés par ID ;
+- le tas de chaînes (UTF-8, bout à bout).
+
+Ouvrir un instantané ne lit que l'en-tête : le système charge les pages à la
+première lecture, et les partage entre les processus qui projettent le même
+fichier. Les tâches d'un utilisateur forment une plage contiguë, localisée
+par recherche dichotomique dans l'annuaire.
+
+Les champs des enregistrements (``TASK_ROW``, ``USER_ROW``) sont ceux des
+enregistrements du journal, sans leurs chaînes ; ce module ne les interprète
+pas (voir ``src.models.journal``).
+"""
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from typing import Iterator, List, Sequence, Tuple
+
+MAGIC = b"TODOSNP2"
+
+# Date : année, mois, jour, heure, minute, seconde, microseconde, décalage
+DATETIME_ROW = "HBBBBBIh"
+# Tâche : ID, utilisateur, completed, priorité, échéance, création, complétion
+TASK_ROW = "qqbb" + DATETIME_ROW * 3
+# Utilisateur : ID, actif, date de création
+USER_ROW = "qb" + DATETIME_ROW
+
+# Chaque chaîne : position dans le tas et longueur (-1 pour None)
+_TASK_RECORD = struct.Struct("<" + TASK_ROW + "qi" * 2)
+_USER_RECORD = struct.Struct("<" + USER_ROW + "qi" * 4)
+# Un caractère par champ dans les formats ci-dessus
+_TASK_FIELD_COUNT = len(TASK_ROW)
+_USER_FIELD_COUNT = len(USER_ROW)
+# Prochains IDs de tâche et d'utilisateur, nombres de tâches, d'utilisateurs
+# de l'annuaire et d'utilisateurs, positions de l'annuaire, des utilisateurs
+# et du tas, taille du tas
+_HEADER = struct.Struct("<" + "q" * 9)
+_TASKS_OFFSET = len(MAGIC) + _HEADER.size
+_INT64 = 8
+
+# Enregistrement lu : champs (chaînes comprises) puis octets de chaque chaîne
+Row = Tuple[Tuple[int, ...], List[bytes | None]]
+
+
+class SnapshotError(RuntimeError):
+    """Instantané illisible."""
+
+
+def _align(offset: int) -> int:
+    return -offset % _INT64
+
+
+class SnapshotWriter:
+    """Écriture séquentielle d'un instantané.
+
+    Les tâches sont ajoutées triées par utilisateur puis par ID, et écrites au
+    fil de l'eau ; seuls le tas de chaînes, l'annuaire et les utilisateurs
+    sont gardés en mémoire jusqu'à ``close()``.
+    """
+
+    _BUFFERED_RECORDS = 4096
+
+    def __init__(self, path: str, next_task_id: int, next_user_id: int):
+        self.path = path
+        self.next_task_id = next_task_id
+        self.next_user_id = next_user_id
+        self._file = open(path, "wb")
+        self._file.write(bytes(_TASKS_OFFSET))
+        self._records: List[bytes] = []
+        self._task_count = 0
+        self._directory_ids: List[int] = []
+        self._directory_starts: List[int] = []
+        self._users: List[bytes] = []
+        self._heap = bytearray()
+
+    def _string(self, value: bytes | None) -> Tuple[int, int]:
+        if value is None:
+            return 0, -1
+        offset = len(self._heap)
+        self._heap += value
+        return offset, len(value)
+
+    def add_task(
+        self, fields: Sequence[int], title: bytes | None, description: bytes | None
+    ) -> None:
+        """Ajouter une tâche (champs ``TASK_ROW``, éventuellement suivis d'autres)."""
+        user_id = fields[1]
+        if not self._directory_ids or self._directory_ids[-1] != user_id:
+            if self._directory_ids and user_id < self._directory_ids[-1]:
+                raise ValueError("Les tâches doivent être triées par utilisateur")
+            self._directory_ids.append(user_id)
+            self._directory_starts.append(self._task_count)
+        self._records.append(
+            _TASK_RECORD.pack(
+                *fields[:_TASK_FIELD_COUNT],
+                *self._string(title),
+                *self._string(description),
+            )
+        )
+        self._task_count += 1
+        if len(self._records) >= self._BUFFERED_RECORDS:
+            self._file.write(b"".join(self._records))
+            self._records = []
+
+    def add_user(self, fields: Sequence[int], strings: Sequence[bytes | None]) -> None:
+        """Ajouter un utilisateur (ajoutés triés par ID)."""
+        positions: List[int] = []
+        for value in strings:
+            positions.extend(self._string(value))
+        self._users.append(_USER_RECORD.pack(*fields[:_USER_FIELD_COUNT], *positions))
+
+    def close(self) -> None:
+        """Terminer le fichier et le synchroniser sur disque."""
+        file = self._file
+        try:
+            file.write(b"".join(self._records))
+            position = _TASKS_OFFSET + self._task_count * _TASK_RECORD.size
+            file.write(bytes(_align(position)))
+            directory_offset = position + _align(position)
+            self._directory_starts.append(self._task_count)
+            file.write(struct.pack(f"<{len(self._directory_ids)}q", *self._directory_ids))
+            file.write(
+                struct.pack(f"<{len(self._directory_starts)}q", *self._directory_starts)
+            )
+            users_offset = directory_offset + _INT64 * (
+                len(self._directory_ids) + len(self._directory_starts)
+            )
+            file.write(b"".join(self._users))
+            heap_offset = users_offset + len(self._users) * _USER_RECORD.size
+            file.write(self._heap)
+            file.seek(0)
+            file.write(
+                MAGIC
+                + _HEADER.pack(
+                    self.next_task_id,
+                    self.next_user_id,
+                    self._task_count,
+                    len(self._directory_ids),
+                    len(self._users),
+                    directory_offset,
+                    users_offset,
+                    heap_offset,
+                    len(self._heap),
+                )
+            )
+            file.flush()
+            os.fsync(file.fileno())
+        finally:
+            file.close()
+
+
+class Snapshot:
+    """Instantané projeté en mémoire, en lecture seule.
+
+    Aucune validation n'est faite au-delà de l'en-tête et de la taille du
+    fichier : parcourir l'instantané pour en vérifier le contenu ferait
+    perdre l'intérêt de la projection. Son intégrité repose sur son écriture
+    (fichier temporaire synchronisé, puis renommé).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < _TASKS_OFFSET:
+                raise SnapshotError(f"Instantané invalide : {path}")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            self.next_task_id,
+            self.next_user_id,
+            self.task_count,
+            directory_size,
+            self.user_count,
+            directory_offset,
+            self._users_offset,
+            self._heap_offset,
+            heap_size,
+        ) = _HEADER.unpack_from(self._map, len(MAGIC))
+        if (
+            self._map[: len(MAGIC)] != MAGIC
+            or directory_offset
+            < _TASKS_OFFSET + self.task_count * _TASK_RECORD.size
+            or self._users_offset
+            != directory_offset + _INT64 * (2 * directory_size + 1)
+            or self._heap_offset
+            != self._users_offset + self.user_count * _USER_RECORD.size
+            or self._heap_offset + heap_size != size
+        ):
+            self._map.close()
+            raise SnapshotError(f"Instantané invalide : {path}")
+        view = memoryview(self._map)
+        self._views = [
+            view,
+            view[directory_offset : directory_offset + _INT64 * directory_size],
+            view[
+                directory_offset + _INT64 * directory_size : self._users_offset
+            ],
+        ]
+        self._directory_ids = self._views[1].cast("q")
+        self._directory_starts = self._views[2].cast("q")
+        self._views.extend([self._directory_ids, self._directory_starts])
+
+    def task_user_ids(self) -> Sequence[int]:
+        """IDs triés des utilisateurs ayant des tâches."""
+        return self._directory_ids
+
+    def _strings(self, record: Tuple[int, ...], first: int) -> List[bytes | None]:
+        heap = self._heap_offset
+        values: List[bytes | None] = []
+        for position in range(first, len(record), 2):
+            length = record[position + 1]
+            if length < 0:
+                values.append(None)
+            else:
+                start = heap + record[position]
+                values.append(self._map[start : start + length])
+        return values
+
+    def task_rows(self, user_id: int) -> Iterator[Row]:
+        """Tâches d'un utilisateur, par ID croissant."""
+        position = bisect_left(self._directory_ids, user_id)
+        if (
+            position == len(self._directory_ids)
+            or self._directory_ids[position] != user_id
+        ):
+            return
+        start = _TASKS_OFFSET + self._directory_starts[position] * _TASK_RECORD.size
+        end = _TASKS_OFFSET + self._directory_starts[position + 1] * _TASK_RECORD.size
+        data = self._map
+        heap = self._heap_offset
+        for record in _TASK_RECORD.iter_unpack(data[start:end]):
+            # Titre et description, sans passer par _strings (chemin critique)
+            title_start = heap + record[28]
+            description_start = heap + record[30]
+            yield record, [
+                None if record[29] < 0 else data[title_start : title_start + record[29]],
+                None
+                if record[31] < 0
+                else data[description_start : description_start + record[31]],
+            ]
+
+    def user_rows(self) -> Iterator[Row]:
+        """Utilisateurs, par ID croissant."""
+        data = self._map[self._users_offset : self._heap_offset]
+        for record in _USER_RECORD.iter_unpack(data):
+            yield record, self._strings(record, _USER_FIELD_COUNT)
+
+    def close(self) -> None:
+        """Libérer la projection."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
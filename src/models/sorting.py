@@ -0,0 +1,147 @@
+"""Ordres de tri des listes de tâches."""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.models.pagination import InvalidCursorError
+from src.models.task_record import TaskRecord
+from src.schemas.task import Priority, Task
+
+# Rang de chaque priorité, de la plus basse à la plus haute
+PRIORITY_RANK: Dict[Priority, int] = {
+    priority: rank for rank, priority in enumerate(Priority)
+}
+
+
+def _timestamp(value: datetime) -> float:
+    return value.timestamp()
+
+
+def _casefold(value: str) -> str:
+    return value.casefold()
+
+
+# Champs triables et conversion de leur valeur en primitive comparable
+# (et sérialisable en JSON pour les curseurs).
+SORTABLE_FIELDS: Dict[str, Callable[[Any], Any]] = {
+    "id": int,
+    "title": _casefold,
+    "description": _casefold,
+    "completed": int,
+    "due_date": _timestamp,
+    "priority": PRIORITY_RANK.__getitem__,
+    "created_at": _timestamp,
+    "completed_at": _timestamp,
+}
+
+# Types attendus des primitives dans un curseur
+_PRIMITIVE_TYPES: Dict[str, Tuple[type, ...]] = {
+    "id": (int,),
+    "title": (str,),
+    "description": (str,),
+    "completed": (int,),
+    "due_date": (int, float),
+    "priority": (int,),
+    "created_at": (int, float),
+    "completed_at": (int, float),
+}
+
+
+class InvalidSortError(ValueError):
+    """Critère de tri inconnu ou mal formé."""
+
+
+class _Descending:
+    """Enveloppe inversant la comparaison d'une valeur (tri décroissant)."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return bool(other.value < self.value)
+
+
+@dataclass(frozen=True)
+class SortSpec:
+    """Ordre de tri : suite de champs, chacun croissant ou décroissant.
+
+    L'ID sert toujours de dernier critère, ce qui rend chaque clé unique et
+    permet la pagination par curseur sur n'importe quel ordre. Les valeurs
+    absentes (``None``) sont placées en fin de liste quel que soit le sens.
+    """
+
+    fields: Tuple[Tuple[str, bool], ...] = ()
+
+    @classmethod
+    def parse(cls, sort: str | None) -> "SortSpec":
+        """Analyser un paramètre ``sort`` (ex. ``priority,-due_date``)."""
+        if not sort:
+            return cls()
+        fields: List[Tuple[str, bool]] = []
+        for item in sort.split(","):
+            item = item.strip()
+            descending = item.startswith("-")
+            name = item.lstrip("+-")
+            if name not in SORTABLE_FIELDS:
+                raise InvalidSortError(f"Champ de tri inconnu : {name!r}")
+            if any(field == name for field, _ in fields):
+                raise InvalidSortError(f"Champ de tri répété : {name!r}")
+            fields.append((name, descending))
+        if fields == [("id", False)]:
+            return cls()
+        return cls(tuple(fields))
+
+    @property
+    def is_default(self) -> bool:
+        """Indiquer s'il s'agit de l'ordre par défaut (par ID croissant)."""
+        return not self.fields
+
+    @property
+    def key_fields(self) -> Tuple[Tuple[str, bool], ...]:
+        """Champs de la clé de tri complète, ID final compris."""
+        if self.fields and self.fields[-1][0] == "id":
+            return self.fields
+        return self.fields + (("id", False),)
+
+    def cursor_values(self, task: Task | TaskRecord) -> List[Any]:
+        """Valeurs primitives de la clé d'une tâche, à placer dans un curseur."""
+        values = []
+        for name, _ in self.key_fields:
+            value = getattr(task, name)
+            values.append(None if value is None else SORTABLE_FIELDS[name](value))
+        return values
+
+    def key_from_values(self, values: List[Any]) -> Tuple[Any, ...]:
+        """Construire une clé comparable à partir de ses valeurs primitives."""
+        key_fields = self.key_fields
+        if not isinstance(values, list) or len(values) != len(key_fields):
+            raise InvalidCursorError("Curseur incompatible avec l'ordre demandé")
+        key: List[Any] = []
+        for (name, descending), value in zip(key_fields, values):
+            if value is None:
+                # Toute tâche a un ID : un curseur sans ID est forgé
+                if name == "id":
+                    raise InvalidCursorError(
+                        "Curseur incompatible avec l'ordre demandé"
+                    )
+                key.append((1,))
+                continue
+            if not isinstance(value, _PRIMITIVE_TYPES[name]):
+                raise InvalidCursorError("Curseur incompatible avec l'ordre demandé")
+            key.append((0, _Descending(value) if descending else value))
+        return tuple(key)
+
+    def sort_key(self, task: Task | TaskRecord) -> Tuple[Any, ...]:
+        """Clé de tri d'une tâche (le dernier élément contient son ID)."""
+        return self.key_from_values(self.cursor_values(task))
+
+
+def key_task_id(key: Tuple[Any, ...]) -> int:
+    """Extraire l'ID de la tâche d'une clé de tri."""
+    value = key[-1][1]
+    return int(value.value if isinstance(value, _Descending) else value)
@@ -0,0 +1,952 @@
+"""Stockage persistant SQLite pour les tâches et les utilisateurs.
+
+Implémente la même interface que ``TaskStore`` et ``UserStore`` : les routers
+n'ont pas à savoir quel stockage est configuré (voir ``src.models.stores``).
+"""
+import json
+import queue
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from src.auth.security import get_password_hash, verify_password
+from src.config import CHANGE_LOG_SIZE
+from src.models.change_log import (
+    ChangeListener,
+    initial_version,
+    task_changes_event,
+)
+from src.models.pagination import TaskPage, decode_cursor, encode_cursor
+from src.models.sorting import SORTABLE_FIELDS, SortSpec
+from src.models.task_record import TaskRecord
+from src.models.task_updates import apply_task_update, check_version
+from src.schemas.admin import TaskStoreMemory, UserStoreMemory
+from src.schemas.task import (
+    BulkSelection,
+    Priority,
+    Task,
+    TaskChanges,
+    TaskCreate,
+    TaskEventType,
+    TaskFilter,
+    TaskUpdate,
+)
+from src.schemas.user import User, UserCreate, UserInDB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    email TEXT NOT NULL,
+    full_name TEXT,
+    is_active INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT NOT NULL,
+    hashed_password TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username ON users (username);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users (email);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    completed INTEGER NOT NULL,
+    due_date TEXT,
+    priority TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    completed_at TEXT,
+    -- Clés de tri, calculées comme celles de SortSpec
+    title_key TEXT NOT NULL,
+    description_key TEXT,
+    due_ts REAL,
+    priority_rank INTEGER,
+    created_ts REAL NOT NULL,
+    completed_ts REAL,
+    -- Version de la dernière modification (voir ChangeLog)
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_id ON tasks (user_id, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_due_date ON tasks (user_id, due_ts);
+
+-- Journal borné des modifications, par utilisateur (voir ChangeLog) :
+-- version de la dernière modification des tâches récemment modifiées
+CREATE TABLE IF NOT EXISTS change_logs (
+    user_id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL,
+    floor INTEGER NOT NULL,
+    entries INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS task_changes (
+    user_id INTEGER NOT NULL,
+    task_id INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (user_id, task_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_task_changes_version
+    ON task_changes (user_id, version);
+
+-- Nombre d'invalidations d'utilisateurs (désactivation, vidage) : les
+-- workers partageant la base vident leur cache des jetons quand il change
+CREATE TABLE IF NOT EXISTS user_invalidations (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    generation INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO user_invalidations (id, generation) VALUES (1, 0);
+"""
+
+TASK_COLUMNS = (
+    "id, user_id, title, description, completed, due_date, priority, "
+    "created_at, completed_at, version"
+)
+
+# Colonne portant la clé de tri de chaque champ triable
+SORT_COLUMNS: Dict[str, str] = {
+    "id": "id",
+    "title": "title_key",
+    "description": "description_key",
+    "completed": "completed",
+    "due_date": "due_ts",
+    "priority": "priority_rank",
+    "created_at": "created_ts",
+    "completed_at": "completed_ts",
+}
+
+INSERT_TASK = """
+INSERT INTO tasks (
+    user_id, title, description, completed, due_date, priority, created_at,
+    completed_at, title_key, description_key, due_ts, priority_rank,
+    created_ts, completed_ts, version
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_TASK_WITH_ID = """
+INSERT INTO tasks (
+    id, user_id, title, description, completed, due_date, priority,
+    created_at, completed_at, title_key, description_key, due_ts,
+    priority_rank, created_ts, completed_ts, version
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_TASK = """
+UPDATE tasks SET
+    title = ?, description = ?, completed = ?, due_date = ?, priority = ?,
+    created_at = ?, completed_at = ?, title_key = ?, description_key = ?,
+    due_ts = ?, priority_rank = ?, created_ts = ?, completed_ts = ?, version = ?
+WHERE id = ?
+"""
+
+SELECT_TASK = f"SELECT {TASK_COLUMNS} FROM tasks WHERE id = ? AND user_id = ?"
+# Tâches modifiées après une version ; colonnes des tâches nulles si supprimées
+SELECT_CHANGES = (
+    "SELECT c.task_id AS changed_id, "
+    + ", ".join(f"t.{column}" for column in TASK_COLUMNS.split(", "))
+    + " FROM task_changes AS c LEFT JOIN tasks AS t ON t.id = c.task_id"
+    " WHERE c.user_id = ? AND c.version > ? ORDER BY c.version, c.task_id"
+)
+UPSERT_CHANGES = """
+INSERT INTO task_changes (user_id, task_id, version)
+SELECT ?, value, ? FROM json_each(?) WHERE true
+ON CONFLICT (user_id, task_id) DO UPDATE SET version = excluded.version
+"""
+# Version suivante d'un utilisateur, journal créé au besoin
+NEXT_VERSION = """
+INSERT INTO change_logs (user_id, version, floor, entries) VALUES (?, ?, ?, 0)
+ON CONFLICT (user_id) DO UPDATE SET version = version + 1
+RETURNING version
+"""
+BUMP_INVALIDATIONS = "UPDATE user_invalidations SET generation = generation + 1"
+SELECT_USER_TASKS = f"SELECT {TASK_COLUMNS} FROM tasks WHERE user_id = ? ORDER BY id"
+USER_COLUMNS = (
+    "id, username, email, full_name, is_active, created_at, hashed_password"
+)
+
+
+def _to_text(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _from_text(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _from_text_required(value: str | None) -> datetime:
+    # Colonne NOT NULL : une valeur nulle signale une base corrompue
+    if value is None:
+        raise sqlite3.DataError("Date obligatoire absente")
+    return datetime.fromisoformat(value)
+
+
+def _sort_value(field: str, value: Any) -> Any:
+    return SORTABLE_FIELDS[field](value) if value is not None else None
+
+
+class SQLiteDatabase:
+    """Base SQLite partagée par les stores, avec un pool de connexions.
+
+    Les connexions sont ouvertes une fois pour toutes en mode WAL : les
+    lectures ne bloquent pas les écritures, ce qui permet plusieurs workers
+    uvicorn sur la même base. Chaque connexion garde en cache ses requêtes
+    compilées (les requêtes utilisent toujours le même texte paramétré).
+
+    Avec ``mmap_size``, les ``mmap_size`` premiers octets de la base sont
+    projetés en mémoire : les lectures se font dans les pages du fichier,
+    partagées par tous les processus, plutôt que par copie dans le cache de
+    chaque connexion.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4, mmap_size: int = 0):
+        self.path = path
+        self.mmap_size = mmap_size
+        self._pool: queue.Queue[sqlite3.Connection] = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+        with self.transaction() as conn:
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)")}
+            if "version" not in columns:
+                # Base créée avant le versionnement des tâches
+                conn.execute(
+                    "ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        if self.mmap_size:
+            conn.execute(f"PRAGMA mmap_size={self.mmap_size:d}")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Emprunter une connexion au pool (en mode autocommit)."""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Emprunter une connexion dans une transaction d'écriture."""
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @contextmanager
+    def snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Emprunter une connexion dans une transaction de lecture.
+
+        Les requêtes de la transaction voient toutes le même état de la base.
+        """
+        with self.connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Fermer toutes les connexions du pool."""
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+class SQLiteTaskStore:
+    """Stockage SQLite pour les tâches."""
+
+    def __init__(
+        self, database: SQLiteDatabase, change_log_size: int = CHANGE_LOG_SIZE
+    ):
+        self._db = database
+        self._change_log_size = change_log_size
+        self._change_listeners: List[ChangeListener] = []
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """Enregistrer une fonction à appeler après chaque modification de tâches.
+
+        Elle est appelée après la validation de la transaction, dans le thread
+        de l'opération.
+        """
+        self._change_listeners.append(listener)
+
+    def _notify_changes(
+        self,
+        user_id: int,
+        event: TaskEventType,
+        version: int,
+        task_ids: List[int],
+        tasks: List[Task] | None = None,
+    ) -> None:
+        if self._change_listeners:
+            changes = task_changes_event(version, event, task_ids, tasks)
+            for listener in self._change_listeners:
+                listener(user_id, event, changes)
+
+    def clear(self) -> None:
+        """Vider le stockage."""
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM tasks")
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = 'tasks'")
+            conn.execute("DELETE FROM task_changes")
+            conn.execute("DELETE FROM change_logs")
+
+    @staticmethod
+    def _row_to_task(row: sqlite3.Row) -> Task:
+        # Lignes écrites depuis des tâches valides : pas de revalidation
+        return TaskRecord(
+            row["id"],
+            row["user_id"],
+            row["title"],
+            row["description"],
+            bool(row["completed"]),
+            _from_text(row["due_date"]),
+            Priority(row["priority"]),
+            _from_text_required(row["created_at"]),
+            _from_text(row["completed_at"]),
+            row["version"],
+        ).to_task()
+
+    @staticmethod
+    def _task_values(task: Task) -> Tuple[Any, ...]:
+        """Valeurs des colonnes modifiables, clés de tri comprises."""
+        return (
+            task.title,
+            task.description,
+            task.completed,
+            _to_text(task.due_date),
+            task.priority.value if task.priority is not None else None,
+            _to_text(task.created_at),
+            _to_text(task.completed_at),
+            _sort_value("title", task.title),
+            _sort_value("description", task.description),
+            _sort_value("due_date", task.due_date),
+            _sort_value("priority", task.priority),
+            _sort_value("created_at", task.created_at),
+            _sort_value("completed_at", task.completed_at),
+        )
+
+    def create_task(self, task_data: TaskCreate, user_id: int) -> Task:
+        """Créer une nouvelle tâche."""
+        task = TaskRecord.create(task_data, 0, user_id, datetime.now()).to_task()
+        with self._db.transaction() as conn:
+            version = self._next_version(conn, user_id)
+            cursor = conn.execute(
+                INSERT_TASK, (user_id, *self._task_values(task), version)
+            )
+            task.id = cursor.lastrowid or 0
+            task.version = version
+            self._record_changes(conn, user_id, [task.id], version)
+        self._notify_changes(user_id, TaskEventType.CREATED, version, [task.id], [task])
+        return task
+
+    def create_tasks(self, tasks_data: List[TaskCreate], user_id: int) -> List[Task]:
+        """Créer un lot de tâches, d'IDs contigus, en une seule transaction.
+
+        Le verrou d'écriture est pris avant de lire le dernier ID attribué :
+        la plage d'IDs ne peut pas être entamée par un autre processus.
+        """
+        if not tasks_data:
+            return []
+        now = datetime.now()
+        with self._db.transaction() as conn:
+            row = conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'tasks'"
+            ).fetchone()
+            first_id = (row[0] if row is not None else 0) + 1
+            version = self._next_version(conn, user_id)
+            tasks = [
+                TaskRecord.create(task_data, first_id + offset, user_id, now).to_task()
+                for offset, task_data in enumerate(tasks_data)
+            ]
+            for task in tasks:
+                task.version = version
+            conn.executemany(
+                INSERT_TASK_WITH_ID,
+                [
+                    (task.id, user_id, *self._task_values(task), version)
+                    for task in tasks
+                ],
+            )
+            task_ids = [task.id for task in tasks]
+            self._record_changes(conn, user_id, task_ids, version)
+        self._notify_changes(user_id, TaskEventType.CREATED, version, task_ids, tasks)
+        return tasks
+
+    def get_task(self, task_id: int, user_id: int) -> Task | None:
+        """Récupérer une tâche par son ID."""
+        with self._db.connection() as conn:
+            row = conn.execute(SELECT_TASK, (task_id, user_id)).fetchone()
+        return self._row_to_task(row) if row is not None else None
+
+    def get_all_tasks(self, user_id: int) -> List[Task]:
+        """Récupérer toutes les tâches d'un utilisateur."""
+        with self._db.connection() as conn:
+            rows = conn.execute(SELECT_USER_TASKS, (user_id,)).fetchall()
+        return [self._row_to_task(row) for row in rows]
+
+    def list_tasks(
+        self,
+        user_id: int,
+        filters: TaskFilter | None = None,
+        sort: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> TaskPage:
+        """Récupérer une page de tâches d'un utilisateur.
+
+        Même sémantique que ``TaskStore.list_tasks`` : la page suivante est
+        obtenue par une condition sur la clé de tri (keyset), pas par OFFSET.
+        """
+        spec = SortSpec.parse(sort)
+        conditions, params = self._filter_conditions(user_id, filters)
+
+        if cursor is not None:
+            values = decode_cursor(cursor)
+            spec.key_from_values(values)  # Valider le curseur
+            condition, condition_params = self._after_condition(spec, values)
+            conditions.append(condition)
+            params.extend(condition_params)
+
+        order_by = ", ".join(
+            f"{SORT_COLUMNS[name]} IS NULL, {SORT_COLUMNS[name]} "
+            f"{'DESC' if descending else 'ASC'}"
+            for name, descending in spec.key_fields
+        )
+        query = (
+            f"SELECT {TASK_COLUMNS} FROM tasks WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {order_by}"
+        )
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit + 1)
+
+        with self._db.connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        has_more = limit is not None and len(rows) > limit
+        items = [self._row_to_task(row) for row in rows[:limit]]
+        next_cursor = None
+        if items and has_more:
+            next_cursor = encode_cursor(spec.cursor_values(items[-1]))
+        return TaskPage(items=items, next_cursor=next_cursor)
+
+    @staticmethod
+    def _filter_conditions(
+        user_id: int, filters: TaskFilter | None
+    ) -> Tuple[List[str], List[Any]]:
+        """Conditions SQL (et paramètres) des tâches d'un utilisateur filtrées."""
+        conditions = ["user_id = ?"]
+        params: List[Any] = [user_id]
+        if filters is None:
+            return conditions, params
+
+        if filters.completed is not None:
+            conditions.append("completed = ?")
+            params.append(filters.completed)
+        if filters.priority:
+            placeholders = ", ".join("?" for _ in filters.priority)
+            conditions.append(f"priority IN ({placeholders})")
+            params.extend(priority.value for priority in filters.priority)
+        if filters.due_after is not None:
+            conditions.append("due_ts >= ?")
+            params.append(_sort_value("due_date", filters.due_after))
+        if filters.due_before is not None:
+            conditions.append("due_ts < ?")
+            params.append(_sort_value("due_date", filters.due_before))
+        return conditions, params
+
+    def _selection_condition(
+        self, selection: BulkSelection, user_id: int
+    ) -> Tuple[str, List[Any]]:
+        """Condition SQL des tâches visées par une opération groupée.
+
+        La liste d'IDs est passée en un seul paramètre JSON, quelle que soit
+        sa taille (pas de limite sur le nombre de paramètres).
+        """
+        conditions, params = self._filter_conditions(user_id, selection.filter)
+        if selection.ids is not None:
+            conditions.append("id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(selection.ids))
+        return " AND ".join(conditions), params
+
+    @staticmethod
+    def _after_condition(
+        spec: SortSpec, values: List[Any]
+    ) -> Tuple[str, List[Any]]:
+        """Condition SQL « clé de tri strictement après ``values`` ».
+
+        Comparaison lexicographique, valeurs absentes en dernier quel que soit
+        le sens du tri.
+        """
+        alternatives = []
+        params: List[Any] = []
+        equal_parts: List[str] = []
+        equal_params: List[Any] = []
+        for (name, descending), value in zip(spec.key_fields, values):
+            column = SORT_COLUMNS[name]
+            if value is not None:
+                operator = "<" if descending else ">"
+                alternatives.append(
+                    "("
+                    + " AND ".join(
+                        equal_parts + [f"({column} {operator} ? OR {column} IS NULL)"]
+                    )
+                    + ")"
+                )
+                params.extend(equal_params + [value])
+                equal_parts.append(f"{column} = ?")
+                equal_params.append(value)
+            else:
+                equal_parts.append(f"{column} IS NULL")
+        return "(" + (" OR ".join(alternatives) or "0") + ")", params
+
+    def count_tasks(self, user_id: int) -> int:
+        """Compter les tâches d'un utilisateur."""
+        with self._db.connection() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        return int(row[0])
+
+    def last_task_id(self, user_id: int) -> int | None:
+        """ID de la dernière tâche créée par un utilisateur (None si aucune)."""
+        with self._db.connection() as conn:
+            row = conn.execute(
+                "SELECT MAX(id) FROM tasks WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        return None if row[0] is None else int(row[0])
+
+    def update_task(
+        self,
+        task_id: int,
+        task_update: TaskUpdate,
+        user_id: int,
+        expected_version: int | None = None,
+    ) -> Task | None:
+        """Mettre à jour une tâche.
+
+        Même sémantique que ``TaskStore.update_task`` : la version est
+        vérifiée dans la transaction d'écriture.
+        """
+        with self._db.transaction() as conn:
+            row = conn.execute(SELECT_TASK, (task_id, user_id)).fetchone()
+            if row is None:
+                return None
+
+            task = self._row_to_task(row)
+            check_version(task, expected_version)
+            update_data = task_update.model_dump(exclude_unset=True)
+            if not update_data:
+                return task
+            apply_task_update(task, update_data)
+            task.version = self._next_version(conn, user_id)
+            conn.execute(
+                UPDATE_TASK, (*self._task_values(task), task.version, task_id)
+            )
+            self._record_changes(conn, user_id, [task_id], task.version)
+        self._notify_changes(
+            user_id, TaskEventType.UPDATED, task.version, [task_id], [task]
+        )
+        return task
+
+    def update_tasks(
+        self, selection: BulkSelection, task_update: TaskUpdate, user_id: int
+    ) -> List[Task]:
+        """Appliquer une même mise à jour à un lot de tâches, en une transaction."""
+        condition, params = self._selection_condition(selection, user_id)
+        with self._db.transaction() as conn:
+            rows = conn.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE {condition} ORDER BY id",
+                params,
+            ).fetchall()
+            tasks = [self._row_to_task(row) for row in rows]
+            update_data = task_update.model_dump(exclude_unset=True)
+            if not (tasks and update_data):
+                return tasks
+            now = datetime.now()
+            version = self._next_version(conn, user_id)
+            for task in tasks:
+                apply_task_update(task, update_data, now)
+                task.version = version
+            conn.executemany(
+                UPDATE_TASK,
+                [(*self._task_values(task), version, task.id) for task in tasks],
+            )
+            task_ids = [task.id for task in tasks]
+            self._record_changes(conn, user_id, task_ids, version)
+        self._notify_changes(user_id, TaskEventType.UPDATED, version, task_ids, tasks)
+        return tasks
+
+    def delete_task(self, task_id: int, user_id: int) -> bool:
+        """Supprimer une tâche."""
+        with self._db.transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM tasks WHERE id = ? AND user_id = ?", (task_id, user_id)
+            )
+            if cursor.rowcount == 0:
+                return False
+            version = self._next_version(conn, user_id)
+            self._record_changes(conn, user_id, [task_id], version)
+        self._notify_changes(user_id, TaskEventType.DELETED, version, [task_id])
+        return True
+
+    def delete_tasks(self, selection: BulkSelection, user_id: int) -> int:
+        """Supprimer un lot de tâches, en une requête."""
+        condition, params = self._selection_condition(selection, user_id)
+        with self._db.transaction() as conn:
+            deleted = sorted(
+                row[0]
+                for row in conn.execute(
+                    f"DELETE FROM tasks WHERE {condition} RETURNING id", params
+                )
+            )
+            if not deleted:
+                return 0
+            version = self._next_version(conn, user_id)
+            self._record_changes(conn, user_id, deleted, version)
+        self._notify_changes(user_id, TaskEventType.DELETED, version, deleted)
+        return len(deleted)
+
+    def delete_all_tasks(self, user_id: int) -> int:
+        """Supprimer toutes les tâches d'un utilisateur."""
+        with self._db.transaction() as conn:
+            deleted = sorted(
+                row[0]
+                for row in conn.execute(
+                    "DELETE FROM tasks WHERE user_id = ? RETURNING id", (user_id,)
+                )
+            )
+            if not deleted:
+                return 0
+            version = self._next_version(conn, user_id)
+            self._record_changes(conn, user_id, deleted, version)
+        self._notify_changes(user_id, TaskEventType.DELETED, version, deleted)
+        return len(deleted)
+
+    def stats(self) -> Dict[str, int]:
+        """Tailles du stockage (tâches, journaux, fichier de la base)."""
+        with self._db.connection() as conn:
+            tasks, users_with_tasks = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT user_id) FROM tasks"
+            ).fetchone()
+            (change_log_entries,) = conn.execute(
+                "SELECT COALESCE(SUM(entries), 0) FROM change_logs"
+            ).fetchone()
+            (page_count,) = conn.execute("PRAGMA page_count").fetchone()
+            (page_size,) = conn.execute("PRAGMA page_size").fetchone()
+        return {
+            "tasks": tasks,
+            "users_with_tasks": users_with_tasks,
+            "change_log_entries": change_log_entries,
+            "database_bytes": page_count * page_size,
+        }
+
+    def memory_usage(self, limit: int) -> TaskStoreMemory:
+        """Mémoire des tâches : aucune, elles sont sur disque.
+
+        La mémoire du processus se limite au cache de pages de chaque
+        connexion, borné et partagé par tous les utilisateurs.
+        """
+        with self._db.connection() as conn:
+            tasks, users = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT user_id) FROM tasks"
+            ).fetchone()
+        return TaskStoreMemory(
+            tasks=tasks,
+            users=users,
+            task_bytes=0,
+            index_bytes=0,
+            change_log_bytes=0,
+            total_bytes=0,
+            tenants=[],
+        )
+
+    def get_task_version(self, task_id: int, user_id: int) -> int | None:
+        """Version de la dernière modification d'une tâche (None si introuvable)."""
+        with self._db.connection() as conn:
+            row = conn.execute(
+                "SELECT version FROM tasks WHERE id = ? AND user_id = ?",
+                (task_id, user_id),
+            ).fetchone()
+        return None if row is None else int(row[0])
+
+    def get_collection_version(self, user_id: int) -> int:
+        """Version de la dernière modification des tâches d'un utilisateur."""
+        with self._db.connection() as conn:
+            row = conn.execute(
+                "SELECT version FROM change_logs WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        if row is None:
+            self._create_change_log(user_id)
+            return self.get_collection_version(user_id)
+        return int(row[0])
+
+    def get_collection_versions(self, user_ids: List[int]) -> Dict[int, int]:
+        """Versions des tâches de plusieurs utilisateurs, en une requête.
+
+        Les utilisateurs dont les tâches n'ont jamais été lues ni modifiées
+        (sans journal des modifications) sont absents.
+        """
+        with self._db.connection() as conn:
+            rows = conn.execute(
+                "SELECT user_id, version FROM change_logs "
+                "WHERE user_id IN (SELECT value FROM json_each(?))",
+                (json.dumps(user_ids),),
+            ).fetchall()
+        return {user_id: version for user_id, version in rows}
+
+    def get_changes(self, user_id: int, since: int | None) -> TaskChanges:
+        """Récupérer les modifications des tâches d'un utilisateur depuis ``since``.
+
+        Même sémantique que ``TaskStore.get_changes``.
+        """
+        with self._db.snapshot() as conn:
+            row = conn.execute(
+                "SELECT version, floor FROM change_logs WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            if row is not None:
+                version, floor = row
+                if since is None or not floor <= since <= version:
+                    return TaskChanges(version=version, resync=True)
+                rows = conn.execute(SELECT_CHANGES, (user_id, since)).fetchall()
+        if row is None:
+            self._create_change_log(user_id)
+            return self.get_changes(user_id, since)
+        tasks: List[Task] = []
+        deleted: List[int] = []
+        for row in rows:
+            if row["id"] is None:
+                deleted.append(row["changed_id"])
+            else:
+                tasks.append(self._row_to_task(row))
+        return TaskChanges(version=version, tasks=tasks, deleted=deleted)
+
+    def _create_change_log(self, user_id: int) -> None:
+        """Créer le journal d'un utilisateur, à son premier accès.
+
+        La version renvoyée reste ainsi valable jusqu'aux modifications
+        suivantes.
+        """
+        start = initial_version()
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO change_logs "
+                "(user_id, version, floor, entries) VALUES (?, ?, ?, 0)",
+                (user_id, start, start),
+            )
+
+    @staticmethod
+    def _next_version(conn: sqlite3.Connection, user_id: int) -> int:
+        """Incrémenter la version d'un utilisateur ; retourner la nouvelle."""
+        start = initial_version()
+        (version,) = conn.execute(NEXT_VERSION, (user_id, start + 1, start)).fetchone()
+        return int(version)
+
+    def _record_changes(
+        self, conn: sqlite3.Connection, user_id: int, task_ids: List[int], version: int
+    ) -> None:
+        """Enregistrer dans le journal une mutation de version ``version``.
+
+        Le nombre d'entrées du journal est tenu à jour plutôt que recompté :
+        seules les entrées en excès sont parcourues pour être oubliées.
+        """
+        ids = json.dumps(task_ids)
+        (existing,) = conn.execute(
+            "SELECT COUNT(*) FROM task_changes WHERE user_id = ? "
+            "AND task_id IN (SELECT value FROM json_each(?))",
+            (user_id, ids),
+        ).fetchone()
+        conn.execute(UPSERT_CHANGES, (user_id, version, ids))
+        (entries,) = conn.execute(
+            "UPDATE change_logs SET entries = entries + ? WHERE user_id = ? "
+            "RETURNING entries",
+            (len(task_ids) - existing, user_id),
+        ).fetchone()
+        excess = entries - self._change_log_size
+        if excess > 0:
+            (floor,) = conn.execute(
+                "SELECT MAX(version) FROM (SELECT version FROM task_changes "
+                "WHERE user_id = ? ORDER BY version LIMIT ?)",
+                (user_id, excess),
+            ).fetchone()
+            conn.execute(
+                "DELETE FROM task_changes WHERE user_id = ? AND task_id IN ("
+                "SELECT task_id FROM task_changes WHERE user_id = ? "
+                "ORDER BY version LIMIT ?)",
+                (user_id, user_id, excess),
+            )
+            conn.execute(
+                "UPDATE change_logs SET floor = ?, entries = ? WHERE user_id = ?",
+                (floor, entries - excess, user_id),
+            )
+
+
+class SQLiteUserStore:
+    """Stockage SQLite pour les utilisateurs."""
+
+    def __init__(self, database: SQLiteDatabase):
+        self._db = database
+        self._invalidation_listeners: List[Callable[[int | None], None]] = []
+
+    def add_invalidation_listener(self, listener: Callable[[int | None], None]) -> None:
+        """Enregistrer une fonction à appeler lors de l'invalidation d'un utilisateur."""
+        self._invalidation_listeners.append(listener)
+
+    def _notify_invalidation(self, user_id: int | None) -> None:
+        for listener in self._invalidation_listeners:
+            listener(user_id)
+
+    def clear(self) -> None:
+        """Vider le stockage."""
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM users")
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = 'users'")
+            conn.execute(BUMP_INVALIDATIONS)
+        self._notify_invalidation(None)
+
+    @staticmethod
+    def _row_to_user(row: sqlite3.Row) -> UserInDB:
+        return UserInDB(
+            id=row["id"],
+            username=row["username"],
+            email=row["email"],
+            full_name=row["full_name"],
+            is_active=bool(row["is_active"]),
+            created_at=_from_text_required(row["created_at"]),
+            hashed_password=row["hashed_password"],
+        )
+
+    @staticmethod
+    def _public_user(user_in_db: UserInDB) -> User:
+        return User(
+            id=user_in_db.id,
+            username=user_in_db.username,
+            email=user_in_db.email,
+            full_name=user_in_db.full_name,
+            is_active=user_in_db.is_active,
+            created_at=user_in_db.created_at,
+        )
+
+    def _get_user(self, column: str, value: Any) -> UserInDB | None:
+        with self._db.connection() as conn:
+            row = conn.execute(
+                f"SELECT {USER_COLUMNS} FROM users WHERE {column} = ?", (value,)
+            ).fetchone()
+        return self._row_to_user(row) if row is not None else None
+
+    def create_user(
+        self, user_data: UserCreate, hashed_password: str | None = None
+    ) -> User:
+        """Créer un nouvel utilisateur."""
+        if hashed_password is None:
+            hashed_password = get_password_hash(user_data.password)
+        now = datetime.now()
+
+        with self._db.transaction() as conn:
+            existing = conn.execute(
+                "SELECT username FROM users WHERE username = ? OR email = ?",
+                (user_data.username, user_data.email),
+            ).fetchone()
+            if existing is not None:
+                if existing["username"] == user_data.username:
+                    raise ValueError(
+                        "Un utilisateur avec ce nom d'utilisateur existe déjà"
+                    )
+                raise ValueError("Un utilisateur avec cet email existe déjà")
+
+            cursor = conn.execute(
+                "INSERT INTO users (username, email, full_name, is_active, "
+                "created_at, hashed_password) VALUES (?, ?, ?, 1, ?, ?)",
+                (
+                    user_data.username,
+                    user_data.email,
+                    user_data.full_name,
+                    _to_text(now),
+                    hashed_password,
+                ),
+            )
+
+        return User(
+            id=cursor.lastrowid or 0,
+            username=user_data.username,
+            email=user_data.email,
+            full_name=user_data.full_name,
+            is_active=True,
+            created_at=now,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Nombre d'utilisateurs, et d'utilisateurs actifs."""
+        with self._db.connection() as conn:
+            users, active_users = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(is_active), 0) FROM users"
+            ).fetchone()
+        return {"users": users, "active_users": active_users}
+
+    def invalidation_generation(self) -> int:
+        """Nombre d'invalidations d'utilisateurs (désactivation, vidage), par
+        tous les processus utilisant la base."""
+        with self._db.connection() as conn:
+            (generation,) = conn.execute(
+                "SELECT generation FROM user_invalidations"
+            ).fetchone()
+        return int(generation)
+
+    def memory_usage(self) -> UserStoreMemory:
+        """Mémoire des utilisateurs : aucune, ils sont sur disque."""
+        with self._db.connection() as conn:
+            (users,) = conn.execute("SELECT COUNT(*) FROM users").fetchone()
+        return UserStoreMemory(users=users, user_bytes=0, index_bytes=0, total_bytes=0)
+
+    def get_user_by_username(self, username: str) -> UserInDB | None:
+        """Récupérer un utilisateur par son nom d'utilisateur."""
+        return self._get_user("username", username)
+
+    def get_user_by_email(self, email: str) -> UserInDB | None:
+        """Récupérer un utilisateur par son email."""
+        return self._get_user("email", email)
+
+    def get_user_by_id(self, user_id: int) -> User | None:
+        """Récupérer un utilisateur par son ID."""
+        user_in_db = self._get_user("id", user_id)
+        return self._public_user(user_in_db) if user_in_db is not None else None
+
+    def deactivate_user(self, user_id: int) -> bool:
+        """Désactiver un utilisateur."""
+        with self._db.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE users SET is_active = 0 WHERE id = ?", (user_id,)
+            )
+            if cursor.rowcount:
+                conn.execute(BUMP_INVALIDATIONS)
+        if cursor.rowcount == 0:
+            return False
+        self._notify_invalidation(user_id)
+        return True
+
+    def authenticate_user(self, username: str, password: str) -> UserInDB | None:
+        """Authentifier un utilisateur."""
+        user = self.get_user_by_username(username)
+        if not user:
+            return None
+        if not verify_password(password, user.hashed_password):
+            return None
+        if not user.is_active:
+            return None
+        return user
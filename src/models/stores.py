@@ -0,0 +1,86 @@
+"""Instances de stockage utilisées par l'API, selon la configuration."""
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+from src.config import (
+    JOURNAL_DIR,
+    JOURNAL_SEGMENT_MB,
+    SHARED_MMAP_MB,
+    SHARED_PATH,
+    SQLITE_PATH,
+    SQLITE_POOL_SIZE,
+    STORAGE_BACKEND,
+)
+from src.models.durable_store import JournaledTaskStore, JournaledUserStore
+from src.models.journal import Journal
+from src.models.memory_store import task_store as memory_task_store
+from src.models.repositories import (
+    InMemoryTaskRepository,
+    InMemoryUserRepository,
+    JournaledTaskRepository,
+    JournaledUserRepository,
+    TaskRepository,
+    TaskStoreProtocol,
+    ThreadPoolTaskRepository,
+    ThreadPoolUserRepository,
+    UserRepository,
+    UserStoreProtocol,
+)
+from src.models.sqlite_store import SQLiteDatabase, SQLiteTaskStore, SQLiteUserStore
+from src.models.user_store import user_store as memory_user_store
+
+STORAGE_BACKENDS = ("memory", "sqlite", "shared")
+
+
+def create_stores(backend: str) -> Tuple[TaskStoreProtocol, UserStoreProtocol]:
+    """Créer (ou retourner) les stores de tâches et d'utilisateurs du backend."""
+    if backend == "memory" and JOURNAL_DIR:
+        journal = Journal(JOURNAL_DIR, JOURNAL_SEGMENT_MB * 1024 * 1024)
+        state = journal.recover()
+        stores = JournaledTaskStore(journal, state), JournaledUserStore(journal, state)
+        journal.start()
+        atexit.register(journal.close)
+        return stores
+    if backend == "memory":
+        return memory_task_store, memory_user_store
+    if backend == "sqlite":
+        database = SQLiteDatabase(SQLITE_PATH, SQLITE_POOL_SIZE)
+        return SQLiteTaskStore(database), SQLiteUserStore(database)
+    if backend == "shared":
+        # Base en mémoire partagée : les workers d'une même machine servent
+        # les mêmes données ; les lectures (WAL) ne bloquent pas les
+        # écritures, sérialisées par un verrou de courte durée
+        database = SQLiteDatabase(
+            SHARED_PATH, SQLITE_POOL_SIZE, mmap_size=SHARED_MMAP_MB * 1024 * 1024
+        )
+        return SQLiteTaskStore(database), SQLiteUserStore(database)
+    raise ValueError(
+        f"Backend de stockage inconnu : {backend!r} "
+        f"(valeurs possibles : {', '.join(STORAGE_BACKENDS)})"
+    )
+
+
+def create_repositories(
+    backend: str, task_store: TaskStoreProtocol, user_store: UserStoreProtocol
+) -> Tuple[TaskRepository, UserRepository]:
+    """Envelopper les stores dans les ports asynchrones adaptés au backend."""
+    if isinstance(task_store, JournaledTaskStore) and isinstance(
+        user_store, JournaledUserStore
+    ):
+        return JournaledTaskRepository(task_store), JournaledUserRepository(user_store)
+    if backend == "memory":
+        return InMemoryTaskRepository(task_store), InMemoryUserRepository(user_store)
+    # Un thread par connexion du pool : les requêtes ne font jamais la queue
+    # pour une connexion en bloquant un thread.
+    executor = ThreadPoolExecutor(SQLITE_POOL_SIZE, thread_name_prefix="storage")
+    return (
+        ThreadPoolTaskRepository(task_store, executor),
+        ThreadPoolUserRepository(user_store, executor),
+    )
+
+
+task_store, user_store = create_stores(STORAGE_BACKEND)
+task_repository, user_repository = create_repositories(
+    STORAGE_BACKEND, task_store, user_store
+)
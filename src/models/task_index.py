@@ -0,0 +1,251 @@
+"""Index secondaires des tâches d'un utilisateur."""
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Set, Tuple
+
+from src.models.memory_usage import (
+    LIST_ENTRY_BYTES,
+    SET_ENTRY_BYTES,
+    record_bytes,
+    sampled_bytes,
+)
+from src.models.sorting import SortSpec, key_task_id
+from src.models.task_record import TaskRecord
+from src.schemas.task import Priority, TaskFilter
+
+# Nombre maximal d'ordres de tri maintenus par utilisateur
+MAX_CACHED_SORTS = 4
+# Au-delà de ce nombre de tâches, une opération groupée reconstruit les
+# listes triées en une passe au lieu d'une insertion/suppression par tâche.
+BATCH_REBUILD_SIZE = 32
+
+
+def due_date_key(due_date: datetime) -> float:
+    """Clé de tri d'une échéance.
+
+    Les échéances naïves et avec fuseau horaire ne sont pas comparables entre
+    elles : on compare leurs timestamps (les dates naïves sont en heure locale).
+    """
+    return due_date.timestamp()
+
+
+class UserTaskIndex:
+    """Index des tâches d'un utilisateur.
+
+    - ``task_ids`` : IDs triés, dans l'ordre de création ;
+    - ``by_state`` : ensembles d'IDs par couple (état, priorité), réunis
+      pour filtrer sur l'un, l'autre ou les deux (une entrée par tâche) ;
+    - ``due_dates`` / ``due_ids`` : échéances (timestamps) et IDs des
+      tâches qui en ont, triés par (échéance, ID), pour les plages de
+      dates ; deux tableaux de nombres plutôt qu'une liste de couples ;
+    - les clés de tri des derniers ordres demandés (voir ``sorted_keys``).
+
+    Un filtre multi-critères intersecte ces index au lieu de parcourir les
+    tâches. ``task_bytes`` estime la mémoire des tâches indexées (voir
+    ``record_bytes``) ; il est tenu à jour à chaque indexation des champs.
+    """
+
+    def __init__(self) -> None:
+        self.task_ids: List[int] = []
+        self.by_state: Dict[Tuple[bool, Priority], Set[int]] = {}
+        self.due_dates = array("d")
+        self.due_ids = array("q")
+        self._sorted_keys: OrderedDict[SortSpec, List[Tuple[Any, ...]]] = (
+            OrderedDict()
+        )
+        self.task_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.task_ids)
+
+    def entries(self) -> int:
+        """Nombre total d'entrées des index, ordres de tri compris."""
+        return (
+            len(self.task_ids)
+            + sum(map(len, self.by_state.values()))
+            + len(self.due_ids)
+            + sum(map(len, self._sorted_keys.values()))
+        )
+
+    def index_bytes(self) -> int:
+        """Estimation de la mémoire des index, ordres de tri compris.
+
+        Calculée à partir du nombre d'entrées, sans parcourir les index ; la
+        taille des clés de tri est estimée sur quelques-unes d'entre elles.
+        """
+        size = len(self.task_ids) * LIST_ENTRY_BYTES
+        size += SET_ENTRY_BYTES * sum(map(len, self.by_state.values()))
+        size += len(self.due_ids) * (self.due_dates.itemsize + self.due_ids.itemsize)
+        for keys in self._sorted_keys.values():
+            size += len(keys) * LIST_ENTRY_BYTES + sampled_bytes(keys)
+        return size
+
+    def add(self, task: TaskRecord) -> None:
+        """Indexer une nouvelle tâche (d'ID supérieur à toutes les autres)."""
+        self.task_ids.append(task.id)
+        self.add_attributes(task)
+
+    def add_many(self, tasks: List[TaskRecord]) -> None:
+        """Indexer un lot de nouvelles tâches, d'IDs croissants."""
+        self.task_ids.extend(task.id for task in tasks)
+        self.add_attributes_many(tasks)
+
+    def remove(self, task: TaskRecord) -> None:
+        """Retirer une tâche de l'index."""
+        del self.task_ids[bisect_left(self.task_ids, task.id)]
+        self.discard_attributes(task)
+
+    def remove_many(self, tasks: List[TaskRecord]) -> None:
+        """Retirer un lot de tâches de l'index."""
+        if len(tasks) <= BATCH_REBUILD_SIZE:
+            for task in tasks:
+                self.remove(task)
+            return
+        removed = {task.id for task in tasks}
+        self.task_ids = [task_id for task_id in self.task_ids if task_id not in removed]
+        self.discard_attributes_many(tasks)
+
+    def add_attributes(self, task: TaskRecord) -> None:
+        """Indexer les champs filtrables et les clés de tri d'une tâche."""
+        self.task_bytes += record_bytes(task)
+        self.by_state.setdefault((task.completed, task.priority), set()).add(task.id)
+        if task.due_date is not None:
+            key = due_date_key(task.due_date)
+            position = self._due_position(key, task.id)
+            self.due_dates.insert(position, key)
+            self.due_ids.insert(position, task.id)
+        for spec, keys in self._sorted_keys.items():
+            insort(keys, spec.sort_key(task))
+
+    def discard_attributes(self, task: TaskRecord) -> None:
+        """Retirer les champs filtrables et les clés de tri d'une tâche.
+
+        Doit être appelé avant de modifier la tâche, avec ses anciennes
+        valeurs encore en place.
+        """
+        self.task_bytes -= record_bytes(task)
+        self.by_state[(task.completed, task.priority)].discard(task.id)
+        if task.due_date is not None:
+            position = self._due_position(due_date_key(task.due_date), task.id)
+            del self.due_dates[position]
+            del self.due_ids[position]
+        for spec, keys in self._sorted_keys.items():
+            del keys[bisect_left(keys, spec.sort_key(task))]
+
+    def add_attributes_many(self, tasks: List[TaskRecord]) -> None:
+        """Indexer les champs d'un lot de tâches.
+
+        Les listes triées sont complétées puis retriées une seule fois, au
+        lieu d'une insertion dichotomique par tâche.
+        """
+        if len(tasks) <= BATCH_REBUILD_SIZE:
+            for task in tasks:
+                self.add_attributes(task)
+            return
+        for task in tasks:
+            self.task_bytes += record_bytes(task)
+            self.by_state.setdefault((task.completed, task.priority), set()).add(
+                task.id
+            )
+        due = [
+            (due_date_key(task.due_date), task.id)
+            for task in tasks
+            if task.due_date is not None
+        ]
+        if due:
+            due.extend(zip(self.due_dates, self.due_ids))
+            self._set_due_entries(sorted(due))
+        for spec, keys in self._sorted_keys.items():
+            keys.extend(spec.sort_key(task) for task in tasks)
+            keys.sort()
+
+    def discard_attributes_many(self, tasks: List[TaskRecord]) -> None:
+        """Retirer les champs d'un lot de tâches, avant leur modification.
+
+        Les listes triées sont filtrées en une passe.
+        """
+        if len(tasks) <= BATCH_REBUILD_SIZE:
+            for task in tasks:
+                self.discard_attributes(task)
+            return
+        discarded = {task.id for task in tasks}
+        for task in tasks:
+            self.task_bytes -= record_bytes(task)
+            self.by_state[(task.completed, task.priority)].discard(task.id)
+        self._set_due_entries(
+            [
+                entry
+                for entry in zip(self.due_dates, self.due_ids)
+                if entry[1] not in discarded
+            ]
+        )
+        for keys in self._sorted_keys.values():
+            keys[:] = [key for key in keys if key_task_id(key) not in discarded]
+
+    def _due_position(self, key: float, task_id: int) -> int:
+        """Position de (``key``, ``task_id``) dans les échéances triées."""
+        start = bisect_left(self.due_dates, key)
+        end = bisect_right(self.due_dates, key, start)
+        return bisect_left(self.due_ids, task_id, start, end)
+
+    def _set_due_entries(self, entries: List[Tuple[float, int]]) -> None:
+        """Remplacer les échéances par des couples (échéance, ID) triés."""
+        self.due_dates = array("d", [key for key, _ in entries])
+        self.due_ids = array("q", [task_id for _, task_id in entries])
+
+    def sorted_keys(
+        self, spec: SortSpec, tasks: Mapping[int, TaskRecord]
+    ) -> List[Tuple[Any, ...]]:
+        """Clés de tri triées des tâches de l'utilisateur pour un ordre donné.
+
+        Le tri est calculé à la première demande, puis maintenu à chaque
+        écriture ; seuls les ``MAX_CACHED_SORTS`` derniers ordres utilisés
+        sont conservés.
+        """
+        keys = self._sorted_keys.get(spec)
+        if keys is not None:
+            self._sorted_keys.move_to_end(spec)
+            return keys
+
+        keys = sorted(spec.sort_key(tasks[task_id]) for task_id in self.task_ids)
+        self._sorted_keys[spec] = keys
+        if len(self._sorted_keys) > MAX_CACHED_SORTS:
+            self._sorted_keys.popitem(last=False)
+        return keys
+
+    def matching_ids(self, filters: TaskFilter) -> Set[int]:
+        """Calculer l'ensemble des IDs satisfaisant tous les critères."""
+        # Ensembles construits ici : le résultat est l'un d'eux, sans copie
+        candidates: List[Set[int]] = []
+
+        if filters.completed is not None or filters.priority:
+            buckets = [
+                task_ids
+                for (completed, priority), task_ids in self.by_state.items()
+                if filters.completed in (None, completed)
+                and (not filters.priority or priority in filters.priority)
+            ]
+            candidates.append(set(buckets[0]).union(*buckets[1:]) if buckets else set())
+
+        if filters.due_after is not None or filters.due_before is not None:
+            start = 0
+            end = len(self.due_dates)
+            if filters.due_after is not None:
+                start = bisect_left(self.due_dates, due_date_key(filters.due_after))
+            if filters.due_before is not None:
+                end = bisect_left(self.due_dates, due_date_key(filters.due_before))
+            candidates.append(set(self.due_ids[start:end]))
+
+        if not candidates:
+            return set(self.task_ids)
+
+        # Intersecter en partant du plus petit ensemble
+        candidates.sort(key=len)
+        result = candidates[0]
+        for other in candidates[1:]:
+            result.intersection_update(other)
+            if not result:
+                break
+        return result
@@ -0,0 +1,136 @@
+"""Représentation interne compacte des tâches du stockage en mémoire."""
+from datetime import datetime
+from typing import Any, Dict, Set, Type, TypeVar
+
+from pydantic import BaseModel
+
+from src.schemas.task import Priority, Task, TaskCreate
+
+M = TypeVar("M", bound=BaseModel)
+
+_TASK_FIELDS = set(Task.model_fields)
+
+# Appels directs, sans la résolution d'attributs de model.__new__ (chemin critique)
+_new = object.__new__
+_setattr = object.__setattr__
+
+
+def construct(model: Type[M], values: Dict[str, Any], fields_set: Set[str]) -> M:
+    """Construire un modèle sans validation, comme ``model_construct``.
+
+    ``model_construct`` coûte trois fois plus cher (il complète les valeurs
+    par défaut et trie les champs), pour chaque tâche renvoyée. Les
+    attributs d'instance écrits ici sont ceux de pydantic 2.11, version
+    fixée dans ``pyproject.toml`` ; ``test_construct_matches_model_construct``
+    vérifie qu'ils sont toujours les seuls. Chaque instance reçoit sa copie
+    de ``fields_set``.
+    """
+    instance = _new(model)
+    _setattr(instance, "__dict__", values)
+    _setattr(instance, "__pydantic_fields_set__", fields_set.copy())
+    _setattr(instance, "__pydantic_extra__", None)
+    _setattr(instance, "__pydantic_private__", None)
+    return instance
+
+
+class TaskRecord:
+    """Tâche telle que conservée par ``TaskStore``.
+
+    Un modèle ``Task`` porte, par instance, un dictionnaire d'attributs et
+    l'ensemble des champs renseignés (un kilo-octet à eux deux) ; un
+    enregistrement à ``__slots__`` n'a que ses champs. Ses attributs sont ceux
+    de ``Task`` : index, tris et mises à jour s'appliquent indifféremment à
+    l'un ou à l'autre. Les tâches sont converties en ``Task`` (``to_task``)
+    à la sortie du stockage.
+
+    ``version`` est la version (voir ``ChangeLog``) de la dernière
+    modification de la tâche : elle change à chaque modification.
+    """
+
+    __slots__ = (
+        "id",
+        "user_id",
+        "title",
+        "description",
+        "completed",
+        "due_date",
+        "priority",
+        "created_at",
+        "completed_at",
+        "version",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        user_id: int,
+        title: str,
+        description: str | None,
+        completed: bool,
+        due_date: datetime | None,
+        priority: Priority,
+        created_at: datetime,
+        completed_at: datetime | None,
+        version: int = 0,
+    ):
+        self.id = id
+        self.user_id = user_id
+        self.title = title
+        self.description = description
+        self.completed = completed
+        self.due_date = due_date
+        self.priority = priority
+        self.created_at = created_at
+        self.completed_at = completed_at
+        self.version = version
+
+    @classmethod
+    def create(
+        cls, task_data: TaskCreate, task_id: int, user_id: int, now: datetime
+    ) -> "TaskRecord":
+        """Enregistrement d'une nouvelle tâche, créée à ``now``."""
+        return cls(
+            task_id,
+            user_id,
+            task_data.title,
+            task_data.description,
+            task_data.completed,
+            task_data.due_date,
+            task_data.priority,
+            now,
+            now if task_data.completed else None,
+        )
+
+    def copy(self) -> "TaskRecord":
+        """Copie de l'enregistrement, à modifier sans toucher l'original."""
+        return TaskRecord(
+            self.id,
+            self.user_id,
+            self.title,
+            self.description,
+            self.completed,
+            self.due_date,
+            self.priority,
+            self.created_at,
+            self.completed_at,
+            self.version,
+        )
+
+    def to_task(self) -> Task:
+        """Convertir en modèle ``Task`` (sans revalidation)."""
+        return construct(
+            Task,
+            {
+                "title": self.title,
+                "description": self.description,
+                "completed": self.completed,
+                "due_date": self.due_date,
+                "priority": self.priority,
+                "id": self.id,
+                "user_id": self.user_id,
+                "created_at": self.created_at,
+                "completed_at": self.completed_at,
+                "version": self.version,
+            },
+            _TASK_FIELDS,
+        )
@@ -0,0 +1,45 @@
+"""Règles communes de mise à jour des tâches, partagées par les stockages."""
+from datetime import datetime
+from typing import Any, Dict
+
+from src.models.task_record import TaskRecord
+from src.schemas.task import Task
+
+
+class VersionConflictError(ValueError):
+    """Tâche modifiée depuis la version attendue par une mise à jour."""
+
+    def __init__(self, version: int):
+        super().__init__(f"La tâche a été modifiée (version {version})")
+        self.version = version
+
+
+def check_version(task: Task | TaskRecord, expected_version: int | None) -> None:
+    """Vérifier qu'une tâche est à la version attendue (si elle l'est).
+
+    Lève ``VersionConflictError``, portant la version actuelle, sinon.
+    """
+    if expected_version is not None and task.version != expected_version:
+        raise VersionConflictError(task.version)
+
+
+def apply_task_update(
+    task: Task | TaskRecord, update_data: Dict[str, Any], now: datetime | None = None
+) -> None:
+    """Appliquer des champs mis à jour à une tâche, en place.
+
+    ``now`` permet de dater toutes les tâches d'une mise à jour groupée de la
+    même heure de complétion.
+    """
+    # Gérer le completed_at quand completed change
+    if "completed" in update_data:
+        if update_data["completed"] and not task.completed:
+            # Marquer comme complété
+            task.completed_at = now or datetime.now()
+        elif not update_data["completed"] and task.completed:
+            # Marquer comme non complété
+            task.completed_at = None
+
+    # Appliquer les autres mises à jour
+    for field, value in update_data.items():
+        setattr(task, field, value)
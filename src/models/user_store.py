@@ -1,22 +1,56 @@
 """Stockage en mémoire pour les utilisateurs."""
+import sys
 from datetime import datetime
-from typing import Dict
+from typing import Callable, Dict, List
 
 from src.auth.security import get_password_hash, verify_password
+from src.models.memory_usage import user_bytes
+from src.schemas.admin import UserStoreMemory
 from src.schemas.user import User, UserCreate, UserInDB
 
 
 class UserStore:
     """Stockage simple en mémoire pour les utilisateurs."""
 
-    def __init__(self):
+    def __init__(self) -> None:
         self._users: Dict[int, UserInDB] = {}
         self._users_by_username: Dict[str, UserInDB] = {}
         self._users_by_email: Dict[str, UserInDB] = {}
         self._next_id = 1
+        # Estimation de la mémoire des utilisateurs (voir ``user_bytes``)
+        self._user_bytes = 0
+        # Nombre d'invalidations (voir ``invalidation_generation``)
+        self._invalidations = 0
+        # Fonctions appelées quand les données d'un utilisateur (ou de tous,
+        # avec None) ne doivent plus être servies depuis un cache
+        self._invalidation_listeners: List[Callable[[int | None], None]] = []
+
+    def add_invalidation_listener(self, listener: Callable[[int | None], None]) -> None:
+        """Enregistrer une fonction à appeler lors de l'invalidation d'un utilisateur."""
+        self._invalidation_listeners.append(listener)
+
+    def _notify_invalidation(self, user_id: int | None) -> None:
+        self._invalidations += 1
+        for listener in self._invalidation_listeners:
+            listener(user_id)
+
+    def clear(self) -> None:
+        """Vider le stockage."""
+        self._users = {}
+        self._users_by_username = {}
+        self._users_by_email = {}
+        self._next_id = 1
+        self._user_bytes = 0
+        self._notify_invalidation(None)
+
+    def create_user(
+        self, user_data: UserCreate, hashed_password: str | None = None
+    ) -> User:
+        """Créer un nouvel utilisateur.
 
-    def create_user(self, user_data: UserCreate) -> User:
-        """Créer un nouvel utilisateur."""
+        Le hash du mot de passe peut être fourni s'il a déjà été calculé
+        (hors de la boucle d'événements) ; sinon il est calculé ici.
+        """
         # Vérifier que l'utilisateur n'existe pas déjà
         if user_data.username in self._users_by_username:
             raise ValueError("Un utilisateur avec ce nom d'utilisateur existe déjà")
@@ -26,7 +60,8 @@ class UserStore:
 
         # Créer l'utilisateur
         now = datetime.now()
-        hashed_password = get_password_hash(user_data.password)
+        if hashed_password is None:
+            hashed_password = get_password_hash(user_data.password)
 
         user_in_db = UserInDB(
             id=self._next_id,
@@ -39,10 +74,9 @@ class UserStore:
         )
 
         # Stocker l'utilisateur
-        self._users[self._next_id] = user_in_db
-        self._users_by_username[user_data.username] = user_in_db
-        self._users_by_email[user_data.email] = user_in_db
+        self._add_user(user_in_db)
         self._next_id += 1
+        self._user_written(user_in_db)
 
         # Retourner l'utilisateur sans le mot de passe
         return User(
@@ -54,6 +88,42 @@ class UserStore:
             created_at=user_in_db.created_at,
         )
 
+    def _add_user(self, user_in_db: UserInDB) -> None:
+        """Ajouter un utilisateur aux trois dictionnaires."""
+        self._users[user_in_db.id] = user_in_db
+        self._users_by_username[user_in_db.username] = user_in_db
+        self._users_by_email[user_in_db.email] = user_in_db
+        self._user_bytes += user_bytes(user_in_db)
+
+    def stats(self) -> Dict[str, int]:
+        """Nombre d'utilisateurs, et d'utilisateurs actifs."""
+        return {
+            "users": len(self._users),
+            "active_users": sum(user.is_active for user in self._users.values()),
+        }
+
+    def invalidation_generation(self) -> int:
+        """Nombre d'invalidations d'utilisateurs (désactivation, vidage)."""
+        return self._invalidations
+
+    def memory_usage(self) -> UserStoreMemory:
+        """Estimation de la mémoire des utilisateurs et de leurs dictionnaires.
+
+        Le coût des utilisateurs est tenu à jour à leur ajout ; celui des
+        dictionnaires est la taille de leurs tables.
+        """
+        index_bytes = (
+            sys.getsizeof(self._users)
+            + sys.getsizeof(self._users_by_username)
+            + sys.getsizeof(self._users_by_email)
+        )
+        return UserStoreMemory(
+            users=len(self._users),
+            user_bytes=self._user_bytes,
+            index_bytes=index_bytes,
+            total_bytes=self._user_bytes + index_bytes,
+        )
+
     def get_user_by_username(self, username: str) -> UserInDB | None:
         """Récupérer un utilisateur par son nom d'utilisateur."""
         return self._users_by_username.get(username)
@@ -77,6 +147,23 @@ class UserStore:
             created_at=user_in_db.created_at,
         )
 
+    def deactivate_user(self, user_id: int) -> bool:
+        """Désactiver un utilisateur."""
+        user_in_db = self._users.get(user_id)
+        if not user_in_db:
+            return False
+
+        user_in_db.is_active = False
+        self._user_written(user_in_db)
+        self._notify_invalidation(user_id)
+        return True
+
+    def _user_written(self, user_in_db: UserInDB) -> None:
+        """Appelé après la création ou la modification d'un utilisateur.
+
+        Point d'extension du stockage durable (voir ``JournaledUserStore``).
+        """
+
     def authenticate_user(self, username: str, password: str) -> UserInDB | None:
         """Authentifier un utilisateur."""
         user = self.get_user_by_username(username)
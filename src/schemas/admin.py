@@ -0,0 +1,67 @@
+"""Schémas Pydantic des endpoints d'administration."""
+from typing import List
+
+from pydantic import BaseModel
+
+
+class AllocationStat(BaseModel):
+    """Mémoire allouée par une ligne de code pendant un profilage."""
+
+    file: str
+    line: int
+    # Octets et blocs alloués pendant le profilage, encore en mémoire à la fin
+    size_bytes: int
+    count: int
+
+
+class AllocationProfile(BaseModel):
+    """Résultat d'un profilage des allocations (tracemalloc)."""
+
+    seconds: float
+    # Mémoire tracée à la fin du profilage et son maximum pendant celui-ci
+    traced_bytes: int
+    peak_bytes: int
+    allocations: List[AllocationStat]
+
+
+class TenantMemory(BaseModel):
+    """Mémoire estimée des tâches d'un utilisateur, en octets."""
+
+    user_id: int
+    tasks: int
+    task_bytes: int
+    index_bytes: int
+    change_log_bytes: int
+    total_bytes: int
+
+
+class TaskStoreMemory(BaseModel):
+    """Mémoire estimée du stockage des tâches, en octets."""
+
+    tasks: int
+    users: int
+    task_bytes: int
+    index_bytes: int
+    change_log_bytes: int
+    total_bytes: int
+    # Utilisateurs occupant le plus de mémoire, les plus lourds d'abord
+    tenants: List[TenantMemory]
+
+
+class UserStoreMemory(BaseModel):
+    """Mémoire estimée du stockage des utilisateurs, en octets."""
+
+    users: int
+    user_bytes: int
+    # Tables des dictionnaires par ID, nom d'utilisateur et email
+    index_bytes: int
+    total_bytes: int
+
+
+class MemoryUsage(BaseModel):
+    """Mémoire estimée des stockages et des caches, en octets."""
+
+    task_store: TaskStoreMemory
+    user_store: UserStoreMemory
+    token_cache_bytes: int
+    total_bytes: int
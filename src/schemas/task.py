@@ -1,8 +1,9 @@
 """Schémas Pydantic pour les tâches."""
 from datetime import datetime
 from enum import Enum
+from typing import Any, Dict, List
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
 
 
 class Priority(str, Enum):
@@ -31,8 +32,21 @@ class TaskCreate(TaskBase):
     pass
 
 
+class BulkMode(str, Enum):
+    """Comportement d'une opération groupée face aux éléments invalides."""
+
+    # Tout ou rien : un seul élément invalide fait échouer l'opération
+    ATOMIC = "atomic"
+    # Les éléments valides sont traités, les autres sont signalés
+    PARTIAL = "partial"
+
+
 class TaskUpdate(BaseModel):
-    """Schéma pour la mise à jour d'une tâche."""
+    """Schéma pour la mise à jour d'une tâche.
+
+    Un champ absent n'est pas modifié ; seuls ceux qu'une tâche peut ne pas
+    avoir (``description``, ``due_date``) acceptent ``null``.
+    """
 
     title: str | None = None
     description: str | None = None
@@ -40,6 +54,35 @@ class TaskUpdate(BaseModel):
     due_date: datetime | None = None
     priority: Priority | None = None
 
+    @model_validator(mode="after")
+    def check_required_fields(self) -> "TaskUpdate":
+        for field in ("title", "completed", "priority"):
+            if field in self.model_fields_set and getattr(self, field) is None:
+                raise ValueError(f"{field} ne peut pas être null")
+        return self
+
+
+class TaskFilter(BaseModel):
+    """Critères de filtrage de la liste des tâches.
+
+    ``due_after`` est inclusif et ``due_before`` exclusif ; les tâches sans
+    échéance sont exclues dès qu'une borne est donnée.
+    """
+
+    completed: bool | None = None
+    priority: List[Priority] | None = None
+    due_before: datetime | None = None
+    due_after: datetime | None = None
+
+    def is_empty(self) -> bool:
+        """Indiquer si aucun critère n'est renseigné."""
+        return (
+            self.completed is None
+            and not self.priority
+            and self.due_before is None
+            and self.due_after is None
+        )
+
 
 class Task(TaskBase):
     """Schéma complet d'une tâche."""
@@ -50,3 +93,99 @@ class Task(TaskBase):
     user_id: int
     created_at: datetime
     completed_at: datetime | None = None
+    # Version de la dernière modification : change à chaque modification
+    version: int = 0
+
+
+class BulkItemError(BaseModel):
+    """Erreur de validation d'un élément d'une opération groupée."""
+
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class BulkCreateResult(BaseModel):
+    """Résultat d'une création groupée de tâches."""
+
+    created: List[Task]
+    errors: List[BulkItemError] = []
+
+
+class BulkSelection(BaseModel):
+    """Sélection des tâches visées par une opération groupée.
+
+    ``ids`` et ``filter`` se combinent (intersection) ; au moins l'un des deux
+    est requis. Un filtre vide sélectionne toutes les tâches.
+    """
+
+    ids: List[int] | None = None
+    filter: TaskFilter | None = None
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "BulkSelection":
+        if self.ids is None and self.filter is None:
+            raise ValueError("ids ou filter doit être renseigné")
+        return self
+
+
+class BulkUpdateRequest(BulkSelection):
+    """Mise à jour groupée : une même modification pour plusieurs tâches."""
+
+    update: TaskUpdate
+
+
+class BulkUpdateResult(BaseModel):
+    """Résultat d'une mise à jour groupée."""
+
+    updated: int
+    tasks: List[Task] | None = None
+
+
+class BulkDeleteResult(BaseModel):
+    """Résultat d'une suppression groupée."""
+
+    deleted: int
+
+
+class TaskEventType(str, Enum):
+    """Nature d'une modification des tâches, diffusée en direct."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+class TaskChanges(BaseModel):
+    """Modifications des tâches d'un utilisateur depuis une version donnée.
+
+    ``tasks`` contient l'état actuel des tâches créées ou modifiées, et
+    ``deleted`` les IDs des tâches supprimées, par ordre de modification.
+    Si ``resync`` est vrai, les modifications ne sont plus connues depuis
+    cette version : les tâches sont à recharger en entier. ``version`` est
+    à repasser pour obtenir les modifications suivantes.
+    """
+
+    version: int
+    resync: bool = False
+    tasks: List[Task] = []
+    deleted: List[int] = []
+
+
+class ImportLineError(BaseModel):
+    """Ligne d'un import NDJSON rejetée (numérotée à partir de 1)."""
+
+    line: int
+    errors: List[Dict[str, Any]]
+
+
+class ImportProgress(BaseModel):
+    """Avancement d'un import NDJSON, envoyé après chaque lot enregistré.
+
+    ``done`` n'est vrai que pour le dernier enregistrement, une fois tout le
+    corps de la requête lu.
+    """
+
+    lines: int
+    imported: int
+    failed: int
+    done: bool = False
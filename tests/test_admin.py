@@ -0,0 +1,139 @@
+"""Tests pour les endpoints d'administration (profilage à la demande)."""
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.profiling import collapsed_stacks, sample_stacks
+from src.main import app
+from src.models.memory_store import task_store
+from src.models.user_store import user_store
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def reset_stores():
+    """Reset les stores avant chaque test."""
+    task_store.clear()
+    user_store.clear()
+
+
+def login(username: str) -> dict:
+    """Enregistrer et connecter un utilisateur ; en-têtes d'authentification."""
+    user = {
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": "password123",
+    }
+    client.post("/api/v1/auth/register", json=user)
+    response = client.post(
+        "/api/v1/auth/login", data={"username": username, "password": "password123"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    """Administrateur connecté."""
+    monkeypatch.setattr("src.api.auth.ADMIN_USERNAMES", frozenset({"admin"}))
+    return login("admin")
+
+
+def busy_loop(stop: threading.Event) -> None:
+    """Occuper un thread jusqu'à ``stop``."""
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sample_stacks_collapsed_format():
+    """Test que les piles d'un thread occupé sont échantillonnées."""
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+    thread.start()
+    try:
+        stacks = sample_stacks(0.2, 0.005)
+    finally:
+        stop.set()
+        thread.join()
+
+    lines = collapsed_stacks(stacks).splitlines()
+    busy = [line for line in lines if line.startswith("busy;")]
+    assert busy
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert stack.split(";")[-1] == "tests.test_admin:busy_loop"
+    counts = [int(line.rsplit(" ", 1)[1]) for line in lines]
+    assert counts == sorted(counts, reverse=True)
+
+
+def test_profile_requires_admin(monkeypatch):
+    """Test que le profilage est réservé aux administrateurs."""
+    monkeypatch.setattr("src.api.auth.ADMIN_USERNAMES", frozenset({"admin"}))
+    headers = login("user1")
+
+    assert client.get("/api/v1/admin/profile/cpu").status_code == 401
+    response = client.get("/api/v1/admin/profile/cpu", headers=headers)
+    assert response.status_code == 403
+    response = client.get("/api/v1/admin/profile/memory", headers=headers)
+    assert response.status_code == 403
+    assert client.get("/api/v1/admin/memory", headers=headers).status_code == 403
+
+
+def test_profile_cpu(admin_headers):
+    """Test du profil CPU renvoyé au format flamegraph."""
+    response = client.get(
+        "/api/v1/admin/profile/cpu",
+        params={"seconds": 0.1, "interval_ms": 5, "idle": True},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for line in response.text.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack
+        assert int(count) > 0
+
+    response = client.get(
+        "/api/v1/admin/profile/cpu", params={"seconds": 3600}, headers=admin_headers
+    )
+    assert response.status_code == 422
+
+
+def test_profile_memory(admin_headers):
+    """Test du profil des allocations (tracemalloc)."""
+    response = client.get(
+        "/api/v1/admin/profile/memory",
+        params={"seconds": 0.1, "limit": 5},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 200
+    profile = response.json()
+    assert profile["seconds"] == 0.1
+    assert profile["peak_bytes"] >= profile["traced_bytes"] > 0
+    assert len(profile["allocations"]) <= 5
+    for allocation in profile["allocations"]:
+        assert allocation["size_bytes"] > 0
+
+
+def test_memory_usage(admin_headers):
+    """Test de la mémoire estimée des stockages."""
+    client.post("/api/v1/tasks/", json={"title": "Task"}, headers=admin_headers)
+
+    response = client.get(
+        "/api/v1/admin/memory", params={"limit": 1}, headers=admin_headers
+    )
+
+    assert response.status_code == 200
+    usage = response.json()
+    assert usage["task_store"]["tasks"] == 1
+    assert usage["task_store"]["tenants"][0]["tasks"] == 1
+    assert usage["user_store"]["users"] == 1
+    assert usage["token_cache_bytes"] > 0
+    assert usage["total_bytes"] == (
+        usage["task_store"]["total_bytes"]
+        + usage["user_store"]["total_bytes"]
+        + usage["token_cache_bytes"]
+    )
@@ -2,6 +2,8 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from src.api.dependencies import get_user_repository
+from src.auth.hashing import password_hasher
 from src.main import app
 from src.models.user_store import user_store
 
@@ -11,10 +13,7 @@ client = TestClient(app)
 @pytest.fixture(autouse=True)
 def reset_user_store():
     """Reset le store utilisateur avant chaque test."""
-    user_store._users = {}
-    user_store._users_by_username = {}
-    user_store._users_by_email = {}
-    user_store._next_id = 1
+    user_store.clear()
 
 
 @pytest.fixture
@@ -222,3 +221,79 @@ def test_complete_auth_flow(sample_user_data):
     assert me_data["id"] == user_data["id"]
     assert me_data["username"] == user_data["username"]
     assert me_data["email"] == user_data["email"]
+
+
+def test_auth_returns_503_when_hashing_pool_saturated(sample_user_data, monkeypatch):
+    """Test du refus des authentifications quand le pool de hashage est saturé."""
+    client.post("/api/v1/auth/register", json=sample_user_data)
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+
+    other_user = {**sample_user_data, "username": "other", "email": "o@example.com"}
+    response = client.post("/api/v1/auth/register", json=other_user)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+    login_data = {
+        "username": sample_user_data["username"],
+        "password": sample_user_data["password"],
+    }
+    response = client.post("/api/v1/auth/login", data=login_data)
+    assert response.status_code == 503
+
+
+def test_deactivated_user_token_rejected(sample_user_data):
+    """Test qu'un token en cache n'est plus accepté après désactivation."""
+    client.post("/api/v1/auth/register", json=sample_user_data)
+    login_data = {
+        "username": sample_user_data["username"],
+        "password": sample_user_data["password"],
+    }
+    token = client.post("/api/v1/auth/login", data=login_data).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    user_store.deactivate_user(1)
+
+    response = client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
+
+
+class DeactivatedDuringLookup:
+    """Dépôt dont l'utilisateur est désactivé pendant sa recherche."""
+
+    def __init__(self, users):
+        self.users = users
+
+    async def get_user_by_username(self, username):
+        # État lu avant la désactivation (le stockage en mémoire le modifie)
+        user = (await self.users.get_user_by_username(username)).model_copy()
+        await self.users.deactivate_user(user.id)
+        return user
+
+
+def test_user_deactivated_during_lookup_is_not_cached(sample_user_data):
+    """Test qu'un utilisateur désactivé pendant sa résolution n'est pas mis
+    en cache avec son état précédent."""
+    client.post("/api/v1/auth/register", json=sample_user_data)
+    login_data = {
+        "username": sample_user_data["username"],
+        "password": sample_user_data["password"],
+    }
+    token = client.post("/api/v1/auth/login", data=login_data).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    users = get_user_repository()
+
+    app.dependency_overrides[get_user_repository] = lambda: DeactivatedDuringLookup(
+        users
+    )
+    try:
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    finally:
+        del app.dependency_overrides[get_user_repository]
+
+    response = client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
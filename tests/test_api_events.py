@@ -0,0 +1,144 @@
+"""Tests pour la diffusion en direct des modifications de tâches."""
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from src.api.events import TaskEventBroker, event_stream, task_events
+from src.main import app
+from src.models.memory_store import task_store
+from src.models.user_store import user_store
+from src.schemas.task import TaskChanges, TaskCreate, TaskEventType
+
+client = TestClient(app)
+
+
+def changes(version):
+    """Modification vide de version ``version``."""
+    return TaskChanges(version=version)
+
+
+def test_broker_drops_slow_subscribers():
+    """Test de la file bornée : l'abonné qui ne lit pas est désabonné."""
+
+    async def scenario():
+        broker = TaskEventBroker(max_pending=2, heartbeat=0)
+        fast = broker.subscribe(1)
+        slow = broker.subscribe(1)
+        other = broker.subscribe(2)
+        received = []
+        for version in range(1, 4):
+            broker.publish(1, TaskEventType.CREATED, changes(version))
+            received.append(await fast.next_frames())
+        return broker, fast, slow, other, received
+
+    broker, fast, slow, other, received = asyncio.run(scenario())
+
+    assert received[0] == (
+        b'id: 1\nevent: created\ndata: {"version":1,"resync":false,'
+        b'"tasks":[],"deleted":[]}\n\n'
+    )
+    assert len(received) == 3
+    assert slow.dropped and not fast.dropped
+    assert not other.frames
+    assert broker.stats() == {"subscribers": 2, "published": 3, "dropped": 1}
+
+
+def test_broker_publishes_from_other_threads():
+    """Test de la publication depuis un thread du pool (stockage SQLite)."""
+
+    async def scenario():
+        broker = TaskEventBroker(max_pending=10, heartbeat=0)
+        subscription = broker.subscribe(1)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, broker.publish, 1, TaskEventType.DELETED, changes(7)
+        )
+        return await asyncio.wait_for(subscription.next_frames(), 1)
+
+    assert asyncio.run(scenario()).startswith(b"id: 7\nevent: deleted\n")
+
+
+def test_event_stream_heartbeat_and_unsubscribe():
+    """Test des commentaires de maintien et du désabonnement en fin de flux."""
+
+    async def scenario():
+        broker = TaskEventBroker(max_pending=10, heartbeat=0.01)
+        subscription = broker.subscribe(1)
+        stream = event_stream(broker, subscription, changes(1))
+        frames = [await anext(stream), await anext(stream)]
+        broker.publish(1, TaskEventType.UPDATED, changes(2))
+        broker.publish(1, TaskEventType.DELETED, changes(3))
+        frames.append(await anext(stream))
+        await stream.aclose()
+        return broker, frames
+
+    broker, frames = asyncio.run(scenario())
+
+    assert frames[0].startswith(b"id: 1\nevent: changes\n")
+    assert frames[1] == b": ping\n\n"
+    assert frames[2].startswith(b"id: 2\nevent: updated\n")
+    assert b"id: 3\nevent: deleted\n" in frames[2]
+    assert broker.subscribers() == 0
+
+
+def test_stream_task_events_endpoint():
+    """Test du flux SSE de bout en bout, avec reprise depuis Last-Event-ID."""
+    task_store.clear()
+    user_store.clear()
+    credentials = {"username": "events", "password": "events-password"}
+    client.post(
+        "/api/v1/auth/register", json={**credentials, "email": "events@example.com"}
+    )
+    token = client.post("/api/v1/auth/login", data=credentials).json()["access_token"]
+    version = task_store.get_changes(1, None).version
+    task_store.create_task(TaskCreate(title="Missed"), 1)
+
+    async def scenario():
+        disconnected = asyncio.Event()
+        requested = False
+        chunks = []
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                chunks.append(message)
+            elif message["body"]:
+                chunks.append(message["body"])
+                if len(chunks) == 2:
+                    task_store.create_task(TaskCreate(title="Live"), 1)
+                if len(chunks) == 3:
+                    disconnected.set()
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/tasks/events",
+            "raw_path": b"/api/v1/tasks/events",
+            "query_string": b"",
+            "headers": [
+                (b"authorization", f"Bearer {token}".encode()),
+                (b"last-event-id", str(version).encode()),
+            ],
+            "server": ("test", 80),
+            "client": ("test", 1234),
+            "scheme": "http",
+        }
+        await asyncio.wait_for(app(scope, receive, send), 5)
+        return chunks
+
+    start, initial, live = asyncio.run(scenario())
+
+    assert start["status"] == 200
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+    assert initial.startswith(f"id: {version + 1}\nevent: changes\n".encode())
+    assert b'"title":"Missed"' in initial
+    assert live.startswith(f"id: {version + 2}\nevent: created\n".encode())
+    assert b'"title":"Live"' in live
+    assert task_events.subscribers() == 0
@@ -0,0 +1,35 @@
+"""Tests pour les réponses JSON des objets construits par l'application."""
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from src.api.responses import TrustedJSONResponse
+from src.models.task_record import TaskRecord
+from src.schemas.task import Task, TaskCreate
+
+
+def test_trusted_response_matches_default_serialization():
+    """Test que la réponse directe est celle que produirait FastAPI."""
+    tasks = [
+        TaskRecord.create(
+            TaskCreate(
+                title="Tâche ✓",
+                due_date=datetime(2030, 1, 1, 9, tzinfo=timezone.utc),
+            ),
+            1,
+            1,
+            datetime(2024, 1, 2, 3, 4, 5, 6),
+        ).to_task()
+    ]
+
+    response = TrustedJSONResponse(
+        tasks, TypeAdapter(List[Task]), status_code=201, headers={"X-Test": "1"}
+    )
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["x-test"] == "1"
+    assert response.body == JSONResponse(jsonable_encoder(tasks)).body
@@ -3,6 +3,7 @@
 Ce fichier se concentre sur les fonctionnalités CRUD des tâches.
 Pour les tests de sécurité et d'isolation, voir test_auth_tasks.py
 """
+import json
 from datetime import datetime, timedelta
 
 import pytest
@@ -10,6 +11,7 @@ from fastapi.testclient import TestClient
 
 from src.main import app
 from src.models.memory_store import task_store
+from src.models.pagination import encode_cursor
 from src.models.user_store import user_store
 
 client = TestClient(app)
@@ -18,12 +20,8 @@ client = TestClient(app)
 @pytest.fixture(autouse=True)
 def reset_stores():
     """Reset les stores avant chaque test."""
-    task_store._tasks = {}
-    task_store._next_id = 1
-    user_store._users = {}
-    user_store._users_by_username = {}
-    user_store._users_by_email = {}
-    user_store._next_id = 1
+    task_store.clear()
+    user_store.clear()
 
 
 @pytest.fixture
@@ -269,6 +267,27 @@ def test_update_task_not_found(auth_user):
     assert response.json()["detail"] == "Tâche non trouvée"
 
 
+def test_update_task_rejects_null_required_fields(auth_user):
+    """Test du rejet des titre, état et priorité mis à null."""
+    headers = auth_user["headers"]
+    task = client.post("/api/v1/tasks/", json={"title": "Task"}, headers=headers)
+    task_id = task.json()["id"]
+
+    for field in ("title", "completed", "priority"):
+        response = client.put(
+            f"/api/v1/tasks/{task_id}", json={field: None}, headers=headers
+        )
+        assert response.status_code == 422
+        response = client.patch(
+            "/api/v1/tasks/bulk",
+            json={"ids": [task_id], "update": {field: None}},
+            headers=headers,
+        )
+        assert response.status_code == 422
+    response = client.get(f"/api/v1/tasks/{task_id}", headers=headers)
+    assert response.json() == task.json()
+
+
 # Tests de suppression de tâches
 def test_delete_task_exists(auth_user):
     """Test de suppression d'une tâche existante."""
@@ -428,3 +447,520 @@ def test_invalid_token_access_denied():
         == 401
     )
     assert client.delete("/api/v1/tasks/1", headers=headers).status_code == 401
+
+
+# Tests de pagination
+def test_get_tasks_paginated(auth_user):
+    """Test de la pagination par curseur de la liste des tâches."""
+    for i in range(5):
+        client.post(
+            "/api/v1/tasks/", json={"title": f"Task {i}"}, headers=auth_user["headers"]
+        )
+
+    response = client.get("/api/v1/tasks/?limit=2", headers=auth_user["headers"])
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()] == ["Task 0", "Task 1"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get(
+        "/api/v1/tasks/",
+        params={"limit": 2, "cursor": cursor},
+        headers=auth_user["headers"],
+    )
+    assert [task["title"] for task in response.json()] == ["Task 2", "Task 3"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get(
+        "/api/v1/tasks/",
+        params={"limit": 2, "cursor": cursor},
+        headers=auth_user["headers"],
+    )
+    assert [task["title"] for task in response.json()] == ["Task 4"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_tasks_without_limit_has_no_cursor(auth_user):
+    """Test que la liste complète ne renvoie pas de curseur."""
+    client.post("/api/v1/tasks/", json={"title": "Task"}, headers=auth_user["headers"])
+
+    response = client.get("/api/v1/tasks/", headers=auth_user["headers"])
+
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_tasks_invalid_pagination(auth_user):
+    """Test des paramètres de pagination invalides."""
+    headers = auth_user["headers"]
+
+    assert client.get("/api/v1/tasks/?limit=0", headers=headers).status_code == 422
+    assert client.get("/api/v1/tasks/?limit=1001", headers=headers).status_code == 422
+    response = client.get("/api/v1/tasks/?cursor=garbage", headers=headers)
+    assert response.status_code == 400
+
+
+def test_get_tasks_cursor_without_id(auth_user):
+    """Test des curseurs dont l'ID de tâche est nul."""
+    headers = auth_user["headers"]
+    client.post("/api/v1/tasks/", json={"title": "Task"}, headers=headers)
+
+    for sort, key in ((None, [None]), ("due_date", [None, None])):
+        response = client.get(
+            "/api/v1/tasks/",
+            params={"sort": sort, "cursor": encode_cursor(key)},
+            headers=headers,
+        )
+        assert response.status_code == 400
+
+
+# Tests de filtrage
+def test_get_tasks_filtered(auth_user):
+    """Test du filtrage de la liste par statut, priorités et échéance."""
+    headers = auth_user["headers"]
+    now = datetime.now()
+    tasks = [
+        {
+            "title": "Open high",
+            "priority": "High",
+            "due_date": (now + timedelta(days=2)).isoformat(),
+        },
+        {
+            "title": "Open top later",
+            "priority": "Top",
+            "due_date": (now + timedelta(days=20)).isoformat(),
+        },
+        {"title": "Done top", "priority": "Top", "completed": True},
+        {
+            "title": "Open low",
+            "priority": "Low",
+            "due_date": (now + timedelta(days=1)).isoformat(),
+        },
+    ]
+    for task in tasks:
+        client.post("/api/v1/tasks/", json=task, headers=headers)
+
+    response = client.get(
+        "/api/v1/tasks/",
+        params={
+            "completed": "false",
+            "priority": ["High", "Top"],
+            "due_after": now.isoformat(),
+            "due_before": (now + timedelta(days=7)).isoformat(),
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()] == ["Open high"]
+
+    response = client.get(
+        "/api/v1/tasks/", params={"priority": "Top"}, headers=headers
+    )
+    assert [task["title"] for task in response.json()] == [
+        "Open top later",
+        "Done top",
+    ]
+
+    response = client.get(
+        "/api/v1/tasks/", params={"completed": "true"}, headers=headers
+    )
+    assert [task["title"] for task in response.json()] == ["Done top"]
+
+
+def test_get_tasks_invalid_priority_filter(auth_user):
+    """Test d'un filtre de priorité invalide."""
+    response = client.get(
+        "/api/v1/tasks/", params={"priority": "Urgent"}, headers=auth_user["headers"]
+    )
+    assert response.status_code == 422
+
+
+# Tests de tri
+def test_get_tasks_sorted(auth_user):
+    """Test du tri de la liste par priorité décroissante puis création."""
+    headers = auth_user["headers"]
+    for title, priority in [("A", "Low"), ("B", "Top"), ("C", "High"), ("D", "Top")]:
+        client.post(
+            "/api/v1/tasks/",
+            json={"title": title, "priority": priority},
+            headers=headers,
+        )
+
+    response = client.get(
+        "/api/v1/tasks/", params={"sort": "-priority,created_at"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()] == ["B", "D", "C", "A"]
+
+    response = client.get(
+        "/api/v1/tasks/", params={"sort": "-priority", "limit": 3}, headers=headers
+    )
+    assert [task["title"] for task in response.json()] == ["B", "D", "C"]
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get(
+        "/api/v1/tasks/",
+        params={"sort": "-priority", "limit": 3, "cursor": cursor},
+        headers=headers,
+    )
+    assert [task["title"] for task in response.json()] == ["A"]
+
+
+def test_get_tasks_invalid_sort(auth_user):
+    """Test d'un champ de tri inconnu."""
+    response = client.get(
+        "/api/v1/tasks/", params={"sort": "owner"}, headers=auth_user["headers"]
+    )
+    assert response.status_code == 400
+
+
+# Tests de création groupée
+def test_create_tasks_bulk(auth_user):
+    """Test de la création d'un lot de tâches."""
+    headers = auth_user["headers"]
+    items = [{"title": f"Task {i}", "priority": "High"} for i in range(3)]
+
+    response = client.post("/api/v1/tasks/bulk", json=items, headers=headers)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert [task["id"] for task in data["created"]] == [1, 2, 3]
+    assert data["errors"] == []
+    response = client.get("/api/v1/tasks/", headers=headers)
+    assert [task["title"] for task in response.json()] == [
+        "Task 0",
+        "Task 1",
+        "Task 2",
+    ]
+
+
+def test_create_tasks_bulk_atomic_rejects_all(auth_user):
+    """Test qu'un élément invalide fait refuser tout le lot en mode atomic."""
+    headers = auth_user["headers"]
+    items = [{"title": "Valid"}, {"priority": "High"}, {"title": "x", "priority": "?"}]
+
+    response = client.post("/api/v1/tasks/bulk", json=items, headers=headers)
+
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert [error["index"] for error in detail] == [1, 2]
+    assert detail[0]["errors"][0]["loc"] == ["title"]
+    assert detail[1]["errors"][0]["loc"] == ["priority"]
+    assert client.get("/api/v1/tasks/", headers=headers).json() == []
+
+
+def test_create_tasks_bulk_partial(auth_user):
+    """Test du mode partial : éléments valides créés, erreurs par index."""
+    headers = auth_user["headers"]
+    items = [{"title": "A"}, "not a task", {"title": "B"}]
+
+    response = client.post(
+        "/api/v1/tasks/bulk",
+        params={"mode": "partial"},
+        json=items,
+        headers=headers,
+    )
+
+    assert response.status_code == 207
+    data = response.json()
+    assert [task["title"] for task in data["created"]] == ["A", "B"]
+    assert [error["index"] for error in data["errors"]] == [1]
+
+
+def test_create_tasks_bulk_too_large(auth_user):
+    """Test du nombre maximal de tâches par lot."""
+    response = client.post(
+        "/api/v1/tasks/bulk",
+        json=[{"title": "Task"}] * 10001,
+        headers=auth_user["headers"],
+    )
+    assert response.status_code == 422
+
+
+# Tests de mise à jour et de suppression groupées
+def test_update_tasks_bulk(auth_user):
+    """Test de la complétion groupée des tâches par IDs."""
+    headers = auth_user["headers"]
+    client.post(
+        "/api/v1/tasks/bulk", json=[{"title": f"Task {i}"} for i in range(3)],
+        headers=headers,
+    )
+
+    response = client.patch(
+        "/api/v1/tasks/bulk",
+        json={"ids": [1, 3, 99], "update": {"completed": True}},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2, "tasks": None}
+    response = client.get(
+        "/api/v1/tasks/", params={"completed": True}, headers=headers
+    )
+    assert [task["id"] for task in response.json()] == [1, 3]
+    assert all(task["completed_at"] for task in response.json())
+
+
+def test_update_tasks_bulk_by_filter_returning_tasks(auth_user):
+    """Test de la mise à jour groupée par filtre, avec les tâches modifiées."""
+    headers = auth_user["headers"]
+    client.post(
+        "/api/v1/tasks/bulk",
+        json=[{"title": "A", "priority": "Low"}, {"title": "B", "priority": "High"}],
+        headers=headers,
+    )
+
+    response = client.patch(
+        "/api/v1/tasks/bulk",
+        params={"return_tasks": True},
+        json={"filter": {"priority": ["Low"]}, "update": {"priority": "Top"}},
+        headers=headers,
+    )
+
+    data = response.json()
+    assert data["updated"] == 1
+    assert [(task["title"], task["priority"]) for task in data["tasks"]] == [
+        ("A", "Top")
+    ]
+
+
+def test_update_tasks_bulk_requires_selection(auth_user):
+    """Test qu'une sélection (ids ou filter) est obligatoire."""
+    response = client.patch(
+        "/api/v1/tasks/bulk",
+        json={"update": {"completed": True}},
+        headers=auth_user["headers"],
+    )
+    assert response.status_code == 422
+
+
+def test_delete_tasks_bulk(auth_user):
+    """Test de la suppression des tâches terminées."""
+    headers = auth_user["headers"]
+    client.post(
+        "/api/v1/tasks/bulk",
+        json=[{"title": "Done", "completed": True}, {"title": "Todo"}],
+        headers=headers,
+    )
+
+    response = client.post(
+        "/api/v1/tasks/bulk/delete",
+        json={"filter": {"completed": True}},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"deleted": 1}
+    response = client.get("/api/v1/tasks/", headers=headers)
+    assert [task["title"] for task in response.json()] == ["Todo"]
+
+
+def test_export_tasks_ndjson(auth_user, monkeypatch):
+    """Test de l'export NDJSON, lu en plusieurs pages du stockage."""
+    monkeypatch.setattr("src.api.tasks.EXPORT_PAGE_SIZE", 2)
+    headers = auth_user["headers"]
+    client.post(
+        "/api/v1/tasks/bulk",
+        json=[{"title": f"Task {i}"} for i in range(5)],
+        headers=headers,
+    )
+
+    response = client.get("/api/v1/tasks/export", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["X-Export-Watermark"] == "5"
+    lines = response.text.splitlines()
+    assert [json.loads(line)["title"] for line in lines] == [
+        f"Task {i}" for i in range(5)
+    ]
+    assert json.loads(lines[0]) == client.get(
+        "/api/v1/tasks/1", headers=headers
+    ).json()
+
+
+def test_export_tasks_since_watermark(auth_user):
+    """Test de l'export incrémental à partir du repère précédent."""
+    headers = auth_user["headers"]
+    client.post("/api/v1/tasks/", json={"title": "Old"}, headers=headers)
+    watermark = client.get("/api/v1/tasks/export", headers=headers).headers[
+        "X-Export-Watermark"
+    ]
+    client.post("/api/v1/tasks/", json={"title": "New"}, headers=headers)
+
+    response = client.get(
+        "/api/v1/tasks/export", params={"since": watermark}, headers=headers
+    )
+
+    assert [json.loads(line)["title"] for line in response.text.splitlines()] == [
+        "New"
+    ]
+    assert response.headers["X-Export-Watermark"] == "2"
+
+    response = client.get("/api/v1/tasks/export", params={"since": 2}, headers=headers)
+    assert response.text == ""
+    assert response.headers["X-Export-Watermark"] == "2"
+
+
+def test_import_tasks_ndjson(auth_user, monkeypatch):
+    """Test de l'import NDJSON par lots, avec lignes invalides et vides."""
+    monkeypatch.setattr("src.api.tasks.IMPORT_BATCH_SIZE", 2)
+    headers = auth_user["headers"]
+    body = "\n".join(
+        [
+            '{"title": "Task 1"}',
+            '{"title": "Task 2", "priority": "High"}',
+            "",
+            '{"priority": "High"}',
+            "not json",
+            '{"title": "Task 3"}',
+        ]
+    )
+
+    response = client.post("/api/v1/tasks/import", content=body, headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert records[0] == {"lines": 2, "imported": 2, "failed": 0, "done": False}
+    assert [record["line"] for record in records if "errors" in record] == [4, 5]
+    assert records[1]["errors"][0]["loc"] == ["title"]
+    assert records[2]["errors"][0]["type"] == "json_invalid"
+    assert records[-1] == {"lines": 6, "imported": 3, "failed": 2, "done": True}
+    response = client.get("/api/v1/tasks/", headers=headers)
+    assert [task["title"] for task in response.json()] == [
+        "Task 1",
+        "Task 2",
+        "Task 3",
+    ]
+
+
+def test_import_tasks_limits_reported_errors(auth_user, monkeypatch):
+    """Test du plafond d'erreurs détaillées et des lignes trop longues."""
+    monkeypatch.setattr("src.api.tasks.IMPORT_MAX_ERRORS", 1)
+    monkeypatch.setattr("src.api.tasks.IMPORT_MAX_LINE_BYTES", 30)
+    body = '{"title": "' + "x" * 30 + '"}\n{}\n{"title": "Ok"}\n'
+
+    response = client.post(
+        "/api/v1/tasks/import", content=body, headers=auth_user["headers"]
+    )
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    errors = [record for record in records if "errors" in record]
+    assert [error["line"] for error in errors] == [1]
+    assert errors[0]["errors"][0]["type"] == "line_too_long"
+    assert records[-1] == {"lines": 3, "imported": 1, "failed": 2, "done": True}
+
+
+def test_get_task_changes(auth_user):
+    """Test de la synchronisation incrémentale depuis une version."""
+    headers = auth_user["headers"]
+    response = client.get("/api/v1/tasks/changes", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["resync"] is True
+    version = response.json()["version"]
+
+    client.post("/api/v1/tasks/", json={"title": "Kept"}, headers=headers)
+    client.post("/api/v1/tasks/", json={"title": "Deleted"}, headers=headers)
+    client.delete("/api/v1/tasks/2", headers=headers)
+    response = client.get(
+        "/api/v1/tasks/changes", params={"since": version}, headers=headers
+    )
+
+    data = response.json()
+    assert data["resync"] is False
+    assert data["version"] == version + 3
+    assert [task["title"] for task in data["tasks"]] == ["Kept"]
+    assert data["deleted"] == [2]
+
+    response = client.get(
+        "/api/v1/tasks/changes", params={"since": version - 1}, headers=headers
+    )
+    assert response.json()["resync"] is True
+
+
+def test_get_task_not_modified(auth_user):
+    """Test de la requête conditionnelle d'une tâche (ETag)."""
+    headers = auth_user["headers"]
+    client.post("/api/v1/tasks/", json={"title": "Task"}, headers=headers)
+    response = client.get("/api/v1/tasks/1", headers=headers)
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        "/api/v1/tasks/1", headers={**headers, "If-None-Match": f"W/{etag}"}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    client.put("/api/v1/tasks/1", json={"completed": True}, headers=headers)
+    response = client.get(
+        "/api/v1/tasks/1", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["completed"] is True
+    assert response.headers["ETag"] != etag
+
+    response = client.get(
+        "/api/v1/tasks/2", headers={**headers, "If-None-Match": "*"}
+    )
+    assert response.status_code == 404
+
+
+def test_get_tasks_not_modified(auth_user):
+    """Test de la requête conditionnelle de la liste des tâches (ETag)."""
+    headers = auth_user["headers"]
+    client.post("/api/v1/tasks/", json={"title": "Task 1"}, headers=headers)
+    response = client.get("/api/v1/tasks/", headers=headers)
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    conditional = {**headers, "If-None-Match": etag}
+    assert client.get("/api/v1/tasks/", headers=conditional).status_code == 304
+
+    client.post("/api/v1/tasks/", json={"title": "Task 2"}, headers=headers)
+    response = client.get("/api/v1/tasks/", headers=conditional)
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+
+def test_update_task_if_match(auth_user):
+    """Test de la mise à jour conditionnelle d'une tâche (If-Match)."""
+    headers = auth_user["headers"]
+    client.post("/api/v1/tasks/", json={"title": "Task"}, headers=headers)
+    etag = client.get("/api/v1/tasks/1", headers=headers).headers["ETag"]
+
+    response = client.put(
+        "/api/v1/tasks/1",
+        json={"title": "Mine"},
+        headers={**headers, "If-Match": etag},
+    )
+    assert response.status_code == 200
+    new_etag = response.headers["ETag"]
+    assert new_etag != etag
+    assert new_etag == f'"{response.json()["user_id"]}-{response.json()["version"]}"'
+
+    # Écriture concurrente, fondée sur la version précédente
+    for stale in (etag, f"W/{new_etag}"):
+        response = client.put(
+            "/api/v1/tasks/1",
+            json={"title": "Theirs"},
+            headers={**headers, "If-Match": stale},
+        )
+        assert response.status_code == 412
+        assert response.headers["ETag"] == new_etag
+    assert client.get("/api/v1/tasks/1", headers=headers).json()["title"] == "Mine"
+
+    for if_match in (f"{etag}, {new_etag}", "*"):
+        response = client.put(
+            "/api/v1/tasks/1",
+            json={"completed": True},
+            headers={**headers, "If-Match": if_match},
+        )
+        assert response.status_code == 200
+
+    response = client.put(
+        "/api/v1/tasks/2",
+        json={"title": "Missing"},
+        headers={**headers, "If-Match": etag},
+    )
+    assert response.status_code == 404
@@ -0,0 +1,60 @@
+"""Tests pour le pool de hashage des mots de passe."""
+import asyncio
+import threading
+
+import pytest
+
+from src.auth.hashing import HashingPoolSaturatedError, PasswordHashingPool
+
+
+@pytest.fixture
+def pool():
+    """Pool de hashage à deux threads."""
+    pool = PasswordHashingPool(max_workers=2, max_pending=4)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify(pool):
+    """Test du hashage et de la vérification via le pool."""
+    hashed = await pool.hash("secret")
+
+    assert await pool.verify("secret", hashed) is True
+    assert await pool.verify("wrong", hashed) is False
+    assert pool.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_run_uses_worker_threads(pool):
+    """Test que les fonctions s'exécutent hors du thread de la boucle."""
+    loop_thread = threading.current_thread()
+
+    worker_thread = await pool.run(threading.current_thread)
+
+    assert worker_thread is not loop_thread
+    assert worker_thread.name.startswith("password-hash")
+
+
+@pytest.mark.asyncio
+async def test_inline_pool_runs_in_loop_thread():
+    """Test qu'un pool sans thread exécute les fonctions directement."""
+    pool = PasswordHashingPool(max_workers=0, max_pending=4)
+
+    assert await pool.run(threading.current_thread) is threading.current_thread()
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_work(pool):
+    """Test du refus des opérations au-delà de la profondeur maximale."""
+    release = threading.Event()
+    blocked = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(4)]
+    await asyncio.sleep(0)
+
+    assert pool.pending == 4
+    with pytest.raises(HashingPoolSaturatedError):
+        await pool.run(release.wait)
+
+    release.set()
+    await asyncio.gather(*blocked)
+    assert pool.pending == 0
@@ -14,12 +14,8 @@ client = TestClient(app)
 @pytest.fixture(autouse=True)
 def reset_stores():
     """Reset les stores avant chaque test."""
-    task_store._tasks = {}
-    task_store._next_id = 1
-    user_store._users = {}
-    user_store._users_by_username = {}
-    user_store._users_by_email = {}
-    user_store._next_id = 1
+    task_store.clear()
+    user_store.clear()
 
 
 @pytest.fixture
@@ -0,0 +1,103 @@
+"""Tests pour le cache des tokens vérifiés."""
+import time
+from datetime import datetime
+
+import pytest
+
+from src.auth.token_cache import TokenCache
+from src.schemas.user import User
+
+
+def make_user(user_id):
+    """Construire un utilisateur de test."""
+    return User(
+        id=user_id,
+        username=f"user{user_id}",
+        email=f"user{user_id}@example.com",
+        created_at=datetime.now(),
+    )
+
+
+@pytest.fixture
+def cache():
+    """Cache de trois entrées."""
+    return TokenCache(max_size=3)
+
+
+def test_get_miss_then_hit(cache):
+    """Test d'un défaut de cache puis d'un succès."""
+    user = make_user(1)
+
+    assert cache.get("token") is None
+    cache.put("token", user, time.time() + 60)
+
+    assert cache.get("token") is user
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_expired_entry_is_evicted(cache):
+    """Test qu'une entrée expirée n'est plus servie."""
+    cache.put("token", make_user(1), time.time() - 1)
+
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction(cache):
+    """Test de l'éviction de l'entrée la moins récemment utilisée."""
+    expires_at = time.time() + 60
+    for i in range(3):
+        cache.put(f"token{i}", make_user(i), expires_at)
+
+    cache.get("token0")
+    cache.put("token3", make_user(3), expires_at)
+
+    assert len(cache) == 3
+    assert cache.get("token1") is None
+    assert cache.get("token0") is not None
+
+
+def test_invalidate_user(cache):
+    """Test de l'invalidation des tokens d'un utilisateur."""
+    expires_at = time.time() + 60
+    cache.put("a", make_user(1), expires_at)
+    cache.put("b", make_user(1), expires_at)
+    cache.put("c", make_user(2), expires_at)
+
+    cache.invalidate_user(1)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_invalidate_all(cache):
+    """Test de l'invalidation de tous les utilisateurs."""
+    cache.put("a", make_user(1), time.time() + 60)
+
+    cache.invalidate_user(None)
+
+    assert len(cache) == 0
+
+
+def test_put_skipped_after_invalidation(cache):
+    """Test qu'un utilisateur résolu avant une invalidation n'est pas mis en
+    cache."""
+    generation = cache.generation
+    cache.invalidate_user(1)
+
+    cache.put("a", make_user(1), time.time() + 60, generation)
+    assert cache.get("a") is None
+
+    cache.put("a", make_user(1), time.time() + 60, cache.generation)
+    assert cache.get("a") is not None
+
+
+def test_disabled_cache():
+    """Test qu'un cache de taille nulle ne conserve rien."""
+    cache = TokenCache(max_size=0)
+    cache.put("token", make_user(1), time.time() + 60)
+
+    assert cache.get("token") is None
@@ -0,0 +1,32 @@
+"""Tests pour le journal borné des modifications."""
+from src.models.change_log import ChangeLog
+
+
+def test_change_log_keeps_latest_version_per_task():
+    """Test des tâches modifiées depuis une version, sans doublon."""
+    log = ChangeLog(max_entries=10)
+    start = log.version
+
+    log.record([1, 2])
+    log.record([3])
+    version = log.record([1])
+
+    assert version == start + 3
+    assert log.changed_since(start) == [2, 3, 1]
+    assert log.changed_since(start + 1) == [3, 1]
+    assert log.changed_since(version) == []
+
+
+def test_change_log_forgets_oldest_entries():
+    """Test de la compaction et des versions hors du journal."""
+    log = ChangeLog(max_entries=2)
+    start = log.version
+
+    log.record([1])
+    log.record([2])
+    log.record([3])
+
+    assert log.floor == start + 1
+    assert log.changed_since(start) is None
+    assert log.changed_since(start + 1) == [2, 3]
+    assert log.changed_since(log.version + 1) is None
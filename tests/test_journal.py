@@ -0,0 +1,251 @@
+"""Tests pour le journal d'écriture du stockage en mémoire."""
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.models.durable_store import JournaledTaskStore, JournaledUserStore
+from src.models.journal import (
+    SEGMENT_MAGIC,
+    Journal,
+    JournalError,
+    decode_task,
+    decode_user,
+    encode_task,
+    encode_user,
+)
+from src.models.repositories import JournaledTaskRepository
+from src.schemas.task import (
+    BulkSelection,
+    Priority,
+    Task,
+    TaskCreate,
+    TaskFilter,
+    TaskUpdate,
+)
+from src.schemas.user import UserCreate, UserInDB
+
+
+def open_stores(directory, segment_size=64 * 1024 * 1024):
+    """Ouvrir le journal et les stores journalisés d'un répertoire."""
+    journal = Journal(str(directory), segment_size)
+    state = journal.recover()
+    task_store = JournaledTaskStore(journal, state)
+    user_store = JournaledUserStore(journal, state)
+    journal.start()
+    return journal, task_store, user_store
+
+
+def stored_tasks(task_store, user_id):
+    """Tâches d'un utilisateur, sans leur version (non journalisée)."""
+    return [
+        task.model_dump(exclude={"version"})
+        for task in task_store.get_all_tasks(user_id)
+    ]
+
+
+def test_task_and_user_records_round_trip():
+    """Test du codage binaire d'une tâche et d'un utilisateur."""
+    task = Task(
+        id=7,
+        user_id=3,
+        title="Écrire le journal ✍",
+        description=None,
+        completed=True,
+        due_date=datetime(2030, 5, 1, 9, 30, tzinfo=timezone(timedelta(hours=2))),
+        priority=Priority.TOP,
+        created_at=datetime(2024, 1, 2, 3, 4, 5, 678901),
+        completed_at=datetime(2024, 1, 3),
+    )
+    decoded = decode_task(encode_task(task))
+    assert decoded == task
+    assert decoded.due_date.utcoffset() == timedelta(hours=2)
+
+    user = UserInDB(
+        id=2,
+        username="alice",
+        email="alice@example.com",
+        full_name=None,
+        is_active=False,
+        created_at=datetime(2024, 1, 1),
+        hashed_password="$2b$12$hash",
+    )
+    assert decode_user(encode_user(user)) == user
+
+
+def test_recover_after_restart(tmp_path):
+    """Test de la reconstruction de l'état après redémarrage."""
+    journal, task_store, user_store = open_stores(tmp_path)
+    user_store.create_user(
+        UserCreate(username="alice", email="alice@example.com", password="x"),
+        hashed_password="hash",
+    )
+    task1 = task_store.create_task(TaskCreate(title="Task 1"), 1)
+    task_store.create_tasks(
+        [TaskCreate(title="Task 2", priority=Priority.HIGH), TaskCreate(title="Task 3")],
+        1,
+    )
+    task_store.update_task(task1.id, TaskUpdate(completed=True), 1)
+    task_store.update_tasks(
+        BulkSelection(filter=TaskFilter(priority=[Priority.HIGH])),
+        TaskUpdate(title="Renamed"),
+        1,
+    )
+    task_store.delete_task(3, 1)
+    expected = stored_tasks(task_store, 1)
+    version = task_store.get_task_version(task1.id, 1)
+    journal.close()
+
+    journal, task_store, user_store = open_stores(tmp_path)
+
+    assert stored_tasks(task_store, 1) == expected
+    # Versions non journalisées : postérieures à celles du démarrage précédent
+    assert task_store.get_task_version(task1.id, 1) > version
+    assert [
+        task.model_dump(exclude={"version"})
+        for task in task_store.list_tasks(1, filters=TaskFilter(completed=True)).items
+    ] == [expected[0]]
+    assert task_store.create_task(TaskCreate(title="Task 4"), 1).id == 4
+    assert user_store.get_user_by_username("alice").hashed_password == "hash"
+    journal.close()
+
+
+def test_recover_after_clear(tmp_path):
+    """Test que les remises à zéro sont rejouées, IDs compris."""
+    journal, task_store, user_store = open_stores(tmp_path)
+    task_store.create_task(TaskCreate(title="Task"), 1)
+    task_store.clear()
+    user_store.clear()
+    journal.close()
+
+    journal, task_store, user_store = open_stores(tmp_path)
+
+    assert task_store.count_tasks(1) == 0
+    assert task_store.create_task(TaskCreate(title="Task"), 1).id == 1
+    journal.close()
+
+
+def test_torn_write_is_discarded(tmp_path):
+    """Test qu'un enregistrement tronqué en fin de journal est ignoré."""
+    journal, task_store, _ = open_stores(tmp_path)
+    task_store.create_task(TaskCreate(title="Task 1"), 1)
+    task_store.create_task(TaskCreate(title="Task 2"), 1)
+    journal.close()
+    (segment,) = [name for name in os.listdir(tmp_path) if name.startswith("log-")]
+    path = tmp_path / segment
+    path.write_bytes(path.read_bytes()[:-5])
+
+    journal, task_store, _ = open_stores(tmp_path)
+
+    assert [task.title for task in task_store.get_all_tasks(1)] == ["Task 1"]
+    task_store.create_task(TaskCreate(title="Task 2 bis"), 1)
+    journal.close()
+    journal, task_store, _ = open_stores(tmp_path)
+    assert task_store.count_tasks(1) == 2
+    journal.close()
+
+
+def test_corrupted_segment_raises(tmp_path):
+    """Test qu'un segment corrompu avant le dernier est signalé."""
+    journal, task_store, _ = open_stores(tmp_path)
+    task_store.create_task(TaskCreate(title="Task"), 1)
+    journal.close()
+    (path,) = tmp_path.iterdir()
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    (tmp_path / "log-00000001.bin").write_bytes(SEGMENT_MAGIC)
+
+    with pytest.raises(JournalError):
+        Journal(str(tmp_path)).recover()
+
+
+def test_compaction_bounds_the_journal(tmp_path):
+    """Test que les segments pleins sont fusionnés dans un instantané."""
+    journal, task_store, _ = open_stores(tmp_path, segment_size=4096)
+    for i in range(200):
+        task = task_store.create_task(TaskCreate(title=f"Task {i}"), 1 + i % 3)
+        task_store.update_task(task.id, TaskUpdate(completed=True), task.user_id)
+        journal.wait_durable()
+    task_store.delete_all_tasks(2)
+    expected = {user_id: stored_tasks(task_store, user_id) for user_id in (1, 2, 3)}
+    journal.close()
+    journal.compact()
+
+    names = sorted(os.listdir(tmp_path))
+    assert [name for name in names if name.startswith("snapshot-")] == [
+        names[-1]
+    ]
+    assert len([name for name in names if name.startswith("log-")]) == 1
+
+    journal, task_store, _ = open_stores(tmp_path)
+    assert {
+        user_id: stored_tasks(task_store, user_id) for user_id in (1, 2, 3)
+    } == expected
+    assert task_store.create_task(TaskCreate(title="Next"), 1).id == 201
+    journal.close()
+
+
+def test_null_update_leaves_store_recoverable(tmp_path):
+    """Test qu'une mise à jour à null n'atteint ni le stockage ni le journal."""
+    journal, task_store, _ = open_stores(tmp_path)
+    task = task_store.create_task(TaskCreate(title="Task"), 1)
+    for field in ("title", "completed", "priority"):
+        with pytest.raises(ValueError):
+            TaskUpdate.model_validate({field: None})
+    # Mise à jour non validée : l'écriture échoue avant toute modification
+    with pytest.raises(KeyError):
+        task_store.update_task(task.id, TaskUpdate.model_construct(priority=None), 1)
+    assert task_store.get_task(task.id, 1).priority == Priority.NORMAL
+    journal.close()
+
+    journal, task_store, _ = open_stores(tmp_path)
+
+    assert stored_tasks(task_store, 1) == [task.model_dump(exclude={"version"})]
+    journal.close()
+
+
+def test_tasks_are_loaded_on_first_access(tmp_path):
+    """Test du chargement à la demande des tâches après un instantané."""
+    journal, task_store, _ = open_stores(tmp_path, segment_size=4096)
+    for i in range(100):
+        task_store.create_task(TaskCreate(title=f"Task {i}"), 1 + i % 2)
+    journal.close()
+    journal.compact()
+
+    # Écritures postérieures à l'instantané, relues depuis le segment
+    journal, task_store, _ = open_stores(tmp_path, segment_size=2**62)
+    task_store.update_task(1, TaskUpdate(title="Renamed"), 1)
+    task_store.delete_task(3, 1)
+    task_store.create_task(TaskCreate(title="New"), 3)
+    expected = {user_id: stored_tasks(task_store, user_id) for user_id in (1, 2, 3)}
+    journal.close()
+
+    journal, task_store, _ = open_stores(tmp_path)
+
+    assert task_store._tasks == {}
+    assert task_store.get_task(2, 2).title == "Task 1"
+    assert {task.user_id for task in task_store._tasks.values()} == {2}
+    assert task_store.get_task(1, 2) is None
+    assert {
+        user_id: stored_tasks(task_store, user_id) for user_id in (1, 2, 3)
+    } == expected
+    assert task_store.get_task(1, 1).title == "Renamed"
+    journal.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_fsyncs(tmp_path):
+    """Test que les écritures concurrentes sont synchronisées par lots."""
+    journal, task_store, _ = open_stores(tmp_path)
+    tasks = JournaledTaskRepository(task_store)
+
+    created = await asyncio.gather(
+        *(tasks.create_task(TaskCreate(title=f"Task {i}"), 1) for i in range(200))
+    )
+
+    assert len(created) == 200
+    assert journal.durable == journal.appended == 200
+    assert journal.fsyncs < 200
+    journal.close()
@@ -18,3 +18,11 @@ def test_health_check():
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
+
+
+def test_stats():
+    """Test des statistiques internes."""
+    response = client.get("/stats")
+    assert response.status_code == 200
+    assert "hit_rate" in response.json()["token_cache"]
+    assert "dropped" in response.json()["task_events"]
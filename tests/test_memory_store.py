@@ -4,7 +4,14 @@ from datetime import datetime, timedelta
 import pytest
 
 from src.models.memory_store import TaskStore
-from src.schemas.task import Priority, TaskCreate, TaskUpdate
+from src.models.task_updates import VersionConflictError
+from src.schemas.task import (
+    BulkSelection,
+    Priority,
+    TaskCreate,
+    TaskFilter,
+    TaskUpdate,
+)
 
 
 @pytest.fixture
@@ -170,6 +177,26 @@ def test_update_task_not_exists(task_store, sample_user_id):
     assert result is None
 
 
+def test_update_task_expected_version(task_store, sample_task_data, sample_user_id):
+    """Test de la mise à jour conditionnée à la version de la tâche."""
+    created_task = task_store.create_task(sample_task_data, sample_user_id)
+
+    updated_task = task_store.update_task(
+        created_task.id, TaskUpdate(title="First"), sample_user_id, created_task.version
+    )
+    assert updated_task.version > created_task.version
+
+    with pytest.raises(VersionConflictError) as exc_info:
+        task_store.update_task(
+            created_task.id,
+            TaskUpdate(title="Second"),
+            sample_user_id,
+            created_task.version,
+        )
+    assert exc_info.value.version == updated_task.version
+    assert task_store.get_task(created_task.id, sample_user_id) == updated_task
+
+
 def test_update_task_completion_states(task_store, sample_task_data, sample_user_id):
     """Test des transitions d'état de completion."""
     # Créer une tâche non complétée
@@ -312,3 +339,449 @@ def test_user_isolation_complete(task_store):
     # Vérifier que la tâche n'existe plus
     task = task_store.get_task(user1_task2.id, user1_id)
     assert task is None
+
+
+def test_get_all_tasks_ordered_by_id(task_store):
+    """Test que les tâches d'un utilisateur sont retournées dans l'ordre des IDs."""
+    for i in range(5):
+        task_store.create_task(TaskCreate(title=f"Task {i}"), 1 + i % 2)
+
+    user1_tasks = task_store.get_all_tasks(1)
+    assert [task.id for task in user1_tasks] == [1, 3, 5]
+
+
+def test_count_tasks(task_store, sample_task_data):
+    """Test du comptage des tâches par utilisateur."""
+    task_store.create_task(sample_task_data, 1)
+    task_store.create_task(sample_task_data, 1)
+    task_store.create_task(sample_task_data, 2)
+
+    assert task_store.count_tasks(1) == 2
+    assert task_store.count_tasks(2) == 1
+    assert task_store.count_tasks(3) == 0
+
+
+def test_last_task_id(task_store, sample_task_data):
+    """Test de l'ID de la dernière tâche créée par utilisateur."""
+    task_store.create_task(sample_task_data, 1)
+    task2 = task_store.create_task(sample_task_data, 1)
+    task_store.create_task(sample_task_data, 2)
+
+    assert task_store.last_task_id(1) == 2
+    assert task_store.last_task_id(3) is None
+
+    task_store.delete_task(task2.id, 1)
+    assert task_store.last_task_id(1) == 1
+
+
+def test_get_changes(task_store, sample_task_data):
+    """Test des créations, modifications et suppressions depuis une version."""
+    version = task_store.get_changes(1, None).version
+    task1 = task_store.create_task(sample_task_data, 1)
+    task2 = task_store.create_task(sample_task_data, 1)
+    task_store.create_task(sample_task_data, 2)
+    task_store.update_task(task1.id, TaskUpdate(completed=True), 1)
+    task_store.delete_task(task2.id, 1)
+
+    changes = task_store.get_changes(1, version)
+
+    assert not changes.resync
+    assert changes.version == version + 4
+    assert [(task.id, task.completed) for task in changes.tasks] == [(1, True)]
+    assert changes.deleted == [2]
+    assert task_store.get_changes(1, changes.version).tasks == []
+    assert task_store.get_changes(1, None).resync
+
+
+def test_get_changes_requires_resync_once_compacted(sample_task_data):
+    """Test du signal de resynchronisation au-delà du journal borné."""
+    task_store = TaskStore(change_log_size=3)
+    version = task_store.get_changes(1, None).version
+    task_store.create_tasks([sample_task_data] * 2, 1)
+
+    assert not task_store.get_changes(1, version).resync
+    task_store.create_tasks([sample_task_data] * 2, 1)
+
+    assert task_store.get_changes(1, version).resync
+    changes = task_store.get_changes(1, version + 1)
+    assert [task.id for task in changes.tasks] == [3, 4]
+
+
+def test_delete_task_updates_user_index(task_store, sample_task_data):
+    """Test que la suppression met à jour l'index par utilisateur."""
+    task1 = task_store.create_task(sample_task_data, 1)
+    task2 = task_store.create_task(sample_task_data, 1)
+
+    assert task_store.delete_task(task1.id, 1) is True
+
+    assert task_store.count_tasks(1) == 1
+    assert task_store.get_all_tasks(1) == [task2]
+
+    assert task_store.delete_task(task2.id, 1) is True
+    assert task_store.get_all_tasks(1) == []
+
+
+def test_delete_all_tasks(task_store, sample_task_data):
+    """Test de suppression de toutes les tâches d'un utilisateur."""
+    task_store.create_task(sample_task_data, 1)
+    task_store.create_task(sample_task_data, 1)
+    other_task = task_store.create_task(sample_task_data, 2)
+
+    assert task_store.delete_all_tasks(1) == 2
+    assert task_store.delete_all_tasks(1) == 0
+
+    assert task_store.get_all_tasks(1) == []
+    assert task_store.get_all_tasks(2) == [other_task]
+    assert task_store.get_task(other_task.id, 2) == other_task
+
+
+def test_clear(task_store, sample_task_data):
+    """Test de la remise à zéro du stockage."""
+    task_store.create_task(sample_task_data, 1)
+
+    task_store.clear()
+
+    assert task_store.get_all_tasks(1) == []
+    assert task_store.create_task(sample_task_data, 1).id == 1
+
+
+def test_list_tasks_without_limit(task_store, sample_task_data):
+    """Test de la liste paginée sans limite : une seule page."""
+    task1 = task_store.create_task(sample_task_data, 1)
+    task2 = task_store.create_task(sample_task_data, 1)
+
+    page = task_store.list_tasks(1)
+
+    assert page.items == [task1, task2]
+    assert page.next_cursor is None
+
+
+def test_list_tasks_pages(task_store, sample_task_data):
+    """Test du parcours de toutes les pages avec le curseur."""
+    created = [task_store.create_task(sample_task_data, 1 + i % 2) for i in range(9)]
+    expected_ids = [task.id for task in created if task.user_id == 1]
+
+    seen_ids = []
+    cursor = None
+    while True:
+        page = task_store.list_tasks(1, limit=2, cursor=cursor)
+        assert len(page.items) <= 2
+        seen_ids.extend(task.id for task in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen_ids == expected_ids
+
+
+def test_list_tasks_cursor_after_deletion(task_store, sample_task_data):
+    """Test que le curseur reste valide si sa tâche a été supprimée."""
+    tasks = [task_store.create_task(sample_task_data, 1) for _ in range(4)]
+
+    page = task_store.list_tasks(1, limit=2)
+    task_store.delete_task(tasks[1].id, 1)
+    next_page = task_store.list_tasks(1, limit=2, cursor=page.next_cursor)
+
+    assert next_page.items == tasks[2:]
+    assert next_page.next_cursor is None
+
+
+def test_list_tasks_invalid_cursor(task_store):
+    """Test qu'un curseur invalide lève une erreur."""
+    with pytest.raises(ValueError):
+        task_store.list_tasks(1, cursor="not-a-cursor")
+
+
+def test_list_tasks_with_filters(task_store):
+    """Test de la liste filtrée par statut, priorité et échéance."""
+    soon = datetime.now() + timedelta(days=2)
+    later = datetime.now() + timedelta(days=30)
+    task1 = task_store.create_task(
+        TaskCreate(title="Open high", priority=Priority.HIGH, due_date=soon), 1
+    )
+    task_store.create_task(
+        TaskCreate(title="Done top", priority=Priority.TOP, completed=True), 1
+    )
+    task_store.create_task(
+        TaskCreate(title="Later top", priority=Priority.TOP, due_date=later), 1
+    )
+    task_store.create_task(
+        TaskCreate(title="Other user", priority=Priority.HIGH, due_date=soon), 2
+    )
+
+    filters = TaskFilter(
+        completed=False,
+        priority=[Priority.HIGH, Priority.TOP],
+        due_before=datetime.now() + timedelta(days=7),
+    )
+    page = task_store.list_tasks(1, filters=filters)
+
+    assert page.items == [task1]
+
+
+def test_list_tasks_filters_follow_updates(task_store):
+    """Test que les filtres reflètent les mises à jour et suppressions."""
+    task = task_store.create_task(TaskCreate(title="Task"), 1)
+    done = TaskFilter(completed=True)
+
+    assert task_store.list_tasks(1, filters=done).items == []
+
+    task = task_store.update_task(task.id, TaskUpdate(completed=True), 1)
+    assert task_store.list_tasks(1, filters=done).items == [task]
+
+    task_store.delete_task(task.id, 1)
+    assert task_store.list_tasks(1, filters=done).items == []
+
+
+def test_list_tasks_filtered_pages(task_store):
+    """Test de la pagination d'une liste filtrée."""
+    high = [
+        task_store.create_task(TaskCreate(title=f"T{i}", priority=priority), 1)
+        for i, priority in enumerate([Priority.HIGH, Priority.LOW] * 3)
+    ]
+    expected = [task for task in high if task.priority == Priority.HIGH]
+    filters = TaskFilter(priority=[Priority.HIGH])
+
+    first = task_store.list_tasks(1, filters=filters, limit=2)
+    second = task_store.list_tasks(1, filters=filters, limit=2, cursor=first.next_cursor)
+
+    assert first.items + second.items == expected
+    assert second.next_cursor is None
+
+
+def test_list_tasks_sorted(task_store):
+    """Test de la liste triée par priorité décroissante puis échéance."""
+    now = datetime.now()
+    low = task_store.create_task(TaskCreate(title="Low", priority=Priority.LOW), 1)
+    top_late = task_store.create_task(
+        TaskCreate(title="Top late", priority=Priority.TOP, due_date=now + timedelta(2)),
+        1,
+    )
+    top_soon = task_store.create_task(
+        TaskCreate(title="Top soon", priority=Priority.TOP, due_date=now + timedelta(1)),
+        1,
+    )
+
+    page = task_store.list_tasks(1, sort="-priority,due_date")
+
+    assert page.items == [top_soon, top_late, low]
+
+
+def test_list_tasks_sorted_pages(task_store):
+    """Test de la pagination d'une liste triée."""
+    titles = ["d", "b", "e", "a", "c"]
+    for title in titles:
+        task_store.create_task(TaskCreate(title=title), 1)
+
+    seen = []
+    cursor = None
+    while True:
+        page = task_store.list_tasks(1, sort="title", limit=2, cursor=cursor)
+        seen.extend(task.title for task in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == sorted(titles)
+
+
+def test_list_tasks_sorted_order_maintained(task_store):
+    """Test que l'ordre trié maintenu suit les écritures."""
+    first = task_store.create_task(TaskCreate(title="b"), 1)
+    second = task_store.create_task(TaskCreate(title="c"), 1)
+    assert task_store.list_tasks(1, sort="title").items == [first, second]
+
+    third = task_store.create_task(TaskCreate(title="a"), 1)
+    assert task_store.list_tasks(1, sort="title").items == [third, first, second]
+
+    second = task_store.update_task(second.id, TaskUpdate(title="0"), 1)
+    assert task_store.list_tasks(1, sort="title").items == [second, third, first]
+
+    task_store.delete_task(third.id, 1)
+    assert task_store.list_tasks(1, sort="title").items == [second, first]
+
+
+def test_list_tasks_sorted_and_filtered(task_store):
+    """Test d'une liste filtrée, triée et paginée."""
+    tasks = [
+        task_store.create_task(
+            TaskCreate(title=f"T{i}", completed=i % 2 == 0, priority=priority), 1
+        )
+        for i, priority in enumerate(
+            [Priority.LOW, Priority.TOP, Priority.HIGH, Priority.MEDIUM, Priority.TOP]
+        )
+    ]
+    filters = TaskFilter(completed=False)
+
+    first = task_store.list_tasks(1, filters=filters, sort="-priority", limit=1)
+    second = task_store.list_tasks(
+        1, filters=filters, sort="-priority", limit=1, cursor=first.next_cursor
+    )
+
+    assert first.items == [tasks[1]]
+    assert second.items == [tasks[3]]
+    assert second.next_cursor is None
+
+
+def test_list_tasks_cursor_from_other_sort(task_store, sample_task_data):
+    """Test qu'un curseur obtenu avec un autre tri est rejeté."""
+    for _ in range(3):
+        task_store.create_task(sample_task_data, 1)
+    page = task_store.list_tasks(1, sort="title", limit=1)
+
+    with pytest.raises(ValueError):
+        task_store.list_tasks(1, limit=1, cursor=page.next_cursor)
+
+
+def test_list_tasks_invalid_sort(task_store):
+    """Test qu'un tri inconnu lève une erreur."""
+    with pytest.raises(ValueError):
+        task_store.list_tasks(1, sort="owner")
+
+
+def test_create_tasks_bulk(task_store):
+    """Test de la création groupée : IDs contigus et index à jour."""
+    now = datetime.now()
+    task_store.create_task(TaskCreate(title="First"), 1)
+    # Un ordre de tri maintenu doit intégrer les tâches du lot
+    task_store.list_tasks(1, sort="title")
+
+    tasks = task_store.create_tasks(
+        [
+            TaskCreate(title="c", priority=Priority.HIGH, due_date=now + timedelta(2)),
+            TaskCreate(title="b", completed=True, due_date=now + timedelta(1)),
+            TaskCreate(title="a", priority=Priority.HIGH),
+        ],
+        1,
+    )
+
+    assert [task.id for task in tasks] == [2, 3, 4]
+    assert tasks[1].completed_at is not None
+    assert task_store.count_tasks(1) == 4
+    assert task_store.create_task(TaskCreate(title="Next"), 1).id == 5
+    page = task_store.list_tasks(1, sort="title")
+    assert [task.title for task in page.items] == ["a", "b", "c", "First", "Next"]
+    page = task_store.list_tasks(
+        1, filters=TaskFilter(priority=[Priority.HIGH], due_after=now)
+    )
+    assert page.items == [tasks[0]]
+    assert task_store.create_tasks([], 1) == []
+
+
+def test_update_tasks_bulk(task_store):
+    """Test de la mise à jour groupée par filtre, index compris."""
+    for i in range(40):
+        task_store.create_task(
+            TaskCreate(title=f"Task {i:02d}", completed=i % 2 == 0), 1
+        )
+    other = task_store.create_task(TaskCreate(title="Other"), 2)
+    task_store.list_tasks(1, sort="-completed_at,title")
+
+    updated = task_store.update_tasks(
+        BulkSelection(filter=TaskFilter(completed=False)),
+        TaskUpdate(completed=True),
+        1,
+    )
+
+    assert len(updated) == 20
+    assert len({task.completed_at for task in updated}) == 1
+    assert task_store.count_tasks(1) == 40
+    page = task_store.list_tasks(1, filters=TaskFilter(completed=False))
+    assert page.items == []
+    page = task_store.list_tasks(1, sort="-completed_at,title", limit=20)
+    assert page.items == updated
+    assert other.completed is False
+
+
+def test_update_tasks_bulk_by_ids(task_store):
+    """Test de la mise à jour groupée par IDs, limitée aux tâches de l'utilisateur."""
+    task1 = task_store.create_task(TaskCreate(title="Task 1"), 1)
+    task2 = task_store.create_task(TaskCreate(title="Task 2", completed=True), 1)
+    other = task_store.create_task(TaskCreate(title="Other"), 2)
+
+    updated = task_store.update_tasks(
+        BulkSelection(ids=[task2.id, other.id, 999, task1.id]),
+        TaskUpdate(completed=False, priority=Priority.TOP),
+        1,
+    )
+
+    assert [task.id for task in updated] == [task1.id, task2.id]
+    assert updated[1].completed_at is None
+    assert task_store.get_task(other.id, 2).priority == Priority.NORMAL
+    page = task_store.list_tasks(1, filters=TaskFilter(priority=[Priority.TOP]))
+    assert page.items == updated
+
+
+def test_delete_tasks_bulk(task_store):
+    """Test de la suppression groupée par IDs et par filtre."""
+    tasks = [
+        task_store.create_task(TaskCreate(title=f"Task {i}", completed=i < 35), 1)
+        for i in range(40)
+    ]
+    other = task_store.create_task(TaskCreate(title="Other", completed=True), 2)
+    task_store.list_tasks(1, sort="title")
+
+    selection = BulkSelection(filter=TaskFilter(completed=True))
+    assert task_store.delete_tasks(selection, 1) == 35
+    assert task_store.get_all_tasks(1) == tasks[35:]
+    assert task_store.list_tasks(1, sort="title").items == tasks[35:]
+    assert task_store.get_task(other.id, 2) == other
+
+    selection = BulkSelection(ids=[tasks[36].id, other.id])
+    assert task_store.delete_tasks(selection, 1) == 1
+    assert task_store.count_tasks(1) == 4
+
+    assert task_store.delete_tasks(BulkSelection(filter=TaskFilter()), 1) == 4
+    assert task_store.count_tasks(1) == 0
+    assert task_store.delete_tasks(BulkSelection(filter=TaskFilter()), 1) == 0
+
+
+def test_returned_tasks_are_detached(task_store):
+    """Test que les tâches renvoyées sont des copies des tâches stockées."""
+    task = task_store.create_task(TaskCreate(title="Task"), 1)
+
+    task.title = "Modified"
+
+    assert task_store.get_task(task.id, 1).title == "Task"
+    assert task_store.list_tasks(1, filters=TaskFilter(completed=False)).items == [
+        task_store.get_task(task.id, 1)
+    ]
+
+
+def test_stats(task_store, sample_task_data, sample_user_id):
+    """Test des tailles du stockage exposées dans les métriques."""
+    task_store.create_task(sample_task_data, sample_user_id)
+    task_store.create_task(TaskCreate(title="Other"), sample_user_id + 1)
+
+    stats = task_store.stats()
+
+    assert stats["tasks"] == 2
+    assert stats["users_with_tasks"] == 2
+    # ID, couple (état, priorité) et échéance de chaque tâche
+    assert stats["index_entries"] == 5
+    assert stats["change_log_entries"] == 2
+
+
+def test_memory_usage(task_store, sample_user_id):
+    """Test de la mémoire estimée, détaillée pour les utilisateurs les plus lourds."""
+    task_store.create_tasks(
+        [TaskCreate(title=f"Task {i}") for i in range(10)], sample_user_id
+    )
+    task_store.create_task(TaskCreate(title="Other"), sample_user_id + 1)
+    task_store.create_task(TaskCreate(title="Deleted"), sample_user_id + 2)
+    task_store.delete_all_tasks(sample_user_id + 2)
+
+    usage = task_store.memory_usage(limit=2)
+
+    assert usage.tasks == 11
+    assert usage.users == 3
+    assert [tenant.user_id for tenant in usage.tenants] == [
+        sample_user_id,
+        sample_user_id + 1,
+    ]
+    heaviest = usage.tenants[0]
+    assert heaviest.tasks == 10
+    assert heaviest.total_bytes == (
+        heaviest.task_bytes + heaviest.index_bytes + heaviest.change_log_bytes
+    )
+    assert usage.total_bytes > sum(tenant.total_bytes for tenant in usage.tenants)
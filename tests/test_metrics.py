@@ -0,0 +1,63 @@
+"""Tests pour les métriques HTTP et leur exposition Prometheus."""
+from fastapi.testclient import TestClient
+
+from src.api.metrics import (
+    BUCKET_BOUNDS,
+    BUCKET_COUNT,
+    UNIT_SHIFT,
+    HttpMetrics,
+    bucket_index,
+    bucket_upper_bound,
+)
+from src.main import app
+
+client = TestClient(app)
+
+
+def test_bucket_index_matches_bounds():
+    """Test que chaque durée tombe dans l'intervalle dont les bornes l'encadrent."""
+    for duration_ns in [0, 1, 16_383, 16_384, 10**5, 10**6, 123_456_789, 10**10]:
+        index = bucket_index(duration_ns)
+        value = duration_ns >> UNIT_SHIFT
+        lower = bucket_upper_bound(index - 1) if index > 0 else 0
+        assert lower <= value < bucket_upper_bound(index)
+        # Précision relative bornée, quelle que soit la durée
+        assert bucket_upper_bound(index) - lower <= max(1, lower // 4)
+    assert bucket_index(40 * 10**9) >= BUCKET_COUNT
+
+
+def test_histogram_exposition():
+    """Test de l'exposition d'un histogramme au format Prometheus."""
+    metrics = HttpMetrics()
+    metrics.record("GET", "/tasks/{task_id}", 200, 50_000)
+    metrics.record("GET", "/tasks/{task_id}", 200, 60 * 10**9)
+
+    lines = metrics.render()
+
+    labels = 'method="GET",route="/tasks/{task_id}",status="200"'
+    assert f"http_requests_total{{{labels}}} 2" in lines
+    buckets = [
+        line for line in lines if line.startswith("http_request_duration_seconds_bucket")
+    ]
+    assert len(buckets) == len(BUCKET_BOUNDS) + 1
+    assert buckets[-2].endswith(" 1")
+    assert buckets[-1].endswith(f'{{{labels},le="+Inf"}} 2')
+    assert f"http_request_duration_seconds_sum{{{labels}}} 60.00005" in lines
+
+
+def test_metrics_endpoint():
+    """Test de l'endpoint /metrics, requêtes comptées par gabarit de route."""
+    client.get("/api/v1/tasks/42")
+    client.get("/does-not-exist")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'route="/api/v1/tasks/{task_id}",status="401"' in text
+    assert 'route="unmatched",status="404"' in text
+    assert "http_requests_in_flight 1" in text
+    assert "todos_task_store_tasks " in text
+    assert "todos_user_store_users " in text
+    assert "todos_token_cache_hits " in text
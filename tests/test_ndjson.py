@@ -0,0 +1,32 @@
+"""Tests pour le découpage des flux NDJSON."""
+import asyncio
+
+from src.api.ndjson import iter_lines
+
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def lines_of(*chunks, max_line_bytes=10):
+    """Lignes produites par ``iter_lines`` pour ces morceaux."""
+
+    async def collect():
+        return [line async for line in iter_lines(_chunks(*chunks), max_line_bytes)]
+
+    return asyncio.run(collect())
+
+
+def test_iter_lines_across_chunks():
+    """Test des lignes coupées entre plusieurs morceaux."""
+    assert lines_of(b'{"a"', b":1}\r\n\n{", b'"b":2}') == [b'{"a":1}', b"", b'{"b":2}']
+    assert lines_of(b"a\n", b"b\n") == [b"a", b"b"]
+    assert lines_of() == []
+
+
+def test_iter_lines_replaces_oversized_lines():
+    """Test du remplacement des lignes trop longues par None."""
+    assert lines_of(b"0123456789A\nok\n") == [None, b"ok"]
+    assert lines_of(b"0123456789", b"0123456789", b"01\nok") == [None, b"ok"]
+    assert lines_of(b"ok\n", b"0123456789", b"01") == [b"ok", None]
@@ -0,0 +1,127 @@
+"""Tests pour les ports asynchrones d'accès au stockage."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.dependencies import get_task_repository, get_user_repository
+from src.main import app
+from src.models.memory_store import TaskStore
+from src.models.repositories import (
+    InMemoryTaskRepository,
+    InMemoryUserRepository,
+    ThreadPoolTaskRepository,
+    ThreadPoolUserRepository,
+)
+from src.models.sqlite_store import SQLiteDatabase, SQLiteTaskStore, SQLiteUserStore
+from src.models.user_store import UserStore
+from src.schemas.task import TaskCreate, TaskUpdate
+from src.schemas.user import UserCreate
+
+
+@pytest.fixture
+def executor():
+    """Pool de threads pour les adaptateurs bloquants."""
+    executor = ThreadPoolExecutor(2, thread_name_prefix="test-storage")
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_in_memory_task_repository():
+    """Test des opérations de l'adaptateur en mémoire."""
+    tasks = InMemoryTaskRepository(TaskStore())
+
+    task = await tasks.create_task(TaskCreate(title="Task"), 1)
+    assert await tasks.get_task(task.id, 1) == task
+    assert await tasks.get_all_tasks(1) == [task]
+    assert (await tasks.list_tasks(1, limit=1)).items == [task]
+    assert await tasks.count_tasks(1) == 1
+
+    updated = await tasks.update_task(task.id, TaskUpdate(completed=True), 1)
+    assert updated.completed is True
+
+    assert await tasks.delete_task(task.id, 1) is True
+    await tasks.create_task(TaskCreate(title="Task"), 1)
+    assert await tasks.delete_all_tasks(1) == 1
+
+
+@pytest.mark.asyncio
+async def test_thread_pool_repository_runs_off_loop(executor):
+    """Test que l'adaptateur bloquant exécute le stockage dans le pool."""
+    threads = []
+
+    class RecordingStore(TaskStore):
+        def create_task(self, task_data, user_id):
+            threads.append(threading.current_thread().name)
+            return super().create_task(task_data, user_id)
+
+    tasks = ThreadPoolTaskRepository(RecordingStore(), executor)
+
+    task = await tasks.create_task(TaskCreate(title="Task"), 1)
+
+    assert task.id == 1
+    assert threads[0].startswith("test-storage")
+
+
+@pytest.mark.asyncio
+async def test_user_repository_authentication():
+    """Test de l'enregistrement et de l'authentification via le port."""
+    users = InMemoryUserRepository(UserStore())
+    user_data = UserCreate(
+        username="testuser", email="test@example.com", password="secret123"
+    )
+
+    user = await users.create_user(user_data)
+
+    assert (await users.authenticate_user("testuser", "secret123")).id == user.id
+    assert await users.authenticate_user("testuser", "wrong") is None
+    assert await users.authenticate_user("unknown", "secret123") is None
+    assert await users.get_user_by_id(user.id) == user
+    assert (await users.get_user_by_email("test@example.com")).id == user.id
+
+    assert await users.deactivate_user(user.id) is True
+    assert await users.authenticate_user("testuser", "secret123") is None
+
+
+def test_api_with_sqlite_repositories(tmp_path, executor):
+    """Test de l'API complète avec le stockage SQLite injecté par dépendance."""
+    database = SQLiteDatabase(str(tmp_path / "api.db"), pool_size=2)
+    user_store = SQLiteUserStore(database)
+    tasks = ThreadPoolTaskRepository(SQLiteTaskStore(database), executor)
+    users = ThreadPoolUserRepository(user_store, executor)
+    app.dependency_overrides[get_task_repository] = lambda: tasks
+    app.dependency_overrides[get_user_repository] = lambda: users
+    client = TestClient(app)
+    try:
+        credentials = {"username": "sqliteuser", "password": "secret123"}
+        response = client.post(
+            "/api/v1/auth/register",
+            json={**credentials, "email": "sqlite@example.com"},
+        )
+        assert response.status_code == 201
+        token = client.post("/api/v1/auth/login", data=credentials).json()[
+            "access_token"
+        ]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = client.post(
+            "/api/v1/tasks/", json={"title": "Stored"}, headers=headers
+        )
+        assert response.status_code == 201
+        task_id = response.json()["id"]
+
+        response = client.put(
+            f"/api/v1/tasks/{task_id}", json={"completed": True}, headers=headers
+        )
+        assert response.json()["completed_at"] is not None
+
+        response = client.get("/api/v1/tasks/", headers=headers)
+        assert [task["title"] for task in response.json()] == ["Stored"]
+        assert user_store.get_user_by_username("sqliteuser") is not None
+
+        assert client.delete(f"/api/v1/tasks/{task_id}", headers=headers).status_code == 204
+    finally:
+        app.dependency_overrides.clear()
+        database.close()
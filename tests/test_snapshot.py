@@ -0,0 +1,51 @@
+"""Tests pour le format d'instantané projeté en mémoire."""
+import pytest
+
+from src.models.snapshot import Snapshot, SnapshotError, SnapshotWriter
+
+
+def task_fields(task_id, user_id):
+    """Champs d'une tâche (dates nulles)."""
+    return (task_id, user_id, 0, -1) + (0,) * 24
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Test de la relecture des tâches par utilisateur et des utilisateurs."""
+    path = str(tmp_path / "snapshot.bin")
+    writer = SnapshotWriter(path, next_task_id=6, next_user_id=3)
+    writer.add_task(task_fields(1, 1), b"Premi\xc3\xa8re", None)
+    writer.add_task(task_fields(4, 1), b"", b"Description")
+    writer.add_task(task_fields(2, 2), b"Autre", None)
+    writer.add_user((1, 1) + (0,) * 8, [b"alice", b"a@example.com", None, b"hash"])
+    writer.close()
+
+    snapshot = Snapshot(path)
+
+    assert (snapshot.next_task_id, snapshot.next_user_id) == (6, 3)
+    assert list(snapshot.task_user_ids()) == [1, 2]
+    rows = list(snapshot.task_rows(1))
+    assert [fields[0] for fields, _ in rows] == [1, 4]
+    assert [strings for _, strings in rows] == [
+        ["Première".encode(), None],
+        [b"", b"Description"],
+    ]
+    assert list(snapshot.task_rows(3)) == []
+    ((fields, strings),) = snapshot.user_rows()
+    assert fields[:2] == (1, 1)
+    assert strings == [b"alice", b"a@example.com", None, b"hash"]
+    snapshot.close()
+
+
+def test_snapshot_rejects_unsorted_tasks_and_truncated_files(tmp_path):
+    """Test des contrôles à l'écriture et à l'ouverture."""
+    path = tmp_path / "snapshot.bin"
+    writer = SnapshotWriter(str(path), next_task_id=1, next_user_id=1)
+    writer.add_task(task_fields(1, 2), b"Task", None)
+    with pytest.raises(ValueError):
+        writer.add_task(task_fields(2, 1), b"Task", None)
+    writer.close()
+
+    path.write_bytes(path.read_bytes()[:-1])
+
+    with pytest.raises(SnapshotError):
+        Snapshot(str(path))
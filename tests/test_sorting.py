@@ -0,0 +1,113 @@
+"""Tests pour les ordres de tri des tâches."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.pagination import InvalidCursorError
+from src.models.sorting import InvalidSortError, SortSpec, key_task_id
+from src.schemas.task import Priority, Task
+
+NOW = datetime(2024, 6, 3, 12, 0)
+
+
+def make_task(task_id, **fields):
+    """Construire une tâche de test."""
+    data = {"title": f"Task {task_id}", "user_id": 1, "created_at": NOW}
+    data.update(fields)
+    return Task(id=task_id, **data)
+
+
+def test_parse_default():
+    """Test que l'absence de tri correspond à l'ordre par ID."""
+    assert SortSpec.parse(None).is_default
+    assert SortSpec.parse("").is_default
+    assert SortSpec.parse("id").is_default
+
+
+def test_parse_fields():
+    """Test de l'analyse d'un tri multi-champs."""
+    spec = SortSpec.parse("-priority, due_date,+created_at")
+
+    assert spec.fields == (
+        ("priority", True),
+        ("due_date", False),
+        ("created_at", False),
+    )
+    assert not spec.is_default
+
+
+@pytest.mark.parametrize("sort", ["unknown", "priority,priority", "user_id"])
+def test_parse_invalid(sort):
+    """Test du rejet des tris invalides."""
+    with pytest.raises(InvalidSortError):
+        SortSpec.parse(sort)
+
+
+def test_sort_by_priority_rank():
+    """Test que les priorités sont triées par rang et non alphabétiquement."""
+    tasks = [
+        make_task(1, priority=Priority.TOP),
+        make_task(2, priority=Priority.LOW),
+        make_task(3, priority=Priority.HIGH),
+        make_task(4, priority=Priority.MEDIUM),
+    ]
+
+    ascending = sorted(tasks, key=SortSpec.parse("priority").sort_key)
+    descending = sorted(tasks, key=SortSpec.parse("-priority").sort_key)
+
+    assert [task.id for task in ascending] == [2, 4, 3, 1]
+    assert [task.id for task in descending] == [1, 3, 4, 2]
+
+
+def test_sort_nulls_last_in_both_directions():
+    """Test que les échéances absentes sont toujours en fin de liste."""
+    tasks = [
+        make_task(1),
+        make_task(2, due_date=NOW + timedelta(days=2)),
+        make_task(3, due_date=NOW + timedelta(days=1)),
+    ]
+
+    ascending = sorted(tasks, key=SortSpec.parse("due_date").sort_key)
+    descending = sorted(tasks, key=SortSpec.parse("-due_date").sort_key)
+
+    assert [task.id for task in ascending] == [3, 2, 1]
+    assert [task.id for task in descending] == [2, 3, 1]
+
+
+def test_sort_descending_strings_with_id_tiebreak():
+    """Test d'un tri décroissant sur du texte, départagé par l'ID."""
+    tasks = [
+        make_task(1, title="b"),
+        make_task(2, title="A"),
+        make_task(3, title="c"),
+        make_task(4, title="B"),
+    ]
+
+    ordered = sorted(tasks, key=SortSpec.parse("-title").sort_key)
+
+    assert [task.id for task in ordered] == [3, 1, 4, 2]
+
+
+def test_cursor_values_roundtrip():
+    """Test que la clé se reconstruit à partir des valeurs du curseur."""
+    spec = SortSpec.parse("-priority,due_date")
+    task = make_task(7, priority=Priority.HIGH, due_date=NOW)
+
+    key = spec.key_from_values(spec.cursor_values(task))
+
+    assert key == spec.sort_key(task)
+    assert key_task_id(key) == 7
+
+
+def test_key_task_id_descending_id():
+    """Test de l'extraction de l'ID pour un tri par ID décroissant."""
+    spec = SortSpec.parse("-id")
+
+    assert key_task_id(spec.sort_key(make_task(5))) == 5
+
+
+@pytest.mark.parametrize("values", [[1], ["High", 2], [3, "x"]])
+def test_key_from_invalid_values(values):
+    """Test du rejet d'un curseur incompatible avec l'ordre demandé."""
+    with pytest.raises(InvalidCursorError):
+        SortSpec.parse("priority").key_from_values(values)
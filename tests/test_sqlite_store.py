@@ -0,0 +1,382 @@
+"""Tests pour le stockage SQLite."""
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.memory_store import TaskStore
+from src.models.sqlite_store import SQLiteDatabase, SQLiteTaskStore, SQLiteUserStore
+from src.models.stores import create_stores
+from src.models.task_updates import VersionConflictError
+from src.schemas.task import (
+    BulkSelection,
+    Priority,
+    TaskCreate,
+    TaskFilter,
+    TaskUpdate,
+)
+from src.schemas.user import UserCreate
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Base SQLite temporaire."""
+    database = SQLiteDatabase(str(tmp_path / "todos.db"), pool_size=2)
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def task_store(database):
+    """Stockage SQLite de tâches vide."""
+    return SQLiteTaskStore(database)
+
+
+@pytest.fixture
+def user_store(database):
+    """Stockage SQLite d'utilisateurs vide."""
+    return SQLiteUserStore(database)
+
+
+@pytest.fixture
+def sample_user_data():
+    """Données d'utilisateur exemple."""
+    return UserCreate(
+        username="testuser", email="test@example.com", password="testpassword123"
+    )
+
+
+def test_create_and_get_task(task_store):
+    """Test de création et de récupération d'une tâche."""
+    due_date = datetime.now() + timedelta(days=3)
+    task = task_store.create_task(
+        TaskCreate(title="Task", priority=Priority.HIGH, due_date=due_date), 1
+    )
+
+    assert task.id == 1
+    assert task_store.get_task(task.id, 1) == task
+    assert task_store.get_task(task.id, 2) is None
+    assert task_store.get_task(999, 1) is None
+
+
+def test_update_task_completion(task_store):
+    """Test de la gestion de completed_at lors des mises à jour."""
+    task = task_store.create_task(TaskCreate(title="Task"), 1)
+
+    updated = task_store.update_task(task.id, TaskUpdate(completed=True), 1)
+    assert updated.completed is True
+    assert updated.completed_at is not None
+    assert task_store.get_task(task.id, 1) == updated
+
+    updated = task_store.update_task(task.id, TaskUpdate(completed=False), 1)
+    assert updated.completed_at is None
+
+    assert task_store.update_task(task.id, TaskUpdate(title="x"), 2) is None
+
+
+def test_required_task_columns_reject_null(task_store, database):
+    """Test qu'une tâche ne peut être enregistrée sans titre, état ou priorité."""
+    task = task_store.create_task(TaskCreate(title="Task"), 1)
+
+    for column in ("title", "completed", "priority"):
+        with database.connection() as conn, pytest.raises(sqlite3.IntegrityError):
+            conn.execute(f"UPDATE tasks SET {column} = NULL WHERE id = ?", (task.id,))
+    assert task_store.get_task(task.id, 1) == task
+
+
+def test_delete_tasks(task_store):
+    """Test de suppression d'une tâche et de toutes les tâches d'un utilisateur."""
+    task1 = task_store.create_task(TaskCreate(title="Task 1"), 1)
+    task_store.create_task(TaskCreate(title="Task 2"), 1)
+    other = task_store.create_task(TaskCreate(title="Other"), 2)
+
+    assert task_store.delete_task(task1.id, 2) is False
+    assert task_store.delete_task(task1.id, 1) is True
+    assert task_store.delete_task(task1.id, 1) is False
+    assert task_store.count_tasks(1) == 1
+    assert task_store.last_task_id(1) == 2
+
+    assert task_store.delete_all_tasks(1) == 1
+    assert task_store.last_task_id(1) is None
+    assert task_store.get_all_tasks(1) == []
+    assert task_store.get_all_tasks(2) == [other]
+
+
+def test_get_changes_matches_memory_store(database):
+    """Test du journal des modifications, comparé au stockage en mémoire."""
+    stores = [SQLiteTaskStore(database, change_log_size=3), TaskStore(change_log_size=3)]
+    results = []
+    for store in stores:
+        start = store.get_changes(1, None).version
+        store.create_tasks([TaskCreate(title=f"Task {i}") for i in range(3)], 1)
+        store.create_task(TaskCreate(title="Other"), 2)
+        store.update_task(1, TaskUpdate(completed=True), 1)
+        store.delete_tasks(BulkSelection(ids=[2]), 1)
+        store.create_task(TaskCreate(title="Task 3"), 1)
+        results.append(
+            [
+                (
+                    changes.resync,
+                    changes.version - start,
+                    [task.id for task in changes.tasks],
+                    changes.deleted,
+                )
+                for changes in (
+                    store.get_changes(1, since) for since in range(start, start + 6)
+                )
+            ]
+        )
+
+    assert results[0] == results[1]
+    assert results[0][1] == (False, 4, [1, 5], [2])
+
+
+def test_task_versions_match_memory_store(database):
+    """Test des versions des tâches et de la collection, comparé à la mémoire."""
+    stores = [SQLiteTaskStore(database), TaskStore()]
+    results = []
+    for store in stores:
+        start = store.get_collection_version(1)
+        assert store.get_collection_version(1) == start
+        store.create_tasks([TaskCreate(title=f"Task {i}") for i in range(2)], 1)
+        store.update_task(2, TaskUpdate(completed=True), 1)
+        store.update_task(1, TaskUpdate(), 1)
+        store.create_task(TaskCreate(title="Other"), 2)
+        results.append(
+            (
+                store.get_collection_version(1) - start,
+                [store.get_task_version(task_id, 1) - start for task_id in (1, 2)],
+                store.get_task_version(3, 1),
+            )
+        )
+
+    assert results[0] == results[1] == (2, [1, 2], None)
+
+
+def test_update_task_checks_expected_version(task_store):
+    """Test de la mise à jour conditionnée à la version, dans la transaction."""
+    task = task_store.create_task(TaskCreate(title="Task"), 1)
+    assert task_store.get_task(task.id, 1).version == task.version
+
+    updated = task_store.update_task(task.id, TaskUpdate(title="A"), 1, task.version)
+
+    assert updated == task_store.get_task(task.id, 1)
+    assert updated.version == task_store.get_task_version(task.id, 1) > task.version
+    with pytest.raises(VersionConflictError):
+        task_store.update_task(task.id, TaskUpdate(title="B"), 1, task.version)
+    assert task_store.get_task(task.id, 1).title == "A"
+
+
+def test_task_version_column_is_added_to_existing_database(tmp_path):
+    """Test de la migration d'une base créée sans versions de tâches."""
+    path = str(tmp_path / "todos.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "user_id INTEGER NOT NULL, title TEXT NOT NULL, description TEXT, "
+        "completed INTEGER NOT NULL, due_date TEXT, priority TEXT, "
+        "created_at TEXT NOT NULL, completed_at TEXT, title_key TEXT NOT NULL, "
+        "description_key TEXT, due_ts REAL, priority_rank INTEGER, "
+        "created_ts REAL NOT NULL, completed_ts REAL)"
+    )
+    conn.close()
+
+    database = SQLiteDatabase(path, pool_size=1)
+    store = SQLiteTaskStore(database)
+    task = store.create_task(TaskCreate(title="Task"), 1)
+
+    assert store.get_task_version(task.id, 1) == store.get_collection_version(1)
+    database.close()
+
+
+def test_clear_resets_ids(task_store):
+    """Test que la remise à zéro réinitialise aussi les IDs."""
+    task_store.create_task(TaskCreate(title="Task"), 1)
+
+    task_store.clear()
+
+    assert task_store.count_tasks(1) == 0
+    assert task_store.create_task(TaskCreate(title="Task"), 1).id == 1
+
+
+def test_data_survives_reopening(tmp_path):
+    """Test de la persistance des données après réouverture de la base."""
+    path = str(tmp_path / "todos.db")
+    database = SQLiteDatabase(path, pool_size=1)
+    task = SQLiteTaskStore(database).create_task(TaskCreate(title="Persisted"), 1)
+    database.close()
+
+    reopened = SQLiteDatabase(path, pool_size=1)
+    assert SQLiteTaskStore(reopened).get_task(task.id, 1) == task
+    reopened.close()
+
+
+def test_database_uses_wal(database):
+    """Test que la base est en mode WAL."""
+    with database.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+QUERIES = [
+    {},
+    {"sort": "-priority,due_date"},
+    {"sort": "title"},
+    {"sort": "-completed_at,-title"},
+    {"filters": TaskFilter(completed=False)},
+    {"filters": TaskFilter(priority=[Priority.HIGH, Priority.TOP])},
+    {"filters": TaskFilter(due_after=datetime(2024, 1, 10)), "sort": "-due_date"},
+    {
+        "filters": TaskFilter(
+            completed=False,
+            priority=[Priority.LOW, Priority.TOP],
+            due_before=datetime(2024, 1, 20),
+        ),
+        "sort": "priority,-created_at",
+    },
+]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_list_tasks_matches_memory_store(task_store, query):
+    """Test que les pages SQLite sont identiques à celles du stockage mémoire."""
+    memory_store = TaskStore()
+    rng = random.Random(42)
+    for i in range(60):
+        task_data = TaskCreate(
+            title=rng.choice(["alpha", "Beta", "gamma", "delta"]) + str(i % 7),
+            description=rng.choice([None, "desc"]),
+            completed=rng.random() < 0.3,
+            priority=rng.choice(list(Priority)),
+            due_date=rng.choice([None, datetime(2024, 1, 1 + rng.randrange(30))]),
+        )
+        user_id = 1 + i % 2
+        memory_store.create_task(task_data, user_id)
+        task_store.create_task(task_data, user_id)
+    for task_id in (4, 9):
+        update = TaskUpdate(completed=True)
+        memory_store.update_task(task_id, update, 2)
+        task_store.update_task(task_id, update, 2)
+
+    for limit in (None, 7):
+        expected_cursor = actual_cursor = None
+        while True:
+            expected = memory_store.list_tasks(
+                1, limit=limit, cursor=expected_cursor, **query
+            )
+            actual = task_store.list_tasks(1, limit=limit, cursor=actual_cursor, **query)
+            assert [task.id for task in actual.items] == [
+                task.id for task in expected.items
+            ]
+            assert (actual.next_cursor is None) == (expected.next_cursor is None)
+            expected_cursor, actual_cursor = expected.next_cursor, actual.next_cursor
+            if actual_cursor is None:
+                break
+
+
+def test_list_tasks_invalid_cursor(task_store):
+    """Test qu'un curseur invalide lève une erreur."""
+    with pytest.raises(ValueError):
+        task_store.list_tasks(1, sort="title", cursor="WzFd")
+
+
+def test_create_user_and_lookups(user_store, sample_user_data):
+    """Test de création d'un utilisateur et des recherches."""
+    user = user_store.create_user(sample_user_data)
+
+    assert user.id == 1
+    assert user_store.get_user_by_username("testuser").email == "test@example.com"
+    assert user_store.get_user_by_email("test@example.com").id == user.id
+    assert user_store.get_user_by_id(user.id) == user
+    assert user_store.get_user_by_id(999) is None
+
+
+def test_stats(task_store, user_store, sample_user_data):
+    """Test des tailles du stockage exposées dans les métriques."""
+    user = user_store.create_user(sample_user_data)
+    task_store.create_tasks([TaskCreate(title="A"), TaskCreate(title="B")], user.id)
+
+    assert task_store.stats()["tasks"] == 2
+    assert task_store.stats()["users_with_tasks"] == 1
+    assert task_store.stats()["database_bytes"] > 0
+    assert user_store.stats() == {"users": 1, "active_users": 1}
+    # Données sur disque : aucune mémoire attribuée aux utilisateurs
+    memory = task_store.memory_usage(10)
+    assert (memory.tasks, memory.total_bytes, memory.tenants) == (2, 0, [])
+    assert user_store.memory_usage().users == 1
+
+
+def test_create_user_duplicates(user_store, sample_user_data):
+    """Test du refus des noms d'utilisateur et emails déjà utilisés."""
+    user_store.create_user(sample_user_data)
+
+    with pytest.raises(ValueError, match="nom d'utilisateur"):
+        user_store.create_user(sample_user_data)
+
+    same_email = sample_user_data.model_copy(update={"username": "other"})
+    with pytest.raises(ValueError, match="email"):
+        user_store.create_user(same_email)
+
+
+def test_authenticate_and_deactivate(user_store, sample_user_data):
+    """Test de l'authentification et de la désactivation."""
+    invalidated = []
+    user_store.add_invalidation_listener(invalidated.append)
+    user = user_store.create_user(sample_user_data)
+
+    assert user_store.authenticate_user("testuser", "testpassword123").id == user.id
+    assert user_store.authenticate_user("testuser", "wrong") is None
+
+    assert user_store.deactivate_user(user.id) is True
+    assert user_store.deactivate_user(999) is False
+    assert invalidated == [user.id]
+    assert user_store.authenticate_user("testuser", "testpassword123") is None
+
+    user_store.clear()
+    assert invalidated == [user.id, None]
+    assert user_store.get_user_by_username("testuser") is None
+
+
+def test_create_stores_unknown_backend():
+    """Test du refus d'un backend de stockage inconnu."""
+    with pytest.raises(ValueError):
+        create_stores("redis")
+
+
+def test_create_tasks_bulk(task_store):
+    """Test de la création groupée avec des IDs contigus."""
+    task_store.create_task(TaskCreate(title="First"), 1)
+
+    tasks = task_store.create_tasks(
+        [TaskCreate(title="A"), TaskCreate(title="B", completed=True)], 1
+    )
+
+    assert [task.id for task in tasks] == [2, 3]
+    assert task_store.get_all_tasks(1)[1:] == tasks
+    assert task_store.create_task(TaskCreate(title="Next"), 1).id == 4
+    assert task_store.create_tasks([], 1) == []
+
+
+def test_update_and_delete_tasks_bulk(task_store):
+    """Test de la mise à jour et de la suppression groupées."""
+    task1 = task_store.create_task(TaskCreate(title="Task 1"), 1)
+    task2 = task_store.create_task(TaskCreate(title="Task 2", priority=Priority.HIGH), 1)
+    other = task_store.create_task(TaskCreate(title="Other"), 2)
+
+    updated = task_store.update_tasks(
+        BulkSelection(ids=[task1.id, task2.id, other.id]),
+        TaskUpdate(completed=True),
+        1,
+    )
+    assert [task.id for task in updated] == [task1.id, task2.id]
+    assert updated[0].completed_at == updated[1].completed_at is not None
+    assert task_store.get_task(task2.id, 1) == updated[1]
+    assert task_store.get_task(other.id, 2).completed is False
+
+    selection = BulkSelection(
+        ids=[task1.id, task2.id], filter=TaskFilter(priority=[Priority.HIGH])
+    )
+    assert task_store.delete_tasks(selection, 1) == 1
+    assert task_store.get_all_tasks(1) == [updated[0]]
+    assert task_store.delete_tasks(BulkSelection(filter=TaskFilter()), 1) == 1
+    assert task_store.count_tasks(2) == 1
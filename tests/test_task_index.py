@@ -0,0 +1,128 @@
+"""Tests pour les index secondaires des tâches."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.memory_usage import record_bytes
+from src.models.task_index import BATCH_REBUILD_SIZE, UserTaskIndex
+from src.schemas.task import Priority, Task, TaskFilter
+
+NOW = datetime(2024, 6, 3, 12, 0)
+
+
+def make_task(task_id, **fields):
+    """Construire une tâche de test."""
+    data = {"title": f"Task {task_id}", "user_id": 1, "created_at": NOW}
+    data.update(fields)
+    return Task(id=task_id, **data)
+
+
+@pytest.fixture
+def tasks():
+    """Jeu de tâches varié pour les tests de filtrage."""
+    return [
+        make_task(1, priority=Priority.HIGH, due_date=NOW + timedelta(days=1)),
+        make_task(2, priority=Priority.TOP, completed=True),
+        make_task(3, priority=Priority.LOW, due_date=NOW + timedelta(days=3)),
+        make_task(4, priority=Priority.TOP, due_date=NOW + timedelta(days=10)),
+        make_task(5, priority=Priority.HIGH, due_date=NOW - timedelta(days=2)),
+    ]
+
+
+@pytest.fixture
+def index(tasks):
+    """Index contenant le jeu de tâches."""
+    index = UserTaskIndex()
+    for task in tasks:
+        index.add(task)
+    return index
+
+
+def test_add_keeps_ids_sorted(index):
+    """Test que les IDs sont conservés dans l'ordre."""
+    assert index.task_ids == [1, 2, 3, 4, 5]
+    assert len(index) == 5
+
+
+def test_filter_completed(index):
+    """Test du filtre sur le statut."""
+    assert index.matching_ids(TaskFilter(completed=True)) == {2}
+    assert index.matching_ids(TaskFilter(completed=False)) == {1, 3, 4, 5}
+
+
+def test_filter_priorities(index):
+    """Test du filtre sur une ou plusieurs priorités."""
+    assert index.matching_ids(TaskFilter(priority=[Priority.HIGH])) == {1, 5}
+    assert index.matching_ids(
+        TaskFilter(priority=[Priority.HIGH, Priority.TOP])
+    ) == {1, 2, 4, 5}
+    assert index.matching_ids(TaskFilter(priority=[Priority.MEDIUM])) == set()
+
+
+def test_filter_due_date_range(index):
+    """Test du filtre sur une plage d'échéances (début inclus, fin exclue)."""
+    week = TaskFilter(due_after=NOW, due_before=NOW + timedelta(days=7))
+    assert index.matching_ids(week) == {1, 3}
+
+    inclusive = TaskFilter(due_after=NOW + timedelta(days=1))
+    assert index.matching_ids(inclusive) == {1, 3, 4}
+
+    exclusive = TaskFilter(due_before=NOW + timedelta(days=1))
+    assert index.matching_ids(exclusive) == {5}
+
+
+def test_filter_multiple_predicates(index):
+    """Test de l'intersection de plusieurs critères."""
+    filters = TaskFilter(
+        completed=False,
+        priority=[Priority.HIGH, Priority.TOP],
+        due_after=NOW,
+        due_before=NOW + timedelta(days=7),
+    )
+    assert index.matching_ids(filters) == {1}
+
+
+def test_empty_filter_matches_everything(index):
+    """Test qu'un filtre vide retourne toutes les tâches."""
+    assert index.matching_ids(TaskFilter()) == {1, 2, 3, 4, 5}
+
+
+def test_reindex_attributes(index, tasks):
+    """Test de la mise à jour des index après modification d'une tâche."""
+    task = tasks[0]
+    index.discard_attributes(task)
+    task.completed = True
+    task.priority = Priority.LOW
+    task.due_date = None
+    index.add_attributes(task)
+
+    assert index.matching_ids(TaskFilter(completed=True)) == {1, 2}
+    assert index.matching_ids(TaskFilter(priority=[Priority.LOW])) == {1, 3}
+    assert 1 not in index.matching_ids(TaskFilter(due_after=NOW))
+
+
+def test_remove(index, tasks):
+    """Test du retrait d'une tâche de tous les index."""
+    index.remove(tasks[0])
+
+    assert index.task_ids == [2, 3, 4, 5]
+    assert index.matching_ids(TaskFilter(priority=[Priority.HIGH])) == {5}
+    assert index.matching_ids(TaskFilter(due_after=NOW)) == {3, 4}
+
+
+def test_task_bytes_follow_writes(index, tasks):
+    """Test que la mémoire des tâches suit ajouts, modifications et retraits."""
+    assert index.task_bytes == sum(map(record_bytes, tasks))
+
+    index.discard_attributes(tasks[0])
+    tasks[0].description = "x" * 1000
+    index.add_attributes(tasks[0])
+    assert index.task_bytes == sum(map(record_bytes, tasks))
+
+    batch = [make_task(task_id) for task_id in range(6, 7 + BATCH_REBUILD_SIZE)]
+    index.add_many(batch)
+    index.remove(tasks[1])
+    index.remove_many(batch)
+    remaining = [tasks[0]] + tasks[2:]
+    assert index.task_bytes == sum(map(record_bytes, remaining))
+    assert index.index_bytes() > 0
@@ -0,0 +1,59 @@
+"""Tests pour la représentation interne des tâches."""
+from datetime import datetime, timezone
+
+from pydantic import BaseModel
+
+from src.models.task_record import TaskRecord, construct
+from src.schemas.task import Priority, Task, TaskCreate
+
+
+def test_record_converts_to_task():
+    """Test de la conversion d'un enregistrement en modèle Task."""
+    now = datetime(2024, 1, 2, 3, 4, 5)
+    task_data = TaskCreate(
+        title="Task",
+        description="Description",
+        completed=True,
+        due_date=datetime(2030, 1, 1, tzinfo=timezone.utc),
+        priority=Priority.HIGH,
+    )
+
+    task = TaskRecord.create(task_data, 7, 3, now).to_task()
+
+    assert task == Task(
+        id=7, user_id=3, created_at=now, completed_at=now, **task_data.model_dump()
+    )
+    assert task.model_dump_json() == Task.model_validate(task).model_dump_json()
+
+
+def test_record_has_no_instance_dict():
+    """Test que l'enregistrement ne porte que ses champs."""
+    record = TaskRecord.create(TaskCreate(title="Task"), 1, 1, datetime.now())
+
+    assert not hasattr(record, "__dict__")
+    assert record.completed_at is None
+
+
+def test_construct_matches_model_construct():
+    """Test que ``construct`` écrit les mêmes attributs que pydantic."""
+    values = {
+        "title": "Task",
+        "description": None,
+        "completed": False,
+        "due_date": None,
+        "priority": Priority.LOW,
+        "id": 1,
+        "user_id": 2,
+        "created_at": datetime(2024, 1, 1),
+        "completed_at": None,
+        "version": 3,
+    }
+    fields_set = set(Task.model_fields)
+
+    task = construct(Task, dict(values), fields_set)
+    expected = Task.model_construct(**values)
+
+    assert task == expected
+    for name in BaseModel.__slots__:
+        assert getattr(task, name) == getattr(expected, name)
+    assert task.__pydantic_fields_set__ is not fields_set
@@ -1,6 +1,7 @@
 """Tests pour le stockage des utilisateurs."""
 import pytest
 
+from src.auth.security import get_password_hash
 from src.models.user_store import UserStore
 from src.schemas.user import UserCreate
 
@@ -234,3 +235,47 @@ def test_user_store_isolation(user_store, sample_user_data):
     assert hasattr(by_username, "hashed_password")  # UserInDB
     assert hasattr(by_email, "hashed_password")  # UserInDB
     assert not hasattr(by_id, "hashed_password")  # User
+
+
+def test_create_user_with_precomputed_hash(user_store, sample_user_data):
+    """Test de création d'un utilisateur avec un hash déjà calculé."""
+    hashed_password = get_password_hash(sample_user_data.password)
+
+    user_store.create_user(sample_user_data, hashed_password=hashed_password)
+
+    user_in_db = user_store.get_user_by_username(sample_user_data.username)
+    assert user_in_db.hashed_password == hashed_password
+    assert user_store.authenticate_user(
+        sample_user_data.username, sample_user_data.password
+    )
+
+
+def test_clear(user_store, sample_user_data):
+    """Test de la remise à zéro du stockage."""
+    user_store.create_user(sample_user_data)
+
+    user_store.clear()
+
+    assert user_store.get_user_by_username(sample_user_data.username) is None
+    assert user_store.create_user(sample_user_data).id == 1
+
+
+def test_deactivate_user(user_store, sample_user_data):
+    """Test de la désactivation d'un utilisateur."""
+    invalidated = []
+    user_store.add_invalidation_listener(invalidated.append)
+    user = user_store.create_user(sample_user_data)
+
+    assert user_store.deactivate_user(user.id) is True
+    assert user_store.deactivate_user(999) is False
+
+    assert user_store.get_user_by_id(user.id).is_active is False
+    assert invalidated == [user.id]
+    assert user_store.stats() == {"users": 1, "active_users": 0}
+    assert user_store.memory_usage().user_bytes > 0
+    assert (
+        user_store.authenticate_user(
+            sample_user_data.username, sample_user_data.password
+        )
+        is None
+    )
@@ -0,0 +1,99 @@
+"""Tests pour la cohérence entre workers partageant une base (stockage "shared")."""
+import asyncio
+import json
+
+import pytest
+
+from src.api.events import TaskEventBroker
+from src.api.worker_sync import WorkerSync
+from src.auth.token_cache import TokenCache
+from src.models.repositories import InMemoryTaskRepository, InMemoryUserRepository
+from src.models.sqlite_store import SQLiteDatabase, SQLiteTaskStore, SQLiteUserStore
+from src.schemas.task import TaskCreate
+from src.schemas.user import UserCreate
+
+
+@pytest.fixture
+def databases(tmp_path):
+    """Deux connexions à la même base, comme deux workers."""
+    path = str(tmp_path / "shared.db")
+    databases = [SQLiteDatabase(path, pool_size=1, mmap_size=1 << 20) for _ in range(2)]
+    yield databases
+    for database in databases:
+        database.close()
+
+
+def sse_data(frames):
+    """Événements SSE (nom, données) d'une suite de trames."""
+    events = []
+    for frame in frames.decode().strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_events_from_another_worker(databases):
+    """Test que les écritures d'un worker sont diffusées aux abonnés d'un autre."""
+    writer = SQLiteTaskStore(databases[0])
+    reader = SQLiteTaskStore(databases[1])
+
+    async def scenario():
+        broker = TaskEventBroker(max_pending=16, heartbeat=0)
+        sync = WorkerSync(
+            InMemoryTaskRepository(reader),
+            InMemoryUserRepository(SQLiteUserStore(databases[1])),
+            broker,
+            TokenCache(10),
+            interval=0,
+        )
+        subscription = broker.subscribe(1)
+        # Pas de diffusion avant le premier événement du flux
+        writer.create_task(TaskCreate(title="Avant"), 1)
+        await sync.poll()
+        assert not subscription.frames
+
+        subscription.version = reader.get_collection_version(1)
+        await sync.poll()
+        assert not subscription.frames
+        created = writer.create_task(TaskCreate(title="A"), 1)
+        writer.delete_task(created.id, 1)
+        writer.create_task(TaskCreate(title="B"), 1)
+        writer.create_task(TaskCreate(title="Autre utilisateur"), 2)
+        await sync.poll()
+        return subscription.frames, writer.get_collection_version(1)
+
+    frames, version = asyncio.run(scenario())
+
+    assert len(frames) == 1
+    [(event, changes)] = sse_data(frames[0])
+    assert event == "changes"
+    assert changes["version"] == version
+    assert [task["title"] for task in changes["tasks"]] == ["B"]
+    assert len(changes["deleted"]) == 1
+
+
+def test_token_cache_invalidated_by_another_worker(databases):
+    """Test que la désactivation dans un worker vide le cache d'un autre."""
+    writer = SQLiteUserStore(databases[0])
+    reader = SQLiteUserStore(databases[1])
+    user = writer.create_user(
+        UserCreate(username="alice", email="alice@example.com", password="secret123"),
+        hashed_password="hash",
+    )
+    cache = TokenCache(10)
+    sync = WorkerSync(
+        InMemoryTaskRepository(SQLiteTaskStore(databases[1])),
+        InMemoryUserRepository(reader),
+        TaskEventBroker(max_pending=16, heartbeat=0),
+        cache,
+        interval=0,
+    )
+    asyncio.run(sync.poll())
+    cache.put("token", user, expires_at=2**40)
+
+    asyncio.run(sync.poll())
+    assert cache.get("token") == user
+
+    writer.deactivate_user(user.id)
+    asyncio.run(sync.poll())
+    assert cache.get("token") is None